@@ -19,11 +19,206 @@ This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
 import json
+import os
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
 from typing import Optional
 
 import random
-from game_entities import Location, Item
+import time
+import tracemalloc
+from game_entities import Location, Item, ItemChange, GameSnapshot, INVENTORY
 from event_logger import Event, EventList
+from event_journal import EventJournal, JournaledEventList, replay_journal
+from world_snapshot import is_snapshot_fresh, load_snapshot, snapshot_path
+from world_stream import LazyLocations, load_streaming_game_data
+from game_output import OutputSink, BufferedSink, NullSink
+from location_graph import LocationGraph
+from puzzle_engine import hangman_word
+from text_pool import location_event
+from commands import CommandCompiler, MENU_COMMAND, MOVE, TAKE, DEPOSIT, VERB_NAMES
+from instrumentation import Metrics, active_metrics
+from world_reload import WorldDiff, WorldWatcher
+
+DORM = 1  # initial starting location, where the required items must be returned to win
+MAX_MOVE = 20  # Max amount of move the player can move
+UNDO_CHANCES = 3  # Max amount of undo chance the player has
+PUZZLE_TRIES = 10  # Number of tries to solve a hangman puzzle
+MENU = ["look", "inventory", "score", "log", "quit", "undo"]  # menu options available at each location
+
+# The status of a game
+ONGOING = "ongoing"
+WON = "won"
+LOST = "lost"
+QUIT = "quit"
+
+
+@dataclass
+class StepResult:
+    """The result of applying one line of player input with AdventureGame.step.
+
+    Instance Attributes:
+        - command: the input that was applied
+        - valid: whether the input was accepted
+        - location_id: the ID of the location the player is at after the step
+        - score: the player's score after the step
+        - moves: the number of moves the player has made after the step
+        - status: the status of the game after the step, one of ONGOING, WON, LOST or QUIT
+        - event: the event logged by the step, or None if no event was logged
+
+    Representation Invariants:
+        - status in {ONGOING, WON, LOST, QUIT}
+    """
+    command: str
+    valid: bool
+    location_id: int
+    score: int
+    moves: int
+    status: str
+    event: Optional[Event] = None
+
+
+@dataclass
+class PuzzleState:
+    """A hangman puzzle that is being played to take an item.
+
+    Instance Attributes:
+        - location_id: the ID of the location the puzzle is played at
+        - item_name: the name of the item that is taken when the puzzle is solved
+        - word: the word to guess
+        - revealed: the letters of word guessed so far, with "*" for each letter not guessed yet
+        - tries: the number of tries used
+        - retrying: whether the puzzle has failed and is waiting for whether to try again
+        - found: the bitmask of the positions of word that are revealed
+
+    Representation Invariants:
+        - len(revealed) == len(word)
+        - 0 <= tries <= PUZZLE_TRIES
+    """
+    location_id: int
+    item_name: str
+    word: str
+    revealed: list[str]
+    tries: int = 0
+    retrying: bool = False
+    found: int = 0
+
+
+class World:
+    """The locations and items of a game world, shared by every game played in it.
+
+    A World is never changed once loaded: each AdventureGame records where items have moved, which items are
+    deposited and which locations are visited in its own small overlay instead.
+
+    A streamed world keeps its game data file mapped into memory. The file is released by close, or by leaving
+    a with block over the world, or otherwise once no World uses its locations any more, as happens when every
+    game playing in it has been switched to a reloaded world.
+
+    Instance Attributes:
+        - locations: a mapping from location id to Location object
+        - items: all items in the world
+        - item_index: a mapping from item name to its Item object in items
+
+    Representation Invariants:
+        - self.locations != {}
+        - all(self.item_index[itm.name] is itm for itm in self.items)
+    """
+    # Private Instance Attributes:
+    #   - _item_slots: a mapping from location id to the names of the items that start at that location, each
+    #                  mapped to its position in that Location's items list. Built the first time a location is used.
+    #   - _graph: the index of the moves between locations, or None if it has not been built yet
+    #   - _commands: the compiler of this world's commands, or None if it has not been built yet
+    locations: dict[int, Location]
+    items: list[Item]
+    item_index: dict[str, Item]
+    _item_slots: dict[int, dict[str, int]]
+    _graph: Optional[LocationGraph]
+    _commands: Optional[CommandCompiler]
+
+    def __init__(self, locations: dict[int, Location], items: list[Item]) -> None:
+        """Initialize a new world with the given locations and items."""
+        self.locations = locations
+        self.items = items
+        self.item_index = {itm.name: itm for itm in items}
+        self._item_slots = {}
+        self._graph = None
+        self._commands = None
+
+    def graph(self) -> LocationGraph:
+        """Return the index of the moves between the locations of this world, building it the first time."""
+        if self._graph is None:
+            self._graph = LocationGraph(self.locations)
+        return self._graph
+
+    def commands(self) -> CommandCompiler:
+        """Return the compiler of the commands of this world, building it the first time."""
+        if self._commands is None:
+            self._commands = CommandCompiler(self.items, MENU)
+        return self._commands
+
+    def updated(self, diff: WorldDiff, locations: Mapping[int, Location], items: list[Item]) -> World:
+        """Return a new world with the given locations and items, which differ from this world's as described by
+        diff. Every index of this world that the differences do not affect is carried over rather than rebuilt."""
+        world = World.__new__(World)
+        world.locations = locations
+        if diff.items_changed():
+            world.items, world.item_index = items, {itm.name: itm for itm in items}
+            world._commands = None
+        else:
+            world.items, world.item_index = self.items, self.item_index
+            world._commands = self._commands
+        changed = diff.changed_locations | diff.removed_locations
+        world._item_slots = {loc_id: slots for loc_id, slots in self._item_slots.items() if loc_id not in changed}
+        world._graph = None if diff.moves_changed else self._graph
+        return world
+
+    def close(self) -> None:
+        """Release the game data file this world's locations are streamed from, if they are. No location may be
+        looked up afterwards."""
+        if isinstance(self.locations, LazyLocations):
+            self.locations.close()
+
+    def __enter__(self) -> World:
+        """Return this world, to be closed at the end of a with block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close this world at the end of a with block."""
+        self.close()
+
+    def item_slots(self, loc_id: int) -> dict[str, int]:
+        """Return the names of the items that start at the given location, each mapped to its position in that
+        Location's items list. The returned dict must not be changed."""
+        slots = self._item_slots.get(loc_id)
+        if slots is None:
+            slots = {name: i for i, name in enumerate(self.locations[loc_id].items)}
+            self._item_slots[loc_id] = slots
+        return slots
+
+    @staticmethod
+    def load(game_data_file: str) -> World:
+        """Return the world in the given game data file. Every call with the same file returns the same World
+        until the file changes.
+
+        Preconditions:
+            - game_data_file is the filename of a valid game data JSON file
+        """
+        key = os.path.abspath(game_data_file)
+        modified = os.path.getmtime(game_data_file)
+        if key not in _WORLDS or _WORLDS[key][0] != modified:
+            metrics = active_metrics()
+            start = time.perf_counter()
+            _WORLDS[key] = (modified, World(*AdventureGame._load_game_data(game_data_file)))
+            if metrics is not None:
+                source = 'snapshot' if is_snapshot_fresh(game_data_file) else 'json'
+                metrics.observe('adventure_world_load_seconds', time.perf_counter() - start, source)
+        return _WORLDS[key][1]
+
+
+# The worlds loaded by World.load, mapping the absolute path of each game data file to the time it was last
+# modified and its World
+_WORLDS: dict[str, tuple[float, World]] = {}
 
 
 class AdventureGame:
@@ -35,6 +230,12 @@ class AdventureGame:
         - score: score the player has accumulated
         - moves: amount of moves the player has done
         - ongoing: whether the game is still ongoing
+        - status: the status of the game, one of ONGOING, WON, LOST or QUIT
+        - undo_chances: the number of undos the player has left
+        - log: the events of this game, logged by step
+        - sink: where all of this game's output is written
+        - rng: the random number generator puzzle words are chosen with, or None to use the random module
+        - metrics: the metrics step records each command to, or None if this game is not instrumented
     Representation Invariants:
         - _locations != {}
         - all(id >= 0 for id in _locations)
@@ -43,43 +244,233 @@ class AdventureGame:
         - score >= 0
         - moves >= 0
         - all(item in _items for item in inventory)
-        - all(not item.deposited for item in inventory)
+        - all(not self.is_deposited(item.name) for item in inventory)
     """
     # Private Instance Attributes (do NOT remove these two attributes):
     #   - _locations: a mapping from location id to Location object.
     #                       This represents all the locations in the game.
+    #                       When the game is streamed, this is a LazyLocations mapping instead of a dict,
+    #                       and once its world has been reloaded, a LocationOverlay.
     #   - _items: a list of Item objects, representing all items in the game.
+    #   - _world: the shared World that _locations and _items belong to. It is never changed by this game.
+    #   - _item_index: a mapping from item name to its Item object in _items.
+    #   - _item_lists: this game's copy of the items list of every location whose items it has changed.
+    #   - _location_items: a mapping from the id of each location in _item_lists to the set of item names at that
+    #                       location, each mapped to its position in this game's items list for that location.
+    #   - _deposited: whether each item is deposited, for every item whose deposited flag this game has changed.
+    #   - _places: the location id of every item this game has moved, or INVENTORY if it is carried.
+    #   - _visited: the ids of the locations visited in this game.
+    #   - _inventory: a mapping from item name to Item for every item carried, in the order they were picked up.
+    #   - _changes: the item changes made since the last snapshot was taken.
+    #   - _checkpoint: the (current location id, score, moves) at the time the last snapshot was taken.
+    #   - _redo_events: the (command, event) pairs removed by undo_action, most recently undone last.
+    #   - _win_items: the names of the items that must be deposited at DORM to win.
+    #   - _puzzle: the puzzle being played by step, or None if no puzzle is being played.
+    #   - _commands: the compiler of the world's commands, shared with every game in the world.
+    #   - _valid: a mapping from location id to the inventory version it was computed at, the commands valid
+    #             there other than menu commands, and its take and deposit commands in menu order. Removed when
+    #             the items at the location change, and recomputed when the inventory version changes.
+    #   - _inventory_version: the number of times the inventory has changed.
 
     _locations: dict[int, Location]
     _items: list[Item]
+    _world: World
+    _item_index: dict[str, Item]
+    _item_lists: dict[int, list[str]]
+    _location_items: dict[int, dict[str, int]]
+    _deposited: dict[str, bool]
+    _places: dict[str, int]
+    _visited: set[int]
+    _inventory: dict[str, Item]
+    _changes: list[ItemChange]
+    _checkpoint: tuple[int, int, int]
+    _redo_events: list[tuple[str, Event]]
+    _win_items: list[str]
+    _puzzle: Optional[PuzzleState]
+    _commands: CommandCompiler
+    _valid: dict[int, tuple[int, frozenset[str], list[str]]]
+    _inventory_version: int
     current_location_id: int
-    inventory: list[Item]
     score: int
     moves: int
     ongoing: bool
-
-    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+    status: str
+    undo_chances: int
+    log: EventList
+    sink: OutputSink
+    rng: Optional[random.Random]
+    metrics: Optional[Metrics]
+
+    def __init__(self, game_data_file: str, initial_location_id: int,
+                 max_cached_locations: Optional[int] = None, sink: Optional[OutputSink] = None) -> None:
         """
         Initialize a new text adventure game, based on the data in the given file, setting starting location of game
         at the given initial location ID.
         (note: you are allowed to modify the format of the file as you see fit)
+        The world in the file is shared with every other game loaded from the same file.
+        If max_cached_locations is given, locations are instead streamed from the file as they are used and at most
+        max_cached_locations of them are kept in memory at once.
+        All output is written to sink, or discarded if no sink is given.
 
         Preconditions:
         - game_data_file is the filename of a valid game data JSON file
+        - max_cached_locations is None or max_cached_locations > 0
         """
 
-        self._locations, self._items = self._load_game_data(game_data_file)
-        self.inventory = []
+        if max_cached_locations is None:
+            world = World.load(game_data_file)
+        else:
+            start = time.perf_counter()
+            world = World(*load_streaming_game_data(game_data_file, max_cached_locations))
+            if active_metrics() is not None:
+                active_metrics().observe('adventure_world_load_seconds', time.perf_counter() - start, 'stream')
+        self._init_state(world, initial_location_id, sink)
+
+    @classmethod
+    def from_world(cls, world: World, initial_location_id: int, sink: Optional[OutputSink] = None) -> AdventureGame:
+        """Return a new game played in the given, already loaded world, which is shared rather than copied.
+        This is the same as initializing a game from the file the world was loaded from."""
+        game = cls.__new__(cls)
+        game._init_state(world, initial_location_id, sink)
+        return game
+
+    def _init_state(self, world: World, initial_location_id: int, sink: Optional[OutputSink]) -> None:
+        """Initialize this game in the given world, at the start of play."""
+        self._world = world
+        self._locations, self._items, self._item_index = world.locations, world.items, world.item_index
+        self._item_lists = {}
+        self._location_items = {}
+        self._deposited = {}
+        self._places = {}
+        self._visited = set()
+        self._inventory = {}
         self.score = 0
         self.moves = 0
         self.current_location_id = initial_location_id
         self.ongoing = True
+        self.status = ONGOING
+        self.undo_chances = UNDO_CHANCES
+        self.log = EventList()
+        self.sink = NullSink() if sink is None else sink
+        self.rng = None
+        self.metrics = active_metrics()
+        if self.metrics is not None:
+            self.metrics.count('adventure_games_total')
+        self._win_items = [itm.name for itm in self._items if itm.target_position == DORM]
+        self._puzzle = None
+        self._changes = []
+        self._checkpoint = (self.current_location_id, self.score, self.moves)
+        self._redo_events = []
+        self._commands = world.commands()
+        self._valid = {}
+        self._inventory_version = 0
+
+    def session_state(self) -> dict:
+        """Return everything about this game that is not part of its world, as plain picklable data, so that the
+        game can be carried on in another process with from_session_state. The log's events are included with
+        their descriptions and snapshots, so the world of the other process only needs the player's location."""
+        return {
+            'current_location_id': self.current_location_id, 'score': self.score, 'moves': self.moves,
+            'ongoing': self.ongoing, 'status': self.status, 'undo_chances': self.undo_chances, 'rng': self.rng,
+            'inventory': list(self._inventory), 'item_lists': self._item_lists,
+            'location_items': self._location_items, 'deposited': self._deposited, 'places': self._places,
+            'visited': self._visited,
+            'puzzle': self._puzzle, 'changes': self._changes, 'checkpoint': self._checkpoint,
+            'log': [(event.id_num, event.description, event.snapshot, event.next_command) for event in self.log],
+            'redo_events': [(command, event.id_num, event.description, event.snapshot)
+                            for command, event in self._redo_events],
+        }
+
+    @classmethod
+    def from_session_state(cls, world: World, state: dict, sink: Optional[OutputSink] = None) -> AdventureGame:
+        """Return a game played in the given world that carries on from the given session state, which was
+        returned by session_state on a game played in a world with the same items.
+
+        Preconditions:
+            - state['current_location_id'] in world.locations
+        """
+        game = cls.__new__(cls)
+        game._init_state(world, state['current_location_id'], sink)
+        game.score, game.moves, game.rng = state['score'], state['moves'], state['rng']
+        game.ongoing, game.status, game.undo_chances = state['ongoing'], state['status'], state['undo_chances']
+        game._inventory = {name: game._item_index[name] for name in state['inventory']}
+        game._item_lists, game._location_items = state['item_lists'], state['location_items']
+        game._deposited, game._places, game._visited = state['deposited'], state['places'], state['visited']
+        game._puzzle, game._changes, game._checkpoint = state['puzzle'], state['changes'], state['checkpoint']
+        command = None
+        for id_num, description, snapshot, next_command in state['log']:
+            game.log.add_event(Event(id_num, description, snapshot=snapshot), command)
+            command = next_command
+        game._redo_events = [(command, Event(id_num, description, snapshot=snapshot))
+                             for command, id_num, description, snapshot in state['redo_events']]
+        return game
+
+    def swap_world(self, world: World, diff: WorldDiff) -> None:
+        """Switch this game to the given world, a reload of its current world that differs from it as described
+        by diff, keeping the player's position, inventory, score and log. The work done is proportional to the
+        size of diff and to what this game has cached about the changed locations, not to the size of the world.
+
+        The player stays at their location unless it was removed, in which case they are moved to DORM. Removed
+        items leave the inventory and every location, and are dropped from the changes undo would reverse.
+        Where this game has already moved items at a location, its own record of that location's items is kept.
+        Undo and redo refuse to return to a removed location, and skip the changes they would make to removed
+        items, so the log does not need to be rewritten.
+
+        Raise ValueError, leaving this game unchanged, if both the player's location and DORM were removed.
+        """
+        if self.current_location_id not in world.locations and DORM not in world.locations:
+            raise ValueError(f"location {self.current_location_id} and the dorm were both removed")
+        removed_items = {name: self._item_index[name].start_position for name in diff.changed_items
+                         if name not in world.item_index}
+        inventory = {name: world.item_index[name] for name in self._inventory if name not in removed_items}
+
+        self._world = world
+        self._locations, self._items, self._item_index = world.locations, world.items, world.item_index
+        self._commands = world.commands()
+        self._inventory = inventory
+        for loc_id in diff.changed_locations | diff.removed_locations:
+            self._valid.pop(loc_id, None)
+        for loc_id in diff.removed_locations:
+            self._item_lists.pop(loc_id, None)
+            self._location_items.pop(loc_id, None)
+            self._visited.discard(loc_id)
+        if self.current_location_id not in self._locations:
+            self.current_location_id = DORM
+
+        if diff.items_changed():
+            self._win_items = [itm.name for itm in self._items if itm.target_position == DORM]
+            self._inventory_version += 1
+            self._valid.clear()
+        if removed_items:
+            self._forget_items(removed_items)
+
+    def _forget_items(self, starts: dict[str, int]) -> None:
+        """Remove every trace of the items with the given names from this game's state, after they were removed
+        from the world, given the location each one started at. Only the locations where this game may have kept
+        its own record of them are visited."""
+        for name, start in starts.items():
+            self._deposited.pop(name, None)
+            for loc_id in {start, self._places.pop(name, start)}:
+                if name in self._location_items.get(loc_id, ()):
+                    kept = [other for other in self._item_lists[loc_id] if other != name]
+                    self._item_lists[loc_id] = kept
+                    self._location_items[loc_id] = {other: i for i, other in enumerate(kept)}
+        self._changes = [change for change in self._changes if change.name not in starts]
 
     @staticmethod
     def _load_game_data(filename: str) -> tuple[dict[int, Location], list[Item]]:
         """Load locations and items from a JSON file with the given filename and
         return a tuple consisting of (1) a dictionary of locations mapping each game location's ID to a Location object,
-        and (2) a list of all Item objects."""
+        and (2) a list of all Item objects.
+        If a compiled snapshot of the file exists and is newer than it, the snapshot is loaded instead."""
+        if is_snapshot_fresh(filename):
+            return load_snapshot(snapshot_path(filename))
+        return AdventureGame.load_json_game_data(filename)
+
+    @staticmethod
+    def load_json_game_data(filename: str) -> tuple[dict[int, Location], list[Item]]:
+        """Load locations and items from a JSON file with the given filename, in the same format as _load_game_data,
+        without checking for a compiled snapshot."""
         with open(filename, 'r') as f:
             data = json.load(f)  # This loads all the data from the JSON file
 
@@ -108,51 +499,145 @@ class AdventureGame:
         else:
             return self._locations[loc_id]
 
+    @property
+    def inventory(self) -> list[Item]:
+        """Return the items the player is carrying, in the order they were picked up."""
+        return list(self._inventory.values())
+
+    @property
+    def world(self) -> World:
+        """Return the world this game is played in."""
+        return self._world
+
+    @property
+    def active_puzzle(self) -> Optional[PuzzleState]:
+        """Return the puzzle being played by step, or None if no puzzle is being played."""
+        return self._puzzle
+
+    def is_carrying(self, name: str) -> bool:
+        """Return whether the player is carrying the item with the given name."""
+        return name in self._inventory
+
     def get_item(self, name: str) -> Item:
         """Return the Item object with the given name.
 
             Preconditions:
                 - any(itm.name == name for itm in self._items)
         """
-        for itm in self._items:
-            if itm.name == name:
-                return itm
+        if name in self._item_index:
+            return self._item_index[name]
 
         raise ValueError(f"No item named {name}")
 
+    def location_items(self, loc_id: int) -> list[str]:
+        """Return the names of the items currently at the given location. The returned list must not be changed."""
+        items = self._item_lists.get(loc_id)
+        return self._locations[loc_id].items if items is None else items
+
+    def _items_at(self, loc_id: int) -> dict[str, int]:
+        """Return the names of the items currently at the given location, each mapped to its position in
+        location_items(loc_id). The returned dict must not be changed."""
+        index = self._location_items.get(loc_id)
+        return self._world.item_slots(loc_id) if index is None else index
+
+    def _own_items(self, loc_id: int) -> tuple[list[str], dict[str, int]]:
+        """Return this game's own items list and index for the given location, copying them from the shared world
+        the first time this game changes the items at that location."""
+        if loc_id not in self._item_lists:
+            self._item_lists[loc_id] = list(self._locations[loc_id].items)
+            self._location_items[loc_id] = dict(self._world.item_slots(loc_id))
+        return self._item_lists[loc_id], self._location_items[loc_id]
+
+    def is_deposited(self, name: str) -> bool:
+        """Return whether the item with the given name is deposited in this game."""
+        return self._deposited.get(name, self._item_index[name].deposited)
+
+    def is_visited(self, loc_id: int) -> bool:
+        """Return whether the location with the given id has been visited in this game."""
+        return loc_id in self._visited or self._locations[loc_id].visited
+
+    def mark_visited(self, loc_id: int) -> None:
+        """Record that the location with the given id has been visited in this game."""
+        self._visited.add(loc_id)
+
+    def _add_to_location(self, loc_id: int, name: str) -> None:
+        """Place the item with the given name at the end of the given location's items."""
+        items, index = self._own_items(loc_id)
+        index[name] = len(items)
+        items.append(name)
+        self._valid.pop(loc_id, None)
+
+    def _remove_from_location(self, loc_id: int, name: str) -> None:
+        """Remove the item with the given name from the given location's items, by moving the last item of the
+        location into its place.
+
+            Preconditions:
+                - name is at the location with id loc_id
+        """
+        items, index = self._own_items(loc_id)
+        position = index.pop(name)
+        last = items.pop()
+        if position < len(items):
+            items[position] = last
+            index[last] = position
+        self._valid.pop(loc_id, None)
+
+    def _move_item(self, name: str, source: int, destination: int, deposited: bool) -> None:
+        """Move the item with the given name from source to destination, each either a location ID or INVENTORY,
+        set whether it is deposited, and record the change for the next snapshot.
+
+            Preconditions:
+                - the item with the given name is at source
+        """
+        itm = self._item_index[name]
+        if source == INVENTORY:
+            del self._inventory[name]
+        else:
+            self._remove_from_location(source, name)
+        if destination == INVENTORY:
+            self._inventory[name] = itm
+        else:
+            self._add_to_location(destination, name)
+        if INVENTORY in (source, destination):
+            self._inventory_version += 1
+        self._changes.append(ItemChange(name, source, destination, self.is_deposited(name), deposited))
+        self._deposited[name] = deposited
+        self._places[name] = destination
+
+    def location_has_item(self, loc_id: int, name: str) -> bool:
+        """Return whether the item with the given name is currently at the given location."""
+        return name in self._items_at(loc_id)
+
     def is_valid_choice(self, command: str, loc: Location, options: list[str]) -> bool:
         """Return whether choice is a valid command"""
-        if command in options:
-            return True
-        elif command in loc.available_commands:
-            return True
-        elif command.startswith("take "):
-            name = command[5:]  # slice "take " off choice to get the item's name
-            return name in loc.items and not self.get_item(name).deposited
-        elif command.startswith("deposit "):
-            name = command[8:]  # slice "deposit " off choice to get the item's name
-            return any(itm.name == name and itm.target_position == loc.id_num for itm in self.inventory)
-        return False
+        return command in options or command in self._valid_commands(loc)[0]
+
+    def _valid_commands(self, loc: Location) -> tuple[frozenset[str], list[str]]:
+        """Return the commands valid at the given location other than menu commands, and its take and deposit
+        commands in the order they are shown, computing them only when the location's items or the inventory
+        have changed since they were last computed."""
+        entry = self._valid.get(loc.id_num)
+        if entry is None or entry[0] != self._inventory_version:
+            actions = [f"take {name}" for name in self.location_items(loc.id_num) if not self.is_deposited(name)]
+            actions.extend(f"deposit {itm.name}" for itm in self._inventory.values()
+                           if itm.target_position == loc.id_num)
+            self._commands.learn_moves(loc.available_commands)
+            entry = (self._inventory_version, frozenset(loc.available_commands).union(actions), actions)
+            self._valid[loc.id_num] = entry
+        return entry[1], entry[2]
 
     def take_item(self, loc_id: int, name: str) -> bool:
         """Take an item from the given location and put it in the inventory.
         Return True if successful, False otherwise.
         """
-        loc = self._locations[loc_id]
-
         # Item must be at this location
-        if name not in loc.items:
+        if not self.location_has_item(loc_id, name) or name not in self._item_index:
             return False
 
-        # Find the corresponding Item object
-        for itm in self._items:
-            if itm.name == name:
-                loc.items.remove(name)  # Remove item from location
-                self.inventory.append(itm)  # Add item to inventory
-                print(itm.description)  # Display the item description
-                return True
-
-        return False
+        itm = self._item_index[name]
+        self._move_item(name, loc_id, INVENTORY, self.is_deposited(name))  # Move item from location to inventory
+        self._write(itm.description)  # Display the item description
+        return True
 
     def deposit_item(self, loc_id: int, name: str) -> bool:
         """Attempt to deposit an item at the given location and take it out of the inventory.
@@ -162,17 +647,13 @@ class AdventureGame:
         if loc_id != self.current_location_id:
             return False
 
-        loc = self._locations[loc_id]
-
-        for itm in self.inventory:
-            if itm.name == name and itm.target_position == loc_id:
-                self.inventory.remove(itm)  # Remove item from inventory
-                itm.deposited = True  # set item is deposited
-                self.score += itm.target_points  # score increase by itm.target_points
-                loc.items.append(name)  # Add item to location
-                return True
+        itm = self._inventory.get(name)
+        if itm is None or itm.target_position != loc_id:
+            return False
 
-        return False
+        self._move_item(name, INVENTORY, loc_id, True)  # Move item from inventory to location and set it deposited
+        self.score += itm.target_points  # score increase by itm.target_points
+        return True
 
     def _undo_take_item(self, loc_id: int, name: str) -> bool:
         """Undo a previously executed take action.
@@ -183,15 +664,11 @@ class AdventureGame:
                 - loc_id is a valid location ID
                 - name refers to an item that was previously taken
         """
-        loc = self._locations[loc_id]
+        if name not in self._inventory:
+            return False
 
-        # find item object in inventory
-        for itm in self.inventory:
-            if itm.name == name:
-                self.inventory.remove(itm)
-                loc.items.append(name)
-                return True
-        return False
+        self._move_item(name, INVENTORY, loc_id, self.is_deposited(name))
+        return True
 
     def _undo_deposit_item(self, loc_id: int, name: str) -> bool:
         """Undo a previously executed deposit action.
@@ -203,29 +680,86 @@ class AdventureGame:
                 - loc_id is a valid location ID
                 - name refers to an item that was previously deposited at this location
         """
-        loc = self._locations[loc_id]
-
-        if name not in loc.items:
+        if not self.location_has_item(loc_id, name):
             return False
 
         itm = self.get_item(name)
         if itm.target_position != loc_id:
             return False
 
-        loc.items.remove(name)
-        self.inventory.append(itm)
-        itm.deposited = False
+        self._move_item(name, loc_id, INVENTORY, False)
         self.score -= itm.target_points
         return True
 
+    def take_snapshot(self) -> GameSnapshot:
+        """Return a snapshot of the game state before and after everything done since the last snapshot was taken,
+        and start the next snapshot from the current state. Taking a snapshot of an action that used a move
+        forgets every action that could have been redone.
+        """
+        location, score, moves = self._checkpoint
+        snapshot = GameSnapshot(location, self.current_location_id, score, self.score, moves, self.moves,
+                                tuple(self._changes))
+        self._changes = []
+        self._checkpoint = (self.current_location_id, self.score, self.moves)
+        if snapshot.is_action():
+            self._redo_events.clear()
+        return snapshot
+
+    def restore_snapshot(self, snapshot: GameSnapshot, after: bool) -> None:
+        """Restore the game to its state after the given snapshot if after is True, or before it otherwise.
+        This takes time proportional to the number of items the snapshot changed, not to the size of the game.
+        Changes to items that a reload removed from the world are skipped.
+
+            Preconditions:
+                - the game is currently in the state on the other side of snapshot
+        """
+        changes = [change for change in snapshot.changes if change.name in self._item_index]
+        if after:
+            for change in changes:
+                self._move_item(change.name, change.before, change.after, change.deposited_after)
+            self.current_location_id, self.score, self.moves = \
+                snapshot.location_after, snapshot.score_after, snapshot.moves_after
+        else:
+            for change in reversed(changes):
+                self._move_item(change.name, change.after, change.before, change.deposited_before)
+            self.current_location_id, self.score, self.moves = \
+                snapshot.location_before, snapshot.score_before, snapshot.moves_before
+        self._changes = []
+        self._checkpoint = (self.current_location_id, self.score, self.moves)
+
+    def _can_restore(self, snapshot: GameSnapshot, after: bool) -> bool:
+        """Return whether the game can be restored to its state after the given snapshot if after is True, or
+        before it otherwise, i.e. every location that state refers to is still in the world after a reload."""
+        location = snapshot.location_after if after else snapshot.location_before
+        return location in self._locations and all(
+            loc_id == INVENTORY or loc_id in self._locations
+            for change in snapshot.changes if change.name in self._item_index
+            for loc_id in (change.before, change.after))
+
     def undo_action(self, log: EventList) -> bool:
         """Undo the most recent non-menu player action.
         Undo only applies to movement and item actions (e.g., 'go ...', 'take ...', 'deposit ...').
-        If the most recent action was a menu command, this returns False and does nothing.
+        If the most recent action was a menu command, or undoing it would return to a location that a reload
+        removed from the world, this returns False and does nothing.
+
+        If the most recent event holds a snapshot, the game is restored from it in constant time and the event
+        can be redone with redo_action. Otherwise the previous command is reversed instead.
         """
+        last = log.last
+        if last.snapshot is not None:
+            if not last.snapshot.is_action() or not self._can_restore(last.snapshot, after=False):
+                return False
+            command = last.prev.next_command
+            self.restore_snapshot(last.snapshot, after=False)
+            log.remove_last_event()
+            self._redo_events.append((command, last))
+            return True
+
         previous_game_state = log.last.prev
         previous_location_id = previous_game_state.id_num
         command = previous_game_state.next_command
+        if previous_location_id not in self._locations:
+            return False
 
         loc = self.get_location(previous_location_id)
         if command in loc.available_commands:  # if the command changes location roll back to its previous location
@@ -247,16 +781,28 @@ class AdventureGame:
                 return True
         return False
 
+    def redo_action(self, log: EventList) -> bool:
+        """Redo the most recently undone action, adding its event back to the end of log.
+        Return False and do nothing if there is no action to redo.
+        """
+        if not self._redo_events or not self._can_restore(self._redo_events[-1][1].snapshot, after=True):
+            return False
+
+        command, event = self._redo_events.pop()
+        self.restore_snapshot(event.snapshot, after=True)
+        log.add_event(location_event(self.get_location(event.id_num), event.snapshot), command)
+        return True
+
     @staticmethod
-    def generate_word(puzzle_location: Location) -> str:
+    def generate_word(puzzle_location: Location, rng: Optional[random.Random] = None) -> str:
         """Generate a word related to the location given for the simple puzzle game.
-        Randomly selects a word from the specified locations puzzle word list.
+        Randomly selects a word from the specified locations puzzle word list, using rng if it is given.
 
             Preconditions:
             - location.puzzle_words != []
         """
         words = puzzle_location.puzzle_words
-        hangman = random.choice(words)
+        hangman = random.choice(words) if rng is None else rng.choice(words)
         return hangman
 
     @staticmethod
@@ -265,17 +811,17 @@ class AdventureGame:
         """
         return "".join(new_hangman)
 
-    @staticmethod
-    def _get_valid_guess(updated_word: str) -> Optional[str]:
+    def _get_valid_guess(self, updated_word: str) -> Optional[str]:
         """Prompt the user until they enter a single alphabetic character.
         """
         guess = ""
         while True:
+            self.sink.flush()
             guess = input(f"(Guess) Enter a letter in word {updated_word}: ")
             if len(guess) != 1:
-                print("Please enter 1 letter")
+                self._write("Please enter 1 letter")
             elif not guess.isalpha():
-                print("Please enter a letter")
+                self._write("Please enter a letter")
             else:
                 break
         return guess
@@ -284,13 +830,18 @@ class AdventureGame:
     def _apply_guess(chosen_word: str, new_hangman: list[str], guess: str) -> bool:
         """Apply a guess to the hangman word.
         Returns True if the letter was already guessed.
+        Only the positions of guess in chosen_word are visited, using the word's precomputed letter masks.
         """
+        positions = hangman_word(chosen_word).positions.get(guess, 0)
         already = False
-        for i in range(len(chosen_word)):
-            if chosen_word[i] == guess and new_hangman[i] == guess:
+        while positions:
+            lowest = positions & -positions
+            i = lowest.bit_length() - 1
+            if new_hangman[i] == guess:
                 already = True
-            elif chosen_word[i] == guess:
+            else:
                 new_hangman[i] = guess
+            positions ^= lowest
         return already
 
     def puzzle(self, puzzle_location: Location) -> bool:
@@ -298,24 +849,27 @@ class AdventureGame:
         The puzzle-solver has 10 tries to fully decode the puzzle before failing.
         If they've surpasssed 10 tries, then the option to retry is available.
         Required for players to obtain special required items.
+
+        This plays the whole puzzle by reading from the console. step plays the same puzzle one input at a time.
         """
 
         retry = True
 
         while True:
             if not retry:
+                self.sink.flush()
                 try_again = input("Would you like to try again? Enter y or n: ")
                 if try_again == "y":
                     retry = True
-                    print()
+                    self._write("")
                 elif try_again == "n":
-                    print("Puzzle Over")
+                    self._write("Puzzle Over")
                     return False
                 else:
-                    print("Invalid input")
+                    self._write("Invalid input")
                     continue
 
-            chosen_word = self.generate_word(puzzle_location)
+            chosen_word = self.generate_word(puzzle_location, self.rng)
             new_hangman = ["*"] * len(chosen_word)
             tries = 0
 
@@ -326,21 +880,287 @@ class AdventureGame:
 
                 already = self._apply_guess(chosen_word, new_hangman, guess)
                 if already:
-                    print(f"    {guess} is already in the word")
+                    self._write(f"    {guess} is already in the word")
                     tries -= 1
 
                 if "*" not in new_hangman:
-                    print(
-                        f"You've completed the puzzle! The word is {chosen_word}. "
-                        f"You missed {tries} time(s)\n"
-                    )
+                    self._write(f"You've completed the puzzle! The word is {chosen_word}. You missed {tries} time(s)")
+                    self._write("")
                     return True
 
-                if tries >= 10:
-                    print(f"You have failed the puzzle, the word was {chosen_word}\n")
+                if tries >= PUZZLE_TRIES:
+                    self._write(f"You have failed the puzzle, the word was {chosen_word}")
+                    self._write("")
                     retry = False
         return False
 
+    def _write(self, line: str) -> None:
+        """Write one line of output to this game's sink."""
+        self.sink.write(line)
+
+    def prompt(self) -> str:
+        """Return the prompt for the input the next call to step expects."""
+        if self._puzzle is None:
+            return "\nEnter action: "
+        elif self._puzzle.retrying:
+            return "Would you like to try again? Enter y or n: "
+        else:
+            return f"(Guess) Enter a letter in word {self.update_word(self._puzzle.revealed)}: "
+
+    def start(self) -> None:
+        """Start the game by logging the first event at the current location and showing that location."""
+        location = self.get_location()
+        self.log.add_event(location_event(location, self.take_snapshot()))
+        self.render_location()
+
+    def render_location(self) -> None:
+        """Show the current location and every command available there."""
+        location = self.get_location()
+
+        #  show either full description (first time visit) or brief description (every subsequent visit) of location
+        self._write(f"LOCATION {location.id_num}      (Moves {self.moves})")
+        if self.is_visited(location.id_num):
+            self._write(location.brief_description)
+        else:
+            self._write(location.long_description)
+            self.mark_visited(location.id_num)
+
+        # Display possible actions at this location
+        self._write("What to do? Choose from: " + ", ".join(MENU))
+        self._write("At this location, you can also:")
+        for action in location.available_commands:
+            self._write(f"- {action}")
+
+        # Display possible take and deposit at this location
+        for action in self._valid_commands(location)[1]:
+            self._write(f"- {action}")
+
+    def step(self, command: str) -> StepResult:
+        """Apply one line of player input to the game and return what happened.
+        The input is a command, or a guess or retry answer while a puzzle is being played. All output is
+        written to this game's sink; nothing is read from or printed to the console.
+        If this game is instrumented, the time taken and the size of the log afterwards are recorded to metrics.
+        """
+        if self.metrics is None:
+            return self._step(command)
+        puzzle = self._puzzle is not None
+        start = time.perf_counter()
+        result = self._step(command)
+        elapsed = time.perf_counter() - start
+        self.metrics.observe_command('puzzle' if puzzle else self._command_kind(result), elapsed, len(self.log))
+        return result
+
+    def _command_kind(self, result: StepResult) -> str:
+        """Return the type of command applied by a step with the given result, other than a puzzle input, as
+        recorded to metrics: the command itself for a menu command, "move", "take" or "deposit" for other
+        commands, and "invalid" if it was not accepted."""
+        compiled = self._commands.compile(result.command) if result.valid else None
+        if compiled is None:
+            return 'invalid'
+        elif compiled.verb == MENU_COMMAND:
+            return compiled.text
+        return VERB_NAMES[compiled.verb]
+
+    def _step(self, command: str) -> StepResult:
+        """Apply one line of player input to the game and return what happened, without recording metrics."""
+        if self.log.is_empty():
+            self.start()
+        if not self.ongoing:
+            return self._result(command, False)
+        if self._puzzle is not None:
+            return self._puzzle_step(command)
+
+        choice = command.lower().strip()
+        location = self.get_location()
+        if not self.is_valid_choice(choice, location, MENU):
+            self._write("That was an invalid option; try again.")
+            return self._result(choice, False)
+
+        self._write("========")
+        self._write(f"You decided to: {choice}")
+        compiled = self._commands.compile(choice)
+
+        # Handle each menu command "look", "inventory", "score", "log", "quit", "undo"
+        if compiled.verb == MENU_COMMAND:
+            self._menu_command(choice, location)
+
+        # Handle Go[direction] command - action that change the location
+        elif compiled.verb == MOVE:
+            if location.available_commands[choice] not in self._locations:  # removed by a reload of the world
+                self._write("That way is closed now; try another.")
+                return self._result(choice, False)
+            self.current_location_id = location.available_commands[choice]
+            self.moves += 1  # Go[direction] takes 1 move
+
+        # Handle "take " command
+        elif compiled.verb == TAKE:
+            item_name = self._items[compiled.argument].name
+            if location.puzzle_words:
+                self._write("You must complete the puzzle to obtain the item.")
+                self._write("Guess the word related to the location you're in, one letter at a time. "
+                            f"You have {PUZZLE_TRIES} tries.")
+                self._start_puzzle(location, item_name)
+                return self._result(choice, True)
+
+        # Handle "deposit " command
+        elif compiled.verb == DEPOSIT:
+            if self.deposit_item(location.id_num, self._items[compiled.argument].name):
+                self.moves += 1
+            self._check_win(location)
+
+        return self._finish_command(choice)
+
+    def _menu_command(self, choice: str, location: Location) -> None:
+        """Carry out the given menu command at the given location."""
+        if choice == "log":
+            self.log.display_events(self._write)
+        elif choice == "look":
+            self._write(f"LOCATION {location.id_num}")
+            self._write(location.long_description)
+        elif choice == "inventory":
+            self._write("You are carrying: ")
+            for item in self._inventory.values():
+                self._write(f"- {item.name}")
+        elif choice == "score":
+            self._write(f"Current score: {self.score}")
+        elif choice == "undo":
+            if self.moves >= 1 and self.undo_chances > 0:
+                if self.undo_action(self.log):
+                    self.undo_chances -= 1
+                    self._write(f"You have undone your move. {self.undo_chances} more remaining undo chances.")
+                elif ((self.log.last.snapshot is not None and self.log.last.snapshot.is_action())
+                      or self.log.last.prev.id_num not in self._locations):
+                    self._write("Cannot undo. That location is no longer part of the campus.")
+                else:
+                    self._write("Cannot undo. Previous command is from menu")
+            elif self.undo_chances == 0:
+                self._write("Cannot undo. You have run out of undo chances.")
+            else:
+                self._write("Cannot undo. You have not made any move yet.")
+        else:
+            self._write("YOU QUITTED")
+            self._end(QUIT)
+
+    def _check_win(self, location: Location) -> None:
+        """End the game with a win if every item that belongs in the dorm has been deposited there."""
+        if location.id_num == DORM and all(self.location_has_item(DORM, name) for name in self._win_items):
+            self._write("YOU WIN!!!")
+            self._write("With all your items recovered, you rush back to your dorm and submit the project just in time")
+            self._write(f"Final Score: {self.score}")
+            self._write(f"moves taken: {self.moves}")
+            self._end(WON)
+
+    def _end(self, status: str) -> None:
+        """End the game with the given status."""
+        self.status = status
+        self.ongoing = False
+
+    def _start_puzzle(self, location: Location, item_name: str) -> None:
+        """Start a new hangman puzzle at the given location, to be solved to take the item with the given name."""
+        word = self.generate_word(location, self.rng)
+        self._puzzle = PuzzleState(location.id_num, item_name, word, ["*"] * len(word))
+
+    def _puzzle_step(self, answer: str) -> StepResult:
+        """Apply one guess, or one answer to whether to try again, to the puzzle being played."""
+        puzzle = self._puzzle
+        if puzzle.retrying:
+            if answer == "y":
+                word = self.generate_word(self.get_location(puzzle.location_id), self.rng)
+                self._puzzle = PuzzleState(puzzle.location_id, puzzle.item_name, word, ["*"] * len(word))
+                self._write("")
+                return self._result(answer, True)
+            elif answer == "n":
+                self._write("Puzzle Over")
+                self._write("Cannot take item because puzzle failed")
+                self._puzzle = None
+                return self._finish_command(f"take {puzzle.item_name}")
+            self._write("Invalid input")
+            return self._result(answer, False)
+
+        if len(answer) != 1:
+            self._write("Please enter 1 letter")
+            return self._result(answer, False)
+        elif not answer.isalpha():
+            self._write("Please enter a letter")
+            return self._result(answer, False)
+
+        puzzle.tries += 1
+        if self._apply_guess(puzzle.word, puzzle.revealed, answer):
+            self._write(f"    {answer} is already in the word")
+            puzzle.tries -= 1
+
+        letters = hangman_word(puzzle.word)
+        puzzle.found |= letters.positions.get(answer, 0)
+        if puzzle.found == letters.full:
+            self._write(f"You've completed the puzzle! The word is {puzzle.word}. You missed {puzzle.tries} time(s)")
+            self._write("")
+            self._puzzle = None
+            if self.take_item(puzzle.location_id, puzzle.item_name):
+                self.moves += 1
+            return self._finish_command(f"take {puzzle.item_name}")
+
+        if puzzle.tries >= PUZZLE_TRIES:
+            self._write(f"You have failed the puzzle, the word was {puzzle.word}")
+            self._write("")
+            puzzle.retrying = True
+        return self._result(answer, True)
+
+    def _finish_command(self, command: str) -> StepResult:
+        """Finish the given command by checking the lose condition, then logging and showing the location the
+        player is now at if the game is still ongoing."""
+        # Check Lose condition (Player runs out of moves)
+        if self.ongoing and self.moves >= MAX_MOVE:
+            self._write("GAME OVER")
+            self._write("Time's up — the deadline has passed, and the project was not submitted.")
+            self._write(f"Final Score: {self.score}")
+            self._write(f"moves taken: {self.moves}")
+            self._end(LOST)
+
+        if not self.ongoing:
+            return self._result(command, True)
+
+        location = self.get_location()
+        event = location_event(location, self.take_snapshot())
+        self.log.add_event(event, command)
+        self.render_location()
+        return self._result(command, True, event)
+
+    def _result(self, command: str, valid: bool, event: Optional[Event] = None) -> StepResult:
+        """Return the result of a step that handled the given input."""
+        return StepResult(command, valid, self.current_location_id, self.score, self.moves, self.status, event)
+
+
+def measure_snapshot_overhead(game_data_file: str, steps: int = 10000) -> float:
+    """Return the average number of bytes of memory used by each snapshot recorded while playing the given
+    number of steps, alternating between moving, taking an item and putting it back.
+
+    Preconditions:
+        - game_data_file is the filename of a valid game data JSON file
+        - steps > 0
+    """
+    game = AdventureGame(game_data_file, 1)
+    location = next(loc for loc in game._locations.values() if loc.items and loc.available_commands)
+    game.current_location_id = location.id_num
+    name = location.items[0]
+    game.take_snapshot()
+
+    snapshots = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for step in range(steps):
+        if step % 4 == 0:
+            game._move_item(name, location.id_num, INVENTORY, False)
+        elif step % 4 == 2:
+            game._move_item(name, INVENTORY, location.id_num, False)
+        else:
+            game.current_location_id = next(iter(location.available_commands.values())) \
+                if step % 4 == 1 else location.id_num
+        game.moves += 1
+        snapshots.append(game.take_snapshot())
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(snapshots)
+
 
 if __name__ == "__main__":
     # When you are ready to check your work with python_ta, uncomment the following lines.
@@ -353,124 +1173,36 @@ if __name__ == "__main__":
     #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
     # })
 
-    DORM = 1  # initial starting location
-    MAX_MOVE = 20  # Max amount of move the player can move
-    undo_chances = 3  # Max amount of undo chance the player has
-
-    game_log = EventList()
-    game = AdventureGame('game_data.json', DORM)  # load data, setting initial location ID to DORM
-    menu = ["look", "inventory", "score", "log", "quit", "undo"]  # menu options available at each location
-    choice = None
-
-    while game.ongoing:
-
-        location = game.get_location()
+    JOURNAL_FILE = 'adventure.journal'  # the current session is journaled here so that it can be resumed
 
-        #  Add new Event to game log to represent current game location
-        event = Event(location.id_num, location.long_description)
-        game_log.add_event(event, choice)
+    output = BufferedSink(sys.stdout)
+    game = AdventureGame('game_data.json', DORM, sink=output)  # load data, setting initial location ID to DORM
+    game.log = JournaledEventList(None, game)
 
-        #  print either full description (first time visit) or brief description (every subsequent visit) of location
-        if location.visited:
-            print(f"LOCATION {location.id_num}      (Moves {game.moves})\n{location.brief_description}")
+    # Offer to resume an unfinished session from its journal
+    if os.path.exists(JOURNAL_FILE):
+        if input("Resume your previous session? Enter y or n: ").lower().strip() == "y":
+            game.undo_chances -= replay_journal(JOURNAL_FILE, game, game.log)
         else:
-            print(f"LOCATION {location.id_num}      (Moves {game.moves})\n{location.long_description}")
-            location.visited = True
-
-        # Display possible actions at this location
-        print("What to do? Choose from: look, inventory, score, log, quit, undo")
-        print("At this location, you can also:")
-        for action in location.available_commands:
-            print("-", action)
+            os.remove(JOURNAL_FILE)
+    game.log.journal = EventJournal(JOURNAL_FILE, fsync='always')
 
-        # Display possible take at this location
-        for item_name in location.items:
-            item = game.get_item(item_name)
-            if not item.deposited:
-                print("-", f"take {item_name}")
+    # Pick up edits to the game data file between commands, without restarting the game
+    watcher = WorldWatcher('game_data.json', game.world)
+    watcher.watch(game)
 
-        # Display possible deposit at this location
-        for item in game.inventory:
-            if item.target_position == location.id_num:
-                print("-", f"deposit {item.name}")
+    if game.log.is_empty():
+        game.start()
+    else:
+        game.render_location()
 
-        # Validate choice
-        choice = input("\nEnter action: ").lower().strip()
-        while not game.is_valid_choice(choice, location, menu):
-            print("That was an invalid option; try again.")
-            choice = input("\nEnter action: ").lower().strip()
-
-        print("========")
-        print("You decided to:", choice)
-
-        # Handle each menu command "look", "inventory", "score", "log", "quit", "undo"
-        if choice in menu:
-            if choice == "log":
-                game_log.display_events()
-            elif choice == "look":
-                print(f"LOCATION {location.id_num}\n{location.long_description}")
-            elif choice == "inventory":
-                print("You are carrying: ")
-                for item in game.inventory:
-                    print("-", item.name)
-            elif choice == "score":
-                print("Current score:", game.score)
-            elif choice == "undo":
-                if game.moves >= 1 and undo_chances > 0:
-                    if game.undo_action(game_log):
-                        undo_chances -= 1
-                        print("You have undone your move.", undo_chances, " more remaining undo chances.")
-                    else:
-                        print("Cannot undo. Previous command is from menu")
-                elif undo_chances == 0:
-                    print("Cannot undo. You have run out of undo chances.")
-                else:
-                    print("Cannot undo. You have not made any move yet.")
-            else:
-                print("YOU QUITTED")
-                game.ongoing = False
-
-        # Handle Go[direction] command - action that change the location
-        elif choice in location.available_commands:
-            result = location.available_commands[choice]
-            game.current_location_id = result
-            game.moves += 1  # Go[direction] takes 1 move
-
-        # Handle command that do not change the location
-        else:
-            # Handle "take " command
-            if choice.startswith("take "):
-                item_name = choice[5:]
-
-                if location.puzzle_words:
-                    print("You must complete the puzzle to obtain the item.")
-                    print("Guess the word related to the location you're in, one letter at a time. You have 10 tries.")
-                    if game.puzzle(location):
-                        if game.take_item(location.id_num, item_name):
-                            game.moves += 1
-                    else:
-                        print("Cannot take item because puzzle failed")
-
-            # Handle "deposit " command
-            elif choice.startswith("deposit "):
-                item_name = choice[8:]
-                if game.deposit_item(location.id_num, item_name):
-                    game.moves += 1
-
-                # Check Win condition upon depositing an item (all three IMPORTANT ITEM are at dorm to submit project)
-                if location.id_num == DORM and all(
-                        itm in location.items for itm in ["laptop charger", "lucky mug", "usb drive"]):
-                    print("YOU WIN!!!")
-                    print(
-                        "With all your items recovered, you rush back to your dorm and submit the project just in time")
-                    print(f"Final Score: {game.score}")
-                    print(f"moves taken: {game.moves}")
-                    game.ongoing = False
-
-        # Check Lose condition (Player runs out of moves)
-        if game.moves == MAX_MOVE:
-            game.ongoing = False
-            print("GAME OVER")
-            print("Time's up — the deadline has passed, and the project was not submitted.")
-            print(f"Final Score: {game.score}")
-            print(f"moves taken: {game.moves}")
+    while game.ongoing:
+        output.flush()
+        player_input = input(game.prompt())
+        watcher.check()
+        game.step(player_input)
+    output.flush()
+
+    # The session is over, so there is nothing left to resume
+    game.log.journal.close()
+    os.remove(JOURNAL_FILE)
@@ -0,0 +1,415 @@
+"""CSC111 Project 1: Text Adventure Game - Batched Agent Simulation
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module plays many random agents through a game world at once, to estimate how often players
+ following a play policy win. The state of every agent (location, carried items, deposited items, moves
+ and score) is held in NumPy arrays, and all agents are advanced one decision at a time together.
+
+At every decision, an agent lists its options in a fixed order: the location's go commands, then a take
+ for every item it can take, then a deposit for every item it can deposit, each in the order of the world's
+ items. It then picks one with its own random number stream. Under the greedy policy, it only picks between
+ takes and deposits whenever it has any. A take at a location with a puzzle draws the puzzle word from the
+ same stream, then plays it with the guesser that guesser_factory returns for that location's puzzle words
+ (a FrequencyGuesser by default); if the puzzle is failed the agent does not try again. As in the game, a take
+ at a location without a puzzle does nothing and costs no move.
+
+Every agent's stream is a SplitMix64 generator seeded from the run's seed and the agent's number, so any one
+ agent can be replayed on its own. play_agent replays one agent through AdventureGame.step, and gives the
+ same result as the batched simulator.
+
+This module requires NumPy.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import Callable, Sequence, TypeVar
+
+import numpy as np
+
+from adventure import AdventureGame, World, DORM, MAX_MOVE, PUZZLE_TRIES, ONGOING, WON, LOST
+from puzzle_engine import FrequencyGuesser, Guesser, HangmanPuzzle, play_word
+
+# The status of an agent, indexed by its status code in AgentResults.status
+STATUS_NAMES = (ONGOING, WON, LOST)
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+T = TypeVar('T')
+
+
+def _mix(z: int) -> int:
+    """Return the SplitMix64 finalizer of the 64-bit integer z."""
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK
+    return z ^ (z >> 31)
+
+
+def _mix_array(z: np.ndarray) -> np.ndarray:
+    """Return the SplitMix64 finalizer of every element of the uint64 array z."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def _initial_state(seed: int, agent: int) -> int:
+    """Return the initial state of the random number stream of the given agent in a run with the given seed."""
+    return _mix((seed * _GOLDEN + agent) & _MASK)
+
+
+class AgentStream(random.Random):
+    """The SplitMix64 random number stream of one agent.
+
+    Instance Attributes:
+        - state: the current state of the stream
+
+    Representation Invariants:
+        - 0 <= self.state < 2 ** 64
+    """
+    state: int
+
+    def __init__(self, seed: int, agent: int) -> None:
+        """Initialize the stream of the given agent in a run with the given seed."""
+        super().__init__(0)
+        self.state = _initial_state(seed, agent)
+
+    def draw(self) -> int:
+        """Return the next 64-bit value of the stream."""
+        self.state = (self.state + _GOLDEN) & _MASK
+        return _mix(self.state)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return an element of the given sequence, chosen with one draw."""
+        return seq[self.draw() % len(seq)]
+
+    def random(self) -> float:
+        """Return a float in [0, 1), made from one draw."""
+        return (self.draw() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        """Return a nonnegative integer with k random bits."""
+        bits, value = 0, 0
+        while bits < k:
+            value = (value << 64) | self.draw()
+            bits += 64
+        return value >> (bits - k)
+
+
+def solves_puzzle(word: str, guesser: Guesser) -> bool:
+    """Return whether the given guesser solves a puzzle with the given word before running out of tries."""
+    return play_word(word, guesser, PUZZLE_TRIES).solved
+
+
+@dataclass
+class AgentResults:
+    """The final state of every agent in a batched run.
+
+    Instance Attributes:
+        - location_ids: the id of the location each agent finished at
+        - taken: the items each agent finished carrying, as a bitmask over the world's items
+        - deposited: the items deposited when each agent finished, as a bitmask over the world's items
+        - moves: the moves each agent used
+        - score: the score each agent finished with
+        - status: the status code of each agent, an index into STATUS_NAMES
+        - steps: the number of decisions each agent made
+
+    Representation Invariants:
+        - all arrays have the same length
+    """
+    location_ids: np.ndarray
+    taken: np.ndarray
+    deposited: np.ndarray
+    moves: np.ndarray
+    score: np.ndarray
+    status: np.ndarray
+    steps: np.ndarray
+
+    def win_rate(self) -> float:
+        """Return the fraction of agents that won."""
+        return float(np.mean(self.status == STATUS_NAMES.index(WON)))
+
+    def agent(self, i: int) -> tuple[int, int, int, int, int, str, int]:
+        """Return the (location id, taken, deposited, moves, score, status, steps) of agent i, in the same form
+        as play_agent."""
+        return (int(self.location_ids[i]), int(self.taken[i]), int(self.deposited[i]), int(self.moves[i]),
+                int(self.score[i]), STATUS_NAMES[self.status[i]], int(self.steps[i]))
+
+
+class AgentSimulator:
+    """A batched simulator of random agents in one world.
+
+    Instance Attributes:
+        - world: the world the agents play in
+        - initial_location_id: the ID of the location every agent starts at
+        - greedy: whether agents only pick between takes and deposits whenever they have any
+        - guesser_factory: returns the guesser agents play a location's puzzle with, given its puzzle words
+
+    Representation Invariants:
+        - len(self.world.items) <= 64
+    """
+    # Private Instance Attributes:
+    #   - _ids: the id of every location, by location index
+    #   - _go_count: the number of go commands at each location index
+    #   - _go_dest: the destination index of each go command at each location index, padded with 0
+    #   - _take_bits: the bit of each item that starts at each location index, padded with 0
+    #   - _deposit_bits: the bit of each item that is deposited at each location index, padded with 0
+    #   - _deposit_points: the points for depositing each item in _deposit_bits
+    #   - _word_count: the number of puzzle words at each location index, or 0 if it has no puzzle
+    #   - _solved: whether agents solve each puzzle word at each location index
+    #   - _initial: the bits of the items that are deposited before play starts
+    #   - _dorm_start: the bits of the items that start in the dorm
+    #   - _win: the bits of the items that must be in the dorm to win
+    #   - _dorm_index: the location index of the dorm, or -1 if the world has no dorm
+    world: World
+    initial_location_id: int
+    greedy: bool
+    guesser_factory: Callable[[list[str]], Guesser]
+    _ids: np.ndarray
+    _go_count: np.ndarray
+    _go_dest: np.ndarray
+    _take_bits: np.ndarray
+    _deposit_bits: np.ndarray
+    _deposit_points: np.ndarray
+    _word_count: np.ndarray
+    _solved: np.ndarray
+    _initial: np.uint64
+    _dorm_start: np.uint64
+    _win: np.uint64
+    _dorm_index: int
+
+    def __init__(self, world: World, initial_location_id: int = DORM, greedy: bool = False,
+                 guesser_factory: Callable[[list[str]], Guesser] = FrequencyGuesser) -> None:
+        """Build the tables the agents are simulated with.
+
+        Preconditions:
+            - initial_location_id in world.locations
+        """
+        if len(world.items) > 64:
+            raise ValueError("the batched simulator supports at most 64 items")
+        self.world = world
+        self.initial_location_id = initial_location_id
+        self.greedy = greedy
+        self.guesser_factory = guesser_factory
+
+        graph = world.graph()
+        n = len(graph.ids)
+        self._ids = np.array(graph.ids, dtype=np.int64)
+        self._dorm_index = graph.index(DORM) if DORM in world.locations else -1
+
+        self._go_count = np.array([len(edges) for edges in graph.edges], dtype=np.int64)
+        self._go_dest = np.zeros((n, max(1, int(self._go_count.max(initial=0)))), dtype=np.int64)
+        for i, edges in enumerate(graph.edges):
+            self._go_dest[i, :len(edges)] = [destination for _, destination in edges]
+
+        bit = {itm.name: 1 << i for i, itm in enumerate(world.items)}
+        starts = [[] for _ in range(n)]
+        targets = [[] for _ in range(n)]
+        for i, loc_id in enumerate(graph.ids):
+            starts[i] = sorted(bit[name] for name in world.locations[loc_id].items if name in bit)
+        for itm in world.items:
+            if itm.target_position in world.locations:
+                targets[graph.index(itm.target_position)].append((bit[itm.name], itm.target_points))
+        self._take_bits = self._pad(starts, np.uint64)
+        self._deposit_bits = self._pad([[b for b, _ in t] for t in targets], np.uint64)
+        self._deposit_points = self._pad([[p for _, p in t] for t in targets], np.int64)
+
+        words = [world.locations[loc_id].puzzle_words for loc_id in graph.ids]
+        self._word_count = np.array([len(w) for w in words], dtype=np.int64)
+        self._solved = self._pad([[solves_puzzle(word, guesser_factory(list(w))) for word in w] if w else []
+                                  for w in words], bool)
+
+        self._initial = np.uint64(sum(bit[itm.name] for itm in world.items if itm.deposited))
+        self._dorm_start = np.uint64(sum(bit[name] for name in world.locations[DORM].items if name in bit)
+                                     if DORM in world.locations else 0)
+        self._win = np.uint64(sum(bit[itm.name] for itm in world.items if itm.target_position == DORM))
+
+    @staticmethod
+    def _pad(rows: list[list], dtype: type) -> np.ndarray:
+        """Return the given rows as a 2D array of the given type, padded with zeros to the longest row."""
+        table = np.zeros((len(rows), max(1, max((len(row) for row in rows), default=0))), dtype=dtype)
+        for i, row in enumerate(rows):
+            table[i, :len(row)] = row
+        return table
+
+    @staticmethod
+    def _nth(options: np.ndarray, n: np.ndarray) -> np.ndarray:
+        """Return the column of the nth True value in each row of the 2D boolean array options."""
+        return np.argmax(np.cumsum(options, axis=1) > n[:, None], axis=1)
+
+    def run(self, agents: int, seed: int = 0, max_steps: int = 10 * MAX_MOVE) -> AgentResults:
+        """Play the given number of agents until each one wins, loses, has no options or has made max_steps
+        decisions, and return their final states. Agent i uses the stream AgentStream(seed, i).
+
+        Preconditions:
+            - agents > 0
+        """
+        rows = np.arange(agents)
+        state = _mix_array(np.uint64((seed * _GOLDEN) & _MASK) + rows.astype(np.uint64))
+        loc = np.full(agents, self.world.graph().index(self.initial_location_id), dtype=np.int64)
+        taken = np.zeros(agents, dtype=np.uint64)
+        deposited = np.full(agents, self._initial, dtype=np.uint64)
+        moves = np.zeros(agents, dtype=np.int64)
+        score = np.zeros(agents, dtype=np.int64)
+        status = np.zeros(agents, dtype=np.int8)
+        steps = np.zeros(agents, dtype=np.int64)
+        won, lost = STATUS_NAMES.index(WON), STATUS_NAMES.index(LOST)
+        golden = np.uint64(_GOLDEN)
+
+        live = rows
+        for _ in range(max_steps):
+            if len(live) == 0:
+                break
+            here = loc[live]
+            has = taken[live]
+            takeable = (self._take_bits[here] & ~(has | deposited[live])[:, None]) != 0
+            depositable = (self._deposit_bits[here] & has[:, None]) != 0
+            gos = self._go_count[here]
+            takes = takeable.sum(axis=1)
+            deposits = depositable.sum(axis=1)
+            if self.greedy:
+                gos = np.where(takes + deposits > 0, 0, gos)
+            count = gos + takes + deposits
+
+            stuck = count == 0
+            if stuck.any():
+                live, here, has, takeable, depositable, gos, takes, count = \
+                    (a[~stuck] for a in (live, here, has, takeable, depositable, gos, takes, count))
+                if len(live) == 0:
+                    break
+
+            state[live] += golden
+            choice = (_mix_array(state[live]) % count.astype(np.uint64)).astype(np.int64)
+            steps[live] += 1
+
+            go = choice < gos
+            go_rows = live[go]
+            loc[go_rows] = self._go_dest[here[go], choice[go]]
+            moves[go_rows] += 1
+
+            take = ~go & (choice - gos < takes)
+            if take.any():
+                slots = self._nth(takeable[take], (choice - gos)[take])
+                take_rows, take_here = live[take], here[take]
+                bits = self._take_bits[take_here, slots]
+                words = self._word_count[take_here]
+                solved = np.zeros(len(take_rows), dtype=bool)
+                puzzle = words > 0
+                if puzzle.any():
+                    puzzle_rows = take_rows[puzzle]
+                    state[puzzle_rows] += golden
+                    word = (_mix_array(state[puzzle_rows]) % words[puzzle].astype(np.uint64)).astype(np.int64)
+                    solved[puzzle] = self._solved[take_here[puzzle], word]
+                taken[take_rows[solved]] |= bits[solved]
+                moves[take_rows[solved]] += 1
+
+            deposit = ~go & ~take
+            if deposit.any():
+                slots = self._nth(depositable[deposit], (choice - gos - takes)[deposit])
+                deposit_rows, deposit_here = live[deposit], here[deposit]
+                bits = self._deposit_bits[deposit_here, slots]
+                taken[deposit_rows] &= ~bits
+                deposited[deposit_rows] |= bits
+                score[deposit_rows] += self._deposit_points[deposit_here, slots]
+
+                moves[deposit_rows] += 1
+                in_dorm = (self._dorm_start & ~taken[deposit_rows]) | (deposited[deposit_rows] & ~self._initial)
+                winners = deposit_rows[(deposit_here == self._dorm_index) & ((in_dorm & self._win) == self._win)]
+                status[winners] = won
+
+            status[live[(status[live] == 0) & (moves[live] >= MAX_MOVE)]] = lost
+            live = live[status[live] == 0]
+
+        return AgentResults(self._ids[loc], taken, deposited, moves, score, status, steps)
+
+
+def agent_options(game: AdventureGame, world: World, greedy: bool = False) -> list[str]:
+    """Return the options of an agent playing the given game in the given world, in the order the batched
+    simulator lists them."""
+    location = game.get_location()
+    actions = [f"take {itm.name}" for itm in world.items
+               if game.location_has_item(location.id_num, itm.name) and not game.is_deposited(itm.name)]
+    actions += [f"deposit {itm.name}" for itm in world.items
+                if game.is_carrying(itm.name) and itm.target_position == location.id_num]
+    if greedy and actions:
+        return actions
+    return list(location.available_commands) + actions
+
+
+def play_agent_game(world: World, agent: int, seed: int = 0, initial_location_id: int = DORM,
+                    greedy: bool = False, guesser_factory: Callable[[list[str]], Guesser] = FrequencyGuesser,
+                    max_steps: int = 10 * MAX_MOVE) -> tuple[AdventureGame, int]:
+    """Play agent number agent of a run with the given seed through AdventureGame.step, and return the game it
+    played and the number of decisions it made."""
+    rng = AgentStream(seed, agent)
+    game = AdventureGame.from_world(world, initial_location_id)
+    game.rng = rng
+    game.start()
+
+    steps = 0
+    while game.ongoing and steps < max_steps:
+        options = agent_options(game, world, greedy)
+        if not options:
+            break
+        game.step(rng.choice(options))
+        steps += 1
+        if game.active_puzzle is not None:
+            guesser = guesser_factory(list(world.locations[game.active_puzzle.location_id].puzzle_words))
+            mirror = HangmanPuzzle(game.active_puzzle.word, PUZZLE_TRIES)
+        while game.active_puzzle is not None:
+            if game.active_puzzle.retrying:
+                game.step("n")
+            else:
+                letter = guesser.next_guess(mirror)
+                mirror.guess(letter)
+                game.step(letter)
+    return game, steps
+
+
+def play_agent(world: World, agent: int, seed: int = 0, initial_location_id: int = DORM, greedy: bool = False,
+               guesser_factory: Callable[[list[str]], Guesser] = FrequencyGuesser,
+               max_steps: int = 10 * MAX_MOVE) -> tuple[int, int, int, int, int, str, int]:
+    """Play agent number agent of a run with the given seed through AdventureGame.step, and return its
+    (location id, taken, deposited, moves, score, status, steps) as AgentResults.agent does."""
+    game, steps = play_agent_game(world, agent, seed, initial_location_id, greedy, guesser_factory, max_steps)
+    taken = sum(1 << i for i, itm in enumerate(world.items) if game.is_carrying(itm.name))
+    deposited = sum(1 << i for i, itm in enumerate(world.items) if game.is_deposited(itm.name))
+    return game.current_location_id, taken, deposited, game.moves, game.score, game.status, steps
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import time
+
+    game_world = World.load('game_data.json')
+    for greedy_policy in (False, True):
+        simulator = AgentSimulator(game_world, greedy=greedy_policy)
+        start = time.perf_counter()
+        results = simulator.run(100_000, seed=111)
+        elapsed = time.perf_counter() - start
+        print(f"greedy={greedy_policy}: win rate {results.win_rate():.4f}, "
+              f"{int(results.steps.sum()) / elapsed / 1e6:.1f} million agent-steps/s")
+        assert results.win_rate() > 0
+        assert all(results.agent(i) == play_agent(game_world, i, 111, greedy=greedy_policy) for i in range(500))
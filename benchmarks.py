@@ -0,0 +1,217 @@
+"""CSC111 Project 1: Text Adventure Game - Benchmarks
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module times the main operations of the game on generated worlds of several sizes, and writes
+ the results as JSON so that runs on different versions of the code can be compared.
+
+Each benchmark is run repeats times on each world and reports its best time. The benchmarks are:
+    - load_json: AdventureGame.load_json_game_data on the whole file
+    - load_game_data: AdventureGame._load_game_data, which uses a compiled snapshot when there is a fresh one
+    - simulation_init: AdventureGameSimulation construction, including loading the world the first time
+    - generate_events: AdventureGameSimulation.generate_events on an already loaded world
+    - event_list_add, event_list_id_log, event_list_remove: EventList operations
+    - undo: AdventureGame.undo_action after a move
+    - puzzle_guess: AdventureGame.step applying one puzzle guess
+
+Run it with, for example:
+    python benchmarks.py --sizes 10 1000 100000 --output results.json --label my-change
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Callable, Optional
+
+from adventure import AdventureGame, World, DORM
+from event_logger import Event, EventList
+from simulation import AdventureGameSimulation
+from world_generator import generate_world
+
+
+def _best(operation: Callable[[], object], repeats: int) -> float:
+    """Return the best time in seconds of the given number of runs of operation."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _random_walk(world: World, length: int, seed: int = 0) -> list[str]:
+    """Return the commands of a random walk of the given length from the dorm."""
+    rng = random.Random(seed)
+    commands = []
+    location = world.locations[DORM]
+    for _ in range(length):
+        if not location.available_commands:
+            break
+        command = rng.choice(list(location.available_commands))
+        commands.append(command)
+        location = world.locations[location.available_commands[command]]
+    return commands
+
+
+def bench_loading(game_data_file: str, repeats: int) -> dict[str, tuple[int, float]]:
+    """Return the (operations, best seconds) of loading the given game data file."""
+    return {'load_json': (1, _best(lambda: AdventureGame.load_json_game_data(game_data_file), repeats)),
+            'load_game_data': (1, _best(lambda: AdventureGame._load_game_data(game_data_file), repeats))}
+
+
+def bench_simulation(game_data_file: str, repeats: int, commands: int) -> dict[str, tuple[int, float]]:
+    """Return the (operations, best seconds) of constructing simulations of a random walk with the given number of
+    commands, first loading the world and then reusing it."""
+    walk = _random_walk(World(*AdventureGame.load_json_game_data(game_data_file)), commands)
+    init = _best(lambda: AdventureGameSimulation(game_data_file, DORM, walk), 1)
+    game = AdventureGame(game_data_file, DORM)
+    events = _best(lambda: AdventureGameSimulation(game_data_file, DORM, walk, game), repeats)
+    return {'simulation_init': (len(walk), init), 'generate_events': (len(walk), events)}
+
+
+def bench_event_list(repeats: int, events: int) -> dict[str, tuple[int, float]]:
+    """Return the (operations, best seconds) of adding the given number of events to an EventList, reading its id
+    log, then removing them all."""
+    def fill() -> EventList:
+        log = EventList()
+        log.add_event(Event(0, "description"))
+        for i in range(1, events):
+            log.add_event(Event(i, "description"), "go east")
+        return log
+
+    def remove() -> float:
+        log = fill()
+        start = time.perf_counter()
+        for _ in range(events):
+            log.remove_last_event()
+        return time.perf_counter() - start
+
+    full = fill()
+    return {'event_list_add': (events, _best(fill, repeats)),
+            'event_list_id_log': (events, _best(full.get_id_log, repeats)),
+            'event_list_remove': (events, min(remove() for _ in range(repeats)))}
+
+
+def bench_undo(game_data_file: str, repeats: int, undos: int) -> dict[str, tuple[int, float]]:
+    """Return the (operations, best seconds) of undoing the given number of moves, each made just before.
+    Only the undos are timed."""
+    world = World.load(game_data_file)
+    command = next(iter(world.locations[DORM].available_commands), None)
+    if command is None:
+        return {}
+
+    def undo_moves() -> float:
+        game = AdventureGame.from_world(world, DORM)
+        game.start()
+        elapsed = 0.0
+        for _ in range(undos):
+            game.step(command)
+            start = time.perf_counter()
+            game.undo_action(game.log)
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    return {'undo': (undos, min(undo_moves() for _ in range(repeats)))}
+
+
+def bench_puzzle(game_data_file: str, repeats: int, puzzles: int) -> dict[str, tuple[int, float]]:
+    """Return the (operations, best seconds) of every guess made while solving the given number of puzzles.
+    Only the guesses are timed."""
+    world = World.load(game_data_file)
+    location = next((loc for loc in world.locations.values() if loc.puzzle_words and loc.items), None)
+    if location is None:
+        return {}
+    guesses = 0
+
+    def solve_puzzles() -> float:
+        nonlocal guesses
+        guesses = 0
+        elapsed = 0.0
+        rng = random.Random(0)
+        for _ in range(puzzles):
+            game = AdventureGame.from_world(world, location.id_num)
+            game.rng = rng
+            game.start()
+            game.step(f"take {location.items[0]}")
+            for letter in dict.fromkeys(game.active_puzzle.word):
+                start = time.perf_counter()
+                game.step(letter)
+                elapsed += time.perf_counter() - start
+                guesses += 1
+        return elapsed
+
+    best = min(solve_puzzles() for _ in range(repeats))
+    return {'puzzle_guess': (guesses, best)}
+
+
+def run_suite(sizes: list[int], repeats: int = 3, directory: Optional[str] = None,
+              label: Optional[str] = None) -> dict:
+    """Generate a world of each of the given sizes in directory, or a temporary directory if it is None, run every
+    benchmark on it, and return the results as a JSON-compatible dict.
+
+    Preconditions:
+        - all(size >= 1 for size in sizes)
+        - repeats > 0
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as temporary:
+        folder = temporary if directory is None else directory
+        for size in sizes:
+            game_data_file = os.path.join(folder, f"world_{size}.json")
+            world_info = generate_world(game_data_file, size)
+            timings = {}
+            timings.update(bench_loading(game_data_file, repeats))
+            timings.update(bench_simulation(game_data_file, repeats, 1000))
+            timings.update(bench_event_list(repeats, 10000))
+            timings.update(bench_undo(game_data_file, repeats, 1000))
+            timings.update(bench_puzzle(game_data_file, repeats, 100))
+            for name, (operations, seconds) in timings.items():
+                results.append({'benchmark': name, 'locations': size, 'items': world_info['items'],
+                                'operations': operations, 'seconds': seconds,
+                                'operations_per_second': operations / seconds if seconds > 0 else None})
+
+    return {'label': label, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+            'machine': platform.machine(), 'repeats': repeats, 'results': results}
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the game on generated worlds.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--directory', default=None, help="where to keep the generated worlds")
+    parser.add_argument('--label', default=None, help="a name for this run, such as a version")
+    parser.add_argument('--output', default=None, help="the JSON file to write; printed if not given")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.repeats, args.directory, args.label)
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
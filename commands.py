@@ -0,0 +1,105 @@
+"""CSC111 Project 1: Text Adventure Game - Command Compiler
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module parses player commands into typed commands, once per distinct command text.
+
+A compiled command holds its verb and an interned argument id: the position of a menu command in the menu,
+ the id of a move command such as "go east", or the position of an item in the world's items. The compiler
+ of a world is shared by every game played in it, so each command text is only ever parsed once.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from game_entities import Item
+
+# The verb of a compiled command
+MENU_COMMAND = 0
+MOVE = 1
+TAKE = 2
+DEPOSIT = 3
+
+# The name of each verb, indexed by the verb
+VERB_NAMES = ("menu", "move", "take", "deposit")
+
+
+@dataclass(frozen=True, slots=True)
+class Command:
+    """A player command, parsed once.
+
+    Instance Attributes:
+        - verb: one of MENU_COMMAND, MOVE, TAKE or DEPOSIT
+        - argument: the position of the command in the menu for MENU_COMMAND, the id of the move for MOVE, or
+                    the position of the item in the world's items for TAKE and DEPOSIT
+        - text: the command as the player types it
+
+    Representation Invariants:
+        - self.verb in {MENU_COMMAND, MOVE, TAKE, DEPOSIT}
+        - self.argument >= 0
+    """
+    verb: int
+    argument: int
+    text: str
+
+
+class CommandCompiler:
+    """The compiled commands of one world.
+
+    Instance Attributes:
+        - moves: the text of every move command learned so far, indexed by its id
+
+    Representation Invariants:
+        - all(self.compile(text).argument == i for i, text in enumerate(self.moves))
+    """
+    # Private Instance Attributes:
+    #   - _commands: a mapping from the text of every menu, take and deposit command, and every move command
+    #                learned so far, to its compiled command
+    moves: list[str]
+    _commands: dict[str, Command]
+
+    def __init__(self, items: list[Item], menu: list[str]) -> None:
+        """Compile every menu command, and the take and deposit command of every item."""
+        self.moves = []
+        self._commands = {}
+        for i, itm in enumerate(items):
+            self._commands[f"take {itm.name}"] = Command(TAKE, i, f"take {itm.name}")
+            self._commands[f"deposit {itm.name}"] = Command(DEPOSIT, i, f"deposit {itm.name}")
+        for i, text in enumerate(menu):
+            self._commands[text] = Command(MENU_COMMAND, i, text)
+
+    def learn_moves(self, texts: Iterable[str]) -> None:
+        """Compile every given move command that has not been compiled yet. Moves are learned as locations are
+        used, so that a streamed world is never read in full just to compile its commands."""
+        for text in texts:
+            if text not in self._commands:
+                self._commands[text] = Command(MOVE, len(self.moves), text)
+                self.moves.append(text)
+
+    def compile(self, text: str) -> Optional[Command]:
+        """Return the compiled command with the given text, or None if it is not a known command."""
+        return self._commands.get(text)
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
@@ -0,0 +1,385 @@
+"""CSC111 Project 1: Text Adventure Game - Compact World
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module stores the locations of a world as a struct of arrays, for worlds with hundreds of
+ thousands of locations.
+
+Rather than one Location object per location, each with its own dict of commands and lists of items and
+ puzzle words, a CompactLocations container keeps one typed array per attribute. Command strings, item names and
+ puzzle words are each stored once in a shared vocabulary and referred to by integer codes. The commands of each
+ location are stored as parallel arrays of command codes and destinations. Its items and puzzle words are
+ stored as arrays of codes. Descriptions are kept in a TextPool.
+
+CompactLocations is a mapping from location id to Location, so it can replace AdventureGame._locations without
+ changing any caller. Looking up a location returns a CompactLocation, a small view that reads the arrays only
+ when its attributes are used. A compact world is loaded with load_compact_game_data and played with
+ AdventureGame.from_world, for example:
+    game = AdventureGame.from_world(World(*load_compact_game_data('game_data.json')), 1)
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import gc
+import json
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Mapping
+from typing import Iterator, Optional
+
+from adventure import AdventureGame
+from game_entities import Location, CompactItem
+from text_pool import TextPool, PooledLocation, load_pooled_game_data
+
+
+class Vocabulary:
+    """A table of unique interned strings, each identified by an integer code.
+
+    Instance Attributes:
+        - strings: the strings in the table, indexed by their code
+
+    Representation Invariants:
+        - all(self.code(text) == i for i, text in enumerate(self.strings))
+    """
+    # Private Instance Attributes:
+    #   - _codes: a mapping from each string in the table to its code
+    strings: list[str]
+    _codes: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize a new empty vocabulary."""
+        self.strings = []
+        self._codes = {}
+
+    def __len__(self) -> int:
+        """Return the number of strings in this vocabulary."""
+        return len(self.strings)
+
+    def code(self, text: str) -> int:
+        """Return the code of text, adding it to this vocabulary first if it is not already present."""
+        code = self._codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            text = sys.intern(text)
+            self._codes[text] = code
+            self.strings.append(text)
+        return code
+
+    def find(self, text: str) -> Optional[int]:
+        """Return the code of text, or None if it is not in this vocabulary."""
+        return self._codes.get(text)
+
+
+class CommandMap(Mapping):
+    """The available commands of one location of a CompactLocations, as a read-only mapping from command to the
+    id of the location it leads to."""
+    # Private Instance Attributes:
+    #   - _locations: the container the location belongs to
+    #   - _start, _end: the positions of the location's commands in the container's command arrays
+    __slots__ = ('_locations', '_start', '_end')
+    _locations: CompactLocations
+    _start: int
+    _end: int
+
+    def __init__(self, locations: CompactLocations, start: int, end: int) -> None:
+        """Initialize a view of the commands at the given positions of the given container."""
+        self._locations = locations
+        self._start = start
+        self._end = end
+
+    def _position(self, command: object) -> int:
+        """Return the position of the given command in the container's command arrays, or -1 if it is not one of
+        this location's commands."""
+        code = self._locations.commands.find(command) if isinstance(command, str) else None
+        if code is not None:
+            codes = self._locations.command_codes
+            for position in range(self._start, self._end):
+                if codes[position] == code:
+                    return position
+        return -1
+
+    def __getitem__(self, command: str) -> int:
+        """Return the id of the location the given command leads to."""
+        position = self._position(command)
+        if position == -1:
+            raise KeyError(command)
+        return self._locations.destinations[position]
+
+    def __contains__(self, command: object) -> bool:
+        """Return whether command is one of this location's commands."""
+        return self._position(command) != -1
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over this location's commands in the order they were given."""
+        strings = self._locations.commands.strings
+        return (strings[code] for code in self._locations.command_codes[self._start:self._end])
+
+    def __len__(self) -> int:
+        """Return the number of this location's commands."""
+        return self._end - self._start
+
+
+class CompactLocation(PooledLocation):
+    """A location of a CompactLocations. It has every attribute of a Location, each read from the container's
+    arrays when it is used, and cannot be changed."""
+    # Private Instance Attributes:
+    #   - _locations: the container the location belongs to
+    #   - _row: the position of the location in the container's arrays
+    _locations: CompactLocations
+    _row: int
+
+    def __init__(self, locations: CompactLocations, row: int) -> None:
+        """Initialize a view of the location at the given row of the given container."""
+        self._locations = locations
+        self._row = row
+
+    @property
+    def id_num(self) -> int:
+        """Return the id of this location."""
+        return self._locations.ids[self._row]
+
+    @property
+    def pool(self) -> TextPool:
+        """Return the text pool holding this location's descriptions."""
+        return self._locations.pool
+
+    @property
+    def brief_handle(self) -> int:
+        """Return the handle of this location's brief description in pool."""
+        return self._locations.brief_handles[self._row]
+
+    @property
+    def long_handle(self) -> int:
+        """Return the handle of this location's long description in pool."""
+        return self._locations.long_handles[self._row]
+
+    @property
+    def available_commands(self) -> CommandMap:
+        """Return a read-only mapping from each available command at this location to the id of the location
+        it leads to."""
+        starts = self._locations.command_starts
+        return CommandMap(self._locations, starts[self._row], starts[self._row + 1])
+
+    @property
+    def items(self) -> list[str]:
+        """Return a new list of the names of the items at this location when the world was loaded."""
+        locations = self._locations
+        names = locations.item_names.strings
+        starts = locations.item_starts
+        return [names[code] for code in locations.item_codes[starts[self._row]:starts[self._row + 1]]]
+
+    @property
+    def puzzle_words(self) -> list[str]:
+        """Return a new list of this location's puzzle words."""
+        locations = self._locations
+        words = locations.words.strings
+        starts = locations.word_starts
+        return [words[code] for code in locations.word_codes[starts[self._row]:starts[self._row + 1]]]
+
+    @property
+    def visited(self) -> bool:
+        """Return whether this location was marked visited when the world was loaded."""
+        return bool(self._locations.visited[self._row])
+
+
+class CompactLocations(Mapping):
+    """The locations of a world, stored as a struct of arrays, as a read-only mapping from location id to
+    Location.
+
+    Instance Attributes:
+        - pool: the text pool holding every description
+        - commands: the vocabulary of every command
+        - item_names: the vocabulary of every item name
+        - words: the vocabulary of every puzzle word
+        - ids: the id of the location in each row
+        - brief_handles, long_handles: the handle in pool of the brief and long description of each row
+        - command_starts: the position of the first command of each row in command_codes and destinations,
+                          followed by the total number of commands
+        - command_codes: the code in commands of every command of every row
+        - destinations: the id of the location every command of every row leads to
+        - item_starts, item_codes: the codes in item_names of the items of each row, stored like commands
+        - word_starts, word_codes: the codes in words of the puzzle words of each row, stored like commands
+        - visited: whether each row was marked visited in the game data
+
+    Representation Invariants:
+        - len(self.command_starts) == len(self.ids) + 1
+        - len(self.command_codes) == len(self.destinations) == self.command_starts[-1]
+    """
+    # Private Instance Attributes:
+    #   - _first: the id in the first row if every row's id is one more than the previous row's, so that a row
+    #             is found by subtraction, or None otherwise
+    #   - _rows: a mapping from location id to row, built only once _first is None
+    pool: TextPool
+    commands: Vocabulary
+    item_names: Vocabulary
+    words: Vocabulary
+    ids: array
+    brief_handles: array
+    long_handles: array
+    command_starts: array
+    command_codes: array
+    destinations: array
+    item_starts: array
+    item_codes: array
+    word_starts: array
+    word_codes: array
+    visited: bytearray
+    _first: Optional[int]
+    _rows: dict[int, int]
+
+    def __init__(self, pool: Optional[TextPool] = None) -> None:
+        """Initialize a new container with no locations, storing descriptions in pool, or a new TextPool if it
+        is None."""
+        self.pool = TextPool() if pool is None else pool
+        self.commands, self.item_names, self.words = Vocabulary(), Vocabulary(), Vocabulary()
+        self.ids = array('i')
+        self.brief_handles, self.long_handles = array('I'), array('I')
+        self.command_starts, self.command_codes, self.destinations = array('I', [0]), array('I'), array('i')
+        self.item_starts, self.item_codes = array('I', [0]), array('I')
+        self.word_starts, self.word_codes = array('I', [0]), array('I')
+        self.visited = bytearray()
+        self._first = None
+        self._rows = {}
+
+    @classmethod
+    def from_locations(cls, locations: Mapping[int, Location], pool: Optional[TextPool] = None) -> CompactLocations:
+        """Return a new container holding a copy of the given locations."""
+        compact = cls(pool)
+        for loc_id, location in locations.items():
+            compact.add(loc_id, location.brief_description, location.long_description, location.available_commands,
+                        location.items, location.puzzle_words, location.visited)
+        return compact
+
+    def add(self, loc_id: int, brief_description: str, long_description: str,
+            available_commands: Mapping[str, int], items: list[str], puzzle_words: list[str], visited: bool) -> None:
+        """Add a location with the given attributes to this container.
+
+        Preconditions:
+            - loc_id not in self
+        """
+        row = len(self.ids)
+        if row == 0:
+            self._first = loc_id
+        elif self._first is not None and loc_id != self._first + row:
+            self._rows = {rows_id: i for i, rows_id in enumerate(self.ids)}
+            self._first = None
+        if self._first is None:
+            self._rows[loc_id] = row
+
+        self.ids.append(loc_id)
+        self.brief_handles.append(self.pool.add(brief_description))
+        self.long_handles.append(self.pool.add(long_description))
+        for command, destination in available_commands.items():
+            self.command_codes.append(self.commands.code(command))
+            self.destinations.append(destination)
+        self.command_starts.append(len(self.command_codes))
+        self.item_codes.extend(self.item_names.code(name) for name in items)
+        self.item_starts.append(len(self.item_codes))
+        self.word_codes.extend(self.words.code(word) for word in puzzle_words)
+        self.word_starts.append(len(self.word_codes))
+        self.visited.append(visited)
+
+    def _row(self, loc_id: object) -> int:
+        """Return the row of the location with the given id, or -1 if there is none."""
+        if self._first is None:
+            return self._rows.get(loc_id, -1)
+        if isinstance(loc_id, int) and 0 <= loc_id - self._first < len(self.ids):
+            return loc_id - self._first
+        return -1
+
+    def __getitem__(self, loc_id: int) -> CompactLocation:
+        """Return a view of the location with the given id."""
+        row = self._row(loc_id)
+        if row == -1:
+            raise KeyError(loc_id)
+        return CompactLocation(self, row)
+
+    def __contains__(self, loc_id: object) -> bool:
+        """Return whether a location with the given id exists."""
+        return self._row(loc_id) != -1
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over every location id in the order the locations were added."""
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.ids)
+
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the arrays and the text pool, not counting the vocabularies."""
+        arrays = (self.ids, self.brief_handles, self.long_handles, self.command_starts, self.command_codes,
+                  self.destinations, self.item_starts, self.item_codes, self.word_starts, self.word_codes)
+        return (sum(arr.itemsize * len(arr) for arr in arrays) + len(self.visited) + self.pool.stored_bytes()
+                + self.pool.table_bytes())
+
+
+def load_compact_game_data(filename: str, pool: Optional[TextPool] = None) \
+        -> tuple[CompactLocations, list[CompactItem]]:
+    """Load locations and items from the game data JSON file with the given filename, like
+    AdventureGame.load_json_game_data, but into a CompactLocations and CompactItems. Descriptions are stored in
+    pool, or a new TextPool if it is None."""
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    locations = CompactLocations(pool)
+    for loc_data in data['locations']:
+        locations.add(loc_data['id'], loc_data['brief_description'], loc_data['long_description'],
+                      loc_data['available_commands'], loc_data['items'], loc_data['puzzle_words'], loc_data['visited'])
+    items = [CompactItem(sys.intern(item_data['name']), item_data['description'], item_data['start_position'],
+                         item_data['target_position'], item_data['target_points'], item_data['deposited'])
+             for item_data in data['items']]
+    return locations, items
+
+
+def measure_world_memory(game_data_file: str) -> dict[str, int]:
+    """Return the number of bytes of memory held by the locations and items of the given game data file, when
+    loaded as Location and Item objects ('plain'), with their descriptions in a text pool ('pooled'), and when
+    loaded compactly ('compact').
+
+    Preconditions:
+        - game_data_file is the filename of a valid game data JSON file
+    """
+    sizes = {}
+    for name, load in (('plain', AdventureGame.load_json_game_data), ('pooled', load_pooled_game_data),
+                       ('compact', load_compact_game_data)):
+        gc.collect()
+        tracemalloc.start()
+        world = load(game_data_file)
+        gc.collect()
+        sizes[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del world
+    return sizes
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import os
+    import tempfile
+    from world_generator import generate_world
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (1000, 100000):
+            path = os.path.join(directory, f"world_{size}.json")
+            generate_world(path, size)
+            print(size, measure_world_memory(path))
@@ -0,0 +1,449 @@
+"""CSC111 Project 1: Text Adventure Game - Event Log Export
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module exports the event logs of many sessions to a columnar store on disk, and answers questions
+ about all of them at once from its columns, without replaying any game:
+    - how often each location is visited, in total or by distinct sessions (a heatmap of the world)
+    - how often players move from each location to each other one
+    - the most common paths of a given length
+    - how many sessions reach each location of a funnel, in order
+    - how many steps sessions take to make their first deposit
+    - the fraction of sessions that were won, lost, quit or left ongoing
+
+A store is a directory holding two tables, each column of which is a file of little-endian integers:
+    - events: one row per event, with its session id, step (its position in its session's log), location id
+      and command code (the code of the command that led to the event, or -1 for a session's first event)
+    - sessions: one row per session, with its session id, number of events, status code, score, moves, and the
+      step of the event at which it first deposited an item (or -1 if it never did)
+ and a meta.json file holding the number of rows of each table, the command of every command code and the
+ status of every status code. Sessions are appended in batches; meta.json is replaced only once a batch's rows
+ are written, so a store is never read with half a batch in it.
+
+This module requires NumPy.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import os
+from array import array
+from typing import Iterable, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from adventure import ONGOING, WON, LOST, QUIT
+from event_logger import EventList, ArrayEventList
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+STORE_FORMAT = 1
+STATUSES = [ONGOING, WON, LOST, QUIT]
+
+# The columns of each table, with the array typecode they are buffered in and the NumPy type they are read as
+_COLUMNS = {
+    'events': [('session', 'q', '<i8'), ('step', 'i', '<i4'), ('location', 'i', '<i4'), ('command', 'i', '<i4')],
+    'sessions': [('session', 'q', '<i8'), ('length', 'i', '<i4'), ('status', 'b', '<i1'), ('score', 'i', '<i4'),
+                 ('moves', 'i', '<i4'), ('first_deposit', 'i', '<i4')],
+}
+
+
+def _column_path(directory: str, table: str, column: str) -> str:
+    """Return the path of the file holding the given column of the given table of the store in directory."""
+    return os.path.join(directory, f"{table}.{column}.bin")
+
+
+def _read_meta(directory: str) -> Optional[dict]:
+    """Return the metadata of the store in directory, or None if there is no store there yet."""
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _first_deposit(log: EventList) -> int:
+    """Return the step of the first event in log whose command deposited an item, or -1 if there is none or
+    the log's events have no snapshots."""
+    for step, event in enumerate(log):
+        if event.snapshot is not None and any(change.deposited_after and not change.deposited_before
+                                              for change in event.snapshot.changes):
+            return step
+    return -1
+
+
+def _first_deposit_command(commands: list[Optional[str]]) -> int:
+    """Return the step of the first event reached by a deposit command, given the command leading from each
+    event of a log to the next one, or -1 if there is none. A deposit command is only accepted by the game when
+    it deposits an item, so every one in a log made a deposit."""
+    for step, command in enumerate(commands):
+        if command is not None and command.startswith("deposit "):
+            return step + 1
+    return -1
+
+
+def _count_keys(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return every distinct value of keys, in increasing order, and the number of times it occurs.
+
+    This is np.unique with return_counts, by sorting and comparing neighbours, which is several times faster on
+    tens of millions of integers.
+    """
+    keys = np.sort(keys)
+    if len(keys) == 0:
+        return keys, np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.diff(np.append(starts, len(keys)))
+
+
+class EventLogWriter:
+    """A writer that appends the event logs of sessions to a columnar store.
+
+    Instance Attributes:
+        - directory: the directory of the store
+        - batch_size: the number of sessions buffered before they are written to the store
+        - commands: the command of every command code, in code order
+
+    Representation Invariants:
+        - self.batch_size > 0
+    """
+    # Private Instance Attributes:
+    #   - _command_codes: a mapping from every command in commands to its code
+    #   - _rows: the number of rows of each table already written to the store
+    #   - _buffers: the rows of each column of each table not written yet
+    #   - _buffered: the number of sessions in _buffers
+    directory: str
+    batch_size: int
+    commands: list[str]
+    _command_codes: dict[str, int]
+    _rows: dict[str, int]
+    _buffers: dict[str, list[array]]
+    _buffered: int
+
+    def __init__(self, directory: str, batch_size: int = 10000) -> None:
+        """Initialize a new writer to the store in directory, creating the store if it does not exist yet.
+        Sessions are appended after those already in the store.
+
+        Preconditions:
+            - batch_size > 0
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        meta = _read_meta(directory)
+        if meta is None:
+            self.commands = []
+            self._rows = {table: 0 for table in _COLUMNS}
+        else:
+            self.commands = meta['commands']
+            self._rows = {table: meta[table] for table in _COLUMNS}
+        self._command_codes = {command: code for code, command in enumerate(self.commands)}
+
+        # Drop any rows a writer wrote after the store's metadata was last replaced
+        for table, columns in _COLUMNS.items():
+            for column, _, dtype in columns:
+                path = _column_path(directory, table, column)
+                size = self._rows[table] * np.dtype(dtype).itemsize
+                if not os.path.exists(path) or os.path.getsize(path) != size:
+                    with open(path, 'ab') as f:
+                        f.truncate(size)
+        self._buffers = {}
+        self._clear()
+
+    def _clear(self) -> None:
+        """Start new, empty buffers."""
+        self._buffers = {table: [array(typecode) for _, typecode, _ in columns]
+                         for table, columns in _COLUMNS.items()}
+        self._buffered = 0
+
+    def _command_code(self, command: Optional[str]) -> int:
+        """Return the code of the given command, giving it a new code if it has none yet, or -1 if it is None."""
+        if command is None:
+            return -1
+        code = self._command_codes.get(command)
+        if code is None:
+            code = len(self.commands)
+            self._command_codes[command] = code
+            self.commands.append(command)
+        return code
+
+    def add_session(self, session: int, log: EventList | ArrayEventList, status: str = ONGOING, score: int = 0,
+                    moves: int = 0) -> None:
+        """Add the events of the given session's log, and its status, score and moves at the end of play.
+
+        Preconditions:
+            - status in STATUSES
+        """
+        ids = log.get_id_log()
+        session_column, step_column, location_column, command_column = self._buffers['events']
+        session_column.extend([session] * len(ids))
+        step_column.extend(range(len(ids)))
+        location_column.extend(ids)
+        if isinstance(log, ArrayEventList):
+            commands = [log.command_at(i) for i in range(len(log) - 1)]
+            first_deposit = _first_deposit_command(commands)
+        else:
+            commands = [event.next_command for event in log][:-1]
+            first_deposit = _first_deposit(log)
+        if ids:
+            command_column.append(-1)
+        command_column.extend(self._command_code(command) for command in commands)
+
+        for column, value in zip(self._buffers['sessions'],
+                                 (session, len(ids), STATUSES.index(status), score, moves, first_deposit)):
+            column.append(value)
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def add_game(self, session: int, game: AdventureGame) -> None:
+        """Add the log of the given game, played in the given session, with its current status, score and
+        moves."""
+        self.add_session(session, game.log, game.status, game.score, game.moves)
+
+    def add_games(self, games: Iterable[tuple[int, AdventureGame]]) -> None:
+        """Add the log of every given (session id, game)."""
+        for session, game in games:
+            self.add_game(session, game)
+
+    def flush(self) -> None:
+        """Append every buffered session to the store's column files, then record them in its metadata."""
+        if self._buffered == 0:
+            return
+        for table, columns in _COLUMNS.items():
+            for (column, _, dtype), buffer in zip(columns, self._buffers[table]):
+                if len(buffer) > 0:
+                    with open(_column_path(self.directory, table, column), 'ab') as f:
+                        f.write(np.frombuffer(buffer, dtype=buffer.typecode).astype(dtype).tobytes())
+            self._rows[table] += len(self._buffers[table][0])
+        self._clear()
+
+        meta = {'format': STORE_FORMAT, 'statuses': STATUSES, 'commands': self.commands, **self._rows}
+        temporary = os.path.join(self.directory, 'meta.json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temporary, os.path.join(self.directory, 'meta.json'))
+
+    def close(self) -> None:
+        """Write every buffered session to the store."""
+        self.flush()
+
+    def __enter__(self) -> EventLogWriter:
+        """Return this writer when a with block is entered."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write every buffered session to the store when a with block is left."""
+        self.close()
+
+
+class EventLogStore:
+    """The sessions of a columnar store, read as NumPy arrays and queried all at once.
+
+    The column files are memory-mapped, so opening a store reads nothing but its metadata, and a query reads
+    only the columns it uses.
+
+    Instance Attributes:
+        - directory: the directory of the store
+        - commands: the command of every command code, in code order
+        - statuses: the status of every status code, in code order
+        - events: every column of the events table, by column name
+        - sessions: every column of the sessions table, by column name
+
+    Representation Invariants:
+        - all(len(column) == len(self.events['session']) for column in self.events.values())
+        - all(len(column) == len(self.sessions['session']) for column in self.sessions.values())
+        - self.sessions['length'].sum() == len(self.events['session'])
+    """
+    # Private Instance Attributes:
+    #   - _session_index: the row in the sessions table of every event's session, or None if not computed yet
+    directory: str
+    commands: list[str]
+    statuses: list[str]
+    events: dict[str, np.ndarray]
+    sessions: dict[str, np.ndarray]
+    _session_index: Optional[np.ndarray]
+
+    def __init__(self, directory: str) -> None:
+        """Open the store in directory.
+
+        Preconditions:
+            - directory holds a store written by an EventLogWriter
+        """
+        meta = _read_meta(directory)
+        self.directory = directory
+        self.commands, self.statuses = meta['commands'], meta['statuses']
+        tables = {}
+        for table, columns in _COLUMNS.items():
+            tables[table] = {}
+            for column, _, dtype in columns:
+                if meta[table] == 0:
+                    tables[table][column] = np.empty(0, dtype=dtype)
+                else:
+                    tables[table][column] = np.memmap(_column_path(directory, table, column), dtype=dtype,
+                                                      mode='r', shape=(meta[table],))
+        self.events, self.sessions = tables['events'], tables['sessions']
+        self._session_index = None
+
+    def __len__(self) -> int:
+        """Return the number of sessions in this store."""
+        return len(self.sessions['session'])
+
+    def session_index(self) -> np.ndarray:
+        """Return the row in the sessions table of the session of every event."""
+        if self._session_index is None:
+            self._session_index = np.repeat(np.arange(len(self), dtype=np.int64), self.sessions['length'])
+        return self._session_index
+
+    def visit_counts(self, distinct: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Return the id of every location visited, in increasing order, and the number of events at it, or the
+        number of distinct sessions with an event at it if distinct is True."""
+        locations = self.events['location'].astype(np.int64)
+        if distinct:
+            width = int(locations.max(initial=0)) + 1
+            locations = _count_keys(self.session_index() * width + locations)[0] % width
+        counts = np.bincount(locations)
+        ids = np.flatnonzero(counts)
+        return ids, counts[ids]
+
+    def _transitions(self) -> np.ndarray:
+        """Return whether each event after the first is in the same session as the event before it."""
+        index = self.session_index()
+        return index[1:] == index[:-1]
+
+    def transition_counts(self, moves_only: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the source and destination location ids of every transition between consecutive events of a
+        session, and the number of times it happened. Only transitions to a different location are counted if
+        moves_only is True. Transitions are sorted by source, then destination."""
+        locations = self.events['location'].astype(np.int64)
+        same = self._transitions()
+        if moves_only:
+            same &= locations[1:] != locations[:-1]
+        width = int(locations.max(initial=0)) + 1
+        keys, counts = _count_keys(locations[:-1][same] * width + locations[1:][same])
+        return keys // width, keys % width, counts
+
+    def popular_paths(self, length: int = 3, top: int = 10) -> list[tuple[tuple[int, ...], int]]:
+        """Return the top most common sequences of length locations visited one after another within a session,
+        each with the number of times it was walked, most common first. Events that stay at the same location
+        are not part of a path.
+
+        Preconditions:
+            - length >= 2
+            - top > 0
+        """
+        locations = self.events['location'].astype(np.int64)
+        keep = np.ones(len(locations), dtype=bool)
+        keep[1:] = ~(self._transitions() & (locations[1:] == locations[:-1]))
+        locations, index = locations[keep], self.session_index()[keep]
+        if len(locations) < length:
+            return []
+        starts = len(locations) - length + 1
+        within = index[:starts] == index[length - 1:]
+
+        width = int(locations.max(initial=0)) + 1
+        if width ** length >= 2 ** 63:
+            windows = np.lib.stride_tricks.sliding_window_view(locations, length)
+            paths, counts = np.unique(windows[within], axis=0, return_counts=True)
+        else:
+            # Number every path by its locations as digits in base width, and count the numbers
+            keys = locations[:starts][within]
+            for j in range(1, length):
+                keys = keys * width + locations[j:starts + j][within]
+            keys, counts = _count_keys(keys)
+            paths = np.stack([keys // width ** (length - 1 - j) % width for j in range(length)], axis=1)
+        order = np.argsort(-counts, kind='stable')[:top]
+        return [(tuple(int(loc_id) for loc_id in paths[i]), int(counts[i])) for i in order]
+
+    def funnel(self, stages: list[int]) -> np.ndarray:
+        """Return, for every location id in stages, the number of sessions that reached it after reaching every
+        earlier stage, in order."""
+        locations, steps, index = self.events['location'], self.events['step'], self.session_index()
+        reached = np.full(len(self), -1, dtype=np.int64)  # the step at which each session reached the last stage
+        alive = np.ones(len(self), dtype=bool)
+        counts = np.zeros(len(stages), dtype=np.int64)
+        for i, loc_id in enumerate(stages):
+            rows = np.flatnonzero(locations == loc_id)
+            rows = rows[alive[index[rows]] & (steps[rows] > reached[index[rows]])]
+            # Events are stored session by session in step order, so a session's first row is its earliest
+            sessions = index[rows]
+            earliest = np.diff(sessions, prepend=-1) != 0
+            alive[:] = False
+            alive[sessions[earliest]] = True
+            reached[sessions[earliest]] = steps[rows[earliest]]
+            counts[i] = alive.sum()
+        return counts
+
+    def time_to_first_deposit(self) -> np.ndarray:
+        """Return the step at which every session that deposited an item made its first deposit."""
+        first = self.sessions['first_deposit']
+        return np.asarray(first[first >= 0])
+
+    def outcome_rates(self) -> dict[str, float]:
+        """Return the fraction of sessions that ended with each status."""
+        counts = np.bincount(self.sessions['status'], minlength=len(self.statuses))
+        total = max(len(self), 1)
+        return {status: float(counts[code] / total) for code, status in enumerate(self.statuses)}
+
+    def command_counts(self) -> dict[str, int]:
+        """Return the number of events every command led to."""
+        commands = self.events['command']
+        counts = np.bincount(commands[commands >= 0], minlength=len(self.commands))
+        return {command: int(counts[code]) for code, command in enumerate(self.commands)}
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import argparse
+    import tempfile
+    import time
+
+    from adventure import World
+    from agent_simulation import play_agent_game
+
+    parser = argparse.ArgumentParser(description="Export the logs of random agents and query them.")
+    parser.add_argument('--data', default='game_data.json')
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--store', default=None, help="the directory of the store (a new temporary one if unset)")
+    args = parser.parse_args()
+
+    game_world = World.load(args.data)
+    store_directory = args.store or tempfile.mkdtemp(prefix='event_store_')
+    start = time.perf_counter()
+    with EventLogWriter(store_directory) as writer:
+        writer.add_games((agent, play_agent_game(game_world, agent, seed=111)[0]) for agent in range(args.sessions))
+    print(f"Played and exported {args.sessions} sessions to {store_directory} "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    store = EventLogStore(store_directory)
+    start = time.perf_counter()
+    visited_ids, visits = store.visit_counts(distinct=True)
+    sources, destinations, transitions = store.transition_counts()
+    paths = store.popular_paths(3, 5)
+    deposits = store.time_to_first_deposit()
+    rates = store.outcome_rates()
+    print(f"Queried {len(store.events['location'])} events in {time.perf_counter() - start:.3f} s")
+    print("Sessions visiting each location:", dict(zip(visited_ids.tolist(), visits.tolist())))
+    print("Most common moves:", sorted(zip(transitions.tolist(), sources.tolist(), destinations.tolist()))[-5:])
+    print("Most common paths:", paths)
+    if len(deposits) > 0:
+        print(f"{len(deposits)} sessions deposited, first after {deposits.mean():.1f} steps on average")
+    print("Outcomes:", {status: round(rate, 3) for status, rate in rates.items()})
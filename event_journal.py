@@ -0,0 +1,322 @@
+"""CSC111 Project 1: Text Adventure Game - Event Journal
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module keeps a durable, append-only journal of a game's event list, so that a session
+ that crashes or is killed can be resumed from disk.
+
+Journal layout (all integers little-endian):
+    - header: the magic bytes b'ADVJRNL2'
+    - records: kind, location id, moves and command length, followed by the UTF-8 command.
+      kind is 1 for add_event and 2 for remove_last_event; a command length of 0xFFFFFFFF means no command.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import struct
+from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+
+from event_logger import Event, EventList
+from game_output import NullSink
+from text_pool import location_event
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+JOURNAL_MAGIC = b'ADVJRNL2'
+ADD_RECORD = 1
+REMOVE_RECORD = 2
+FSYNC_POLICIES = ('always', 'batch', 'never')
+
+_RECORD = struct.Struct('<BiiI')
+_NO_COMMAND = 0xFFFFFFFF
+
+
+class EventJournal:
+    """An append-only file of event list records.
+
+    Records are buffered in memory and written out once batch_size of them are pending.
+    The fsync policy decides when written records are forced to disk:
+        - 'always': every record is written and synced immediately
+        - 'batch': records are written and synced once per batch
+        - 'never': records are written once per batch and never explicitly synced
+
+    Instance Attributes:
+        - path: the filename of the journal
+        - fsync: the fsync policy of the journal
+        - batch_size: the number of records buffered before they are written
+
+    Representation Invariants:
+        - self.fsync in FSYNC_POLICIES
+        - self.batch_size > 0
+    """
+    # Private Instance Attributes:
+    #   - _file: the journal file, opened for appending
+    #   - _buffer: the encoded records that have not been written yet
+    #   - _pending: the number of records in _buffer
+    path: str
+    fsync: str
+    batch_size: int
+    _file: object
+    _buffer: bytearray
+    _pending: int
+
+    def __init__(self, path: str, fsync: str = 'batch', batch_size: int = 64) -> None:
+        """Open the journal with the given filename for appending, creating it if it does not exist.
+
+        Preconditions:
+            - fsync in FSYNC_POLICIES
+            - batch_size > 0
+        """
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = 1 if fsync == 'always' else batch_size
+        self._file = open(path, 'ab')
+        self._buffer = bytearray()
+        self._pending = 0
+        # A crash can leave a record cut short at the end of the journal. Drop it, so that new records are
+        # appended right after the last complete one and stay readable.
+        end = journal_length(path)
+        if end < self._file.tell():
+            self._file.truncate(end)
+            self._file.seek(end)
+        if end == 0:
+            self._buffer += JOURNAL_MAGIC
+
+    def append(self, kind: int, id_num: int = 0, moves: int = 0, command: Optional[str] = None) -> None:
+        """Append one record to the journal.
+
+        Preconditions:
+            - command is None or len(command.encode('utf-8')) < 0xFFFFFFFF
+        """
+        if command is None:
+            self._buffer += _RECORD.pack(kind, id_num, moves, _NO_COMMAND)
+        else:
+            encoded = command.encode('utf-8')
+            if len(encoded) >= _NO_COMMAND:
+                raise ValueError(f"a command of {len(encoded)} bytes is too long to journal")
+            self._buffer += _RECORD.pack(kind, id_num, moves, len(encoded))
+            self._buffer += encoded
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered record to the file, syncing it to disk unless the fsync policy is 'never'."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._pending = 0
+        self._file.flush()
+        if self.fsync != 'never':
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the journal."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> EventJournal:
+        """Return this journal when a with block is entered."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Flush and close this journal when a with block is left."""
+        self.close()
+
+
+class JournaledEventList(EventList):
+    """A linked list of game events that records every change to an EventJournal.
+
+    Instance Attributes:
+        - journal: the journal changes are recorded to, or None to stop recording
+        - game: the game whose move count is recorded with each event, or None to record 0
+    """
+    journal: Optional[EventJournal]
+    game: Optional[AdventureGame]
+
+    def __init__(self, journal: Optional[EventJournal], game: Optional[AdventureGame] = None) -> None:
+        """Initialize a new empty event list recording to the given journal."""
+        super().__init__()
+        self.journal = journal
+        self.game = game
+
+    def add_event(self, event: Event, command: str = None) -> None:
+        """Add the given new event to the end of this event list, and record it in the journal."""
+        super().add_event(event, command)
+        if self.journal is not None:
+            moves = 0 if self.game is None else self.game.moves
+            self.journal.append(ADD_RECORD, event.id_num, moves, command)
+
+    def remove_last_event(self) -> None:
+        """Remove the last event from this event list, and record the removal in the journal."""
+        if not self.is_empty() and self.journal is not None:
+            self.journal.append(REMOVE_RECORD)
+        super().remove_last_event()
+
+
+def _read_records(path: str, chunk_size: int) -> Iterator[tuple[tuple[int, int, int, Optional[str]], int]]:
+    """Yield every record of the journal with the given filename, in order, with the byte offset of its end.
+    A record cut short by a crash ends the journal."""
+    with open(path, 'rb') as f:
+        magic = f.read(len(JOURNAL_MAGIC))
+        if len(magic) < len(JOURNAL_MAGIC):
+            return
+        elif magic != JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not an event journal")
+
+        data = b''
+        pos = 0
+        offset = len(JOURNAL_MAGIC)  # the file offset of data[0]
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            offset += pos
+            data = data[pos:] + chunk
+            pos = 0
+            while pos + _RECORD.size <= len(data):
+                kind, id_num, moves, length = _RECORD.unpack_from(data, pos)
+                if length == _NO_COMMAND:
+                    command = None
+                    end = pos + _RECORD.size
+                else:
+                    end = pos + _RECORD.size + length
+                    if end > len(data):
+                        break
+                    command = data[pos + _RECORD.size:end].decode('utf-8')
+                yield (kind, id_num, moves, command), offset + end
+                pos = end
+
+
+def read_journal(path: str, chunk_size: int = 1 << 20) -> Iterator[tuple[int, int, int, Optional[str]]]:
+    """Yield every (kind, id_num, moves, command) record of the journal with the given filename, in order.
+    The file is read chunk_size bytes at a time. A record cut short by a crash ends the journal.
+
+    Preconditions:
+        - chunk_size > 0
+    """
+    for record, _ in _read_records(path, chunk_size):
+        yield record
+
+
+def journal_length(path: str, chunk_size: int = 1 << 20) -> int:
+    """Return the number of bytes of the journal with the given filename up to the end of its last complete
+    record, or 0 if it does not exist or is too short to hold its header.
+
+    Preconditions:
+        - chunk_size > 0
+    """
+    if not os.path.exists(path):
+        return 0
+    end = 0
+    with open(path, 'rb') as f:
+        if len(f.read(len(JOURNAL_MAGIC))) == len(JOURNAL_MAGIC):
+            end = len(JOURNAL_MAGIC)
+    for _, end in _read_records(path, chunk_size):
+        pass
+    return end
+
+
+def scan_journals(paths: Iterable[str], chunk_size: int = 1 << 20) \
+        -> Iterator[tuple[str, int, int, int, Optional[str]]]:
+    """Yield (path, kind, id_num, moves, command) for every record of every journal in paths, one journal
+    after another."""
+    for path in paths:
+        for record in read_journal(path, chunk_size):
+            yield (path,) + record
+
+
+def replay_journal(path: str, game: AdventureGame, log: EventList) -> int:
+    """Replay the journal with the given filename into game and log, and return the number of undos it contains.
+
+    Each recorded command is only applied to the game if the recorded move count shows that it succeeded,
+    so puzzles are not played again.
+
+    Preconditions:
+        - game and log are in the state they were in when the journal was started
+        - log does not record to the journal at path
+    """
+    # Output was already shown when the journal was recorded
+    sink, game.sink = game.sink, NullSink()
+    undos = 0
+    for kind, id_num, moves, command in read_journal(path):
+        if kind == REMOVE_RECORD:
+            if game.undo_action(log):
+                undos += 1
+            else:
+                log.remove_last_event()
+            continue
+
+        location = game.get_location()
+        if command is not None and moves > game.moves:
+            if command in location.available_commands:
+                game.current_location_id = location.available_commands[command]
+            elif command.startswith("take "):
+                game.take_item(location.id_num, command[5:])
+            elif command.startswith("deposit "):
+                game.deposit_item(location.id_num, command[8:])
+            game.moves = moves
+
+        location = game.get_location(id_num)
+        log.add_event(location_event(location, game.take_snapshot()), command)
+        game.mark_visited(location.id_num)
+    game.sink = sink
+    return undos
+
+
+def resume_session(game_data_file: str, initial_location_id: int, path: str,
+                   fsync: str = 'batch') -> tuple[AdventureGame, JournaledEventList, int]:
+    """Return a game, an event list and the number of undos used, restored from the journal with the given
+    filename. The returned event list keeps recording to that journal.
+
+    Preconditions:
+        - the journal at path was recorded by a game started at initial_location_id in game_data_file
+        - fsync in FSYNC_POLICIES
+    """
+    from adventure import AdventureGame
+
+    game = AdventureGame(game_data_file, initial_location_id)
+    log = JournaledEventList(None, game)
+    undos = replay_journal(path, game, log)
+    log.journal = EventJournal(path, fsync)
+    return game, log, undos
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import tempfile
+
+    # A journal torn in the middle of a record by a crash keeps every record appended after it is reopened
+    with tempfile.TemporaryDirectory() as directory:
+        journal_file = os.path.join(directory, 'torn.journal')
+        with EventJournal(journal_file) as journal:
+            journal.append(ADD_RECORD, 1, 0)
+            journal.append(ADD_RECORD, 4, 1, "go east")
+        with open(journal_file, 'r+b') as torn:
+            torn.truncate(os.path.getsize(journal_file) - 3)
+        with EventJournal(journal_file) as journal:
+            journal.append(ADD_RECORD, 3, 2, "go north")
+            journal.append(REMOVE_RECORD)
+        assert list(read_journal(journal_file)) == [(ADD_RECORD, 1, 0, None), (ADD_RECORD, 3, 2, "go north"),
+                                                    (REMOVE_RECORD, 0, 0, None)]
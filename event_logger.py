@@ -22,8 +22,12 @@ This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 
 from __future__ import annotations
+from array import array
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterator, Optional
+
+from game_entities import GameSnapshot
 
 
 @dataclass
@@ -37,12 +41,14 @@ class Event:
     - next_command: String command which leads this event to the next event, None if this is the last game event
     - next: Event object representing the next event in the game, or None if this is the last game event
     - prev: Event object representing the previous event in the game, None if this is the first game event
+    - snapshot: the game state before and after the command that led to this event, or None if it was not recorded
     """
     id_num: int
     description: str
     next_command: Optional[str] = None
     next: Optional[Event] = None
     prev: Optional[Event] = None
+    snapshot: Optional[GameSnapshot] = None
 
 
 class EventList:
@@ -56,20 +62,35 @@ class EventList:
     Representation Invariants:
         - not (first is None and last is not None)
     """
+    # Private Instance Attributes:
+    #   - _size: the number of events in this list
     first: Optional[Event]
     last: Optional[Event]
+    _size: int
 
     def __init__(self) -> None:
         """Initialize a new empty event list."""
 
         self.first = None
         self.last = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return self._size
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over the events in this list, in chronological order."""
+        curr = self.first
+        while curr:
+            yield curr
+            curr = curr.next
 
-    def display_events(self) -> None:
-        """Display all events in chronological order."""
+    def display_events(self, write: Callable[[str], None] = print) -> None:
+        """Display all events in chronological order, one line at a time through write."""
         curr = self.first
         while curr:
-            print(f"Location: {curr.id_num}, Command: {curr.next_command}")
+            write(f"Location: {curr.id_num}, Command: {curr.next_command}")
             curr = curr.next
 
     def is_empty(self) -> bool:
@@ -87,11 +108,13 @@ class EventList:
         if command is None:
             self.first = event
             self.last = event
+            self._size = 1
         else:
             self.last.next_command = command
             self.last.next = event
             event.prev = self.last
             self.last = event
+            self._size += 1
 
     def remove_last_event(self) -> None:
         """
@@ -108,6 +131,7 @@ class EventList:
             new_last.next_command = None
             new_last.next = None
             self.last = new_last
+        self._size -= 1
 
     def get_id_log(self) -> list[int]:
         """Return a list of all location IDs visited for each event in this list, in sequence."""
@@ -120,6 +144,251 @@ class EventList:
         return location_so_far
 
 
+class ArrayEventList:
+    """
+    An array-backed list of game events, with the same interface as EventList.
+
+    Location ids are stored in a typed array, and each command and description is stored once in a table
+    and referred to by its integer code. If a mapping of location descriptions is given, descriptions are
+    looked up there by location id instead of being stored at all. Events can be read by position in
+    constant time.
+
+    If capacity is given, the list is a ring buffer: once it holds capacity events, adding an event drops
+    the oldest one.
+
+    Instance Attributes:
+        - capacity: the maximum number of events kept, or None if the list is unbounded
+
+    Representation Invariants:
+        - self.capacity is None or self.capacity > 0
+        - self.capacity is None or len(self) <= self.capacity
+    """
+    # Private Instance Attributes:
+    #   - _ids: the location id of each event, in storage order
+    #   - _commands: the code of the command leading from each event to the next one, or -1 if there is none
+    #   - _descriptions: the code of each event's description, or -1 if it is looked up in _location_descriptions
+    #   - _start: the storage position of the first event (always 0 unless the list is a full ring buffer)
+    #   - _size: the number of events in the list
+    #   - _command_table, _command_codes: every command seen, and a mapping from each command to its code
+    #   - _description_table, _description_codes: every description seen, and a mapping from each one to its code
+    #   - _location_descriptions: the descriptions of every location by location id, or None
+    capacity: Optional[int]
+    _ids: array
+    _commands: array
+    _descriptions: array
+    _start: int
+    _size: int
+    _command_table: list[str]
+    _command_codes: dict[str, int]
+    _description_table: list[str]
+    _description_codes: dict[str, int]
+    _location_descriptions: Optional[Mapping[int, str]]
+
+    def __init__(self, capacity: Optional[int] = None,
+                 location_descriptions: Optional[Mapping[int, str]] = None) -> None:
+        """Initialize a new empty event list.
+
+        Preconditions:
+            - capacity is None or capacity > 0
+        """
+        self.capacity = capacity
+        self._location_descriptions = location_descriptions
+        self._command_table, self._command_codes = [], {}
+        self._description_table, self._description_codes = [], {}
+        self._clear()
+
+    def _clear(self) -> None:
+        """Remove every event from this list, keeping the command and description tables."""
+        if self.capacity is None:
+            self._ids, self._commands, self._descriptions = array('i'), array('i'), array('i')
+        else:
+            self._ids = array('i', [0]) * self.capacity
+            self._commands = array('i', [-1]) * self.capacity
+            self._descriptions = array('i', [-1]) * self.capacity
+        self._start = 0
+        self._size = 0
+
+    def _position(self, index: int) -> int:
+        """Return the storage position of the event at the given index.
+
+        Preconditions:
+            - -len(self) <= index < len(self)
+        """
+        if index < 0:
+            index += self._size
+        if self.capacity is None:
+            return index
+        return (self._start + index) % self.capacity
+
+    def _intern_command(self, command: str) -> int:
+        """Return the code of the given command, adding it to the command table if it is new."""
+        code = self._command_codes.get(command)
+        if code is None:
+            code = len(self._command_table)
+            self._command_codes[command] = code
+            self._command_table.append(command)
+        return code
+
+    def _intern_description(self, description: str) -> int:
+        """Return the code of the given description, adding it to the description table if it is new."""
+        code = self._description_codes.get(description)
+        if code is None:
+            code = len(self._description_table)
+            self._description_codes[description] = code
+            self._description_table.append(description)
+        return code
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return self._size
+
+    def id_at(self, index: int) -> int:
+        """Return the location id of the event at the given index.
+
+        Preconditions:
+            - -len(self) <= index < len(self)
+        """
+        return self._ids[self._position(index)]
+
+    def command_at(self, index: int) -> Optional[str]:
+        """Return the command leading from the event at the given index to the next one, or None if there is none.
+
+        Preconditions:
+            - -len(self) <= index < len(self)
+        """
+        code = self._commands[self._position(index)]
+        return None if code == -1 else self._command_table[code]
+
+    def description_at(self, index: int) -> str:
+        """Return the description of the event at the given index.
+
+        Preconditions:
+            - -len(self) <= index < len(self)
+        """
+        position = self._position(index)
+        code = self._descriptions[position]
+        if code == -1:
+            return self._location_descriptions[self._ids[position]]
+        return self._description_table[code]
+
+    def __getitem__(self, index: int) -> Event:
+        """Return a new Event holding the data of the event at the given index.
+        The returned Event is not linked to any other event.
+        """
+        if not -self._size <= index < self._size:
+            raise IndexError("event index out of range")
+        return Event(self.id_at(index), self.description_at(index), self.command_at(index))
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over new Events holding the data of each event in this list, in chronological order.
+        Each Event is only created when it is reached."""
+        for i in range(self._size):
+            yield self[i]
+
+    @property
+    def first(self) -> Optional[Event]:
+        """Return a copy of the first event, linked to a copy of the event after it, or None if there are no events.
+        """
+        if self._size == 0:
+            return None
+        event = self[0]
+        if self._size > 1:
+            event.next = self[1]
+            event.next.prev = event
+        return event
+
+    @property
+    def last(self) -> Optional[Event]:
+        """Return a copy of the last event, linked to a copy of the event before it, or None if there are no events.
+        """
+        if self._size == 0:
+            return None
+        event = self[-1]
+        if self._size > 1:
+            event.prev = self[-2]
+            event.prev.next = event
+        return event
+
+    def display_events(self, write: Callable[[str], None] = print) -> None:
+        """Display all events in chronological order, one line at a time through write."""
+        for i in range(self._size):
+            write(f"Location: {self.id_at(i)}, Command: {self.command_at(i)}")
+
+    def is_empty(self) -> bool:
+        """Return whether this event list is empty."""
+
+        return self._size == 0
+
+    def add_event(self, event: Event, command: str = None) -> None:
+        """
+        Add the given new event to the end of this event list.
+        The given command is the command which was used to reach this new event, or None if this is the first
+        event in the game.
+        """
+
+        if self._location_descriptions is None:
+            self._append(event.id_num, command, self._intern_description(event.description))
+        else:
+            self._append(event.id_num, command, -1)
+
+    def add_location(self, id_num: int, command: str = None) -> None:
+        """Add an event at the location with the given id to the end of this event list, reached with the given
+        command, or None if this is the first event in the game. This is add_event without creating an Event.
+
+        Preconditions:
+            - this list was initialized with location_descriptions, and id_num is in it
+        """
+        self._append(id_num, command, -1)
+
+    def _append(self, id_num: int, command: Optional[str], description: int) -> None:
+        """Add an event with the given location id, reached with the given command, and description code."""
+        if command is None:
+            self._clear()
+        else:
+            self._commands[self._position(-1)] = self._intern_command(command)
+
+        if self.capacity is None:
+            self._ids.append(id_num)
+            self._commands.append(-1)
+            self._descriptions.append(description)
+            self._size += 1
+            return
+
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+        position = self._position(-1)
+        self._ids[position] = id_num
+        self._commands[position] = -1
+        self._descriptions[position] = description
+
+    def remove_last_event(self) -> None:
+        """
+        Remove the last event from this event list.
+        If the list is empty, do nothing.
+        """
+
+        if self.is_empty():
+            return
+
+        if self.capacity is None:
+            self._ids.pop()
+            self._commands.pop()
+            self._descriptions.pop()
+        self._size -= 1
+        if self._size > 0:
+            self._commands[self._position(-1)] = -1
+
+    def get_id_log(self) -> list[int]:
+        """Return a list of all location IDs visited for each event in this list, in sequence."""
+
+        if self.capacity is None or self._start + self._size <= self.capacity:
+            return self._ids[self._start:self._start + self._size].tolist()
+        wrapped = self._start + self._size - self.capacity
+        return self._ids[self._start:].tolist() + self._ids[:wrapped].tolist()
+
+
 if __name__ == "__main__":
     pass
     # When you are ready to check your work with python_ta, uncomment the following lines.
@@ -55,9 +55,10 @@ class Location:
     visited: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
-    """An item in our text adventure game world.
+    """An item in our text adventure game world. Items have no per-instance __dict__, since a world can hold
+    many of them.
 
     Instance Attributes:
         - name: name of the item
@@ -83,6 +84,77 @@ class Item:
     deposited: bool
 
 
+@dataclass(slots=True)
+class CompactItem(Item):
+    """An Item loaded by load_compact_game_data. Its name is interned, so it is shared with every command and
+    location that refers to the item.
+    """
+
+
+# The place of an item that is being carried by the player, rather than lying at a location
+INVENTORY = -1
+
+
+@dataclass(frozen=True, slots=True)
+class ItemChange:
+    """A change to where one item is and whether it is deposited, made by a single command.
+
+    Instance Attributes:
+        - name: name of the item
+        - before: the location ID of the item before the command, or INVENTORY if it was carried
+        - after: the location ID of the item after the command, or INVENTORY if it is carried
+        - deposited_before: whether the item was deposited before the command
+        - deposited_after: whether the item is deposited after the command
+
+    Representation Invariants:
+        - name != ""
+        - before >= 0 or before == INVENTORY
+        - after >= 0 or after == INVENTORY
+    """
+
+    name: str
+    before: int
+    after: int
+    deposited_before: bool
+    deposited_after: bool
+
+
+@dataclass(frozen=True, slots=True)
+class GameSnapshot:
+    """The game state on both sides of a single command.
+
+    Only the items the command changed are recorded. Every other part of the state is shared with the
+    neighbouring snapshots, so a snapshot has the same small size however big the world and inventory are,
+    and moving to either side of it takes constant time.
+
+    Instance Attributes:
+        - location_before: the current location ID before the command
+        - location_after: the current location ID after the command
+        - score_before: the score before the command
+        - score_after: the score after the command
+        - moves_before: the number of moves before the command
+        - moves_after: the number of moves after the command
+        - changes: the changes the command made to items, in the order they were made
+
+    Representation Invariants:
+        - score_before >= 0 and score_after >= 0
+        - moves_before >= 0 and moves_after >= 0
+    """
+
+    location_before: int
+    location_after: int
+    score_before: int
+    score_after: int
+    moves_before: int
+    moves_after: int
+    changes: tuple[ItemChange, ...] = ()
+
+    def is_action(self) -> bool:
+        """Return whether the command this snapshot records used a move, i.e. it was not a menu command
+        and it did not fail."""
+        return self.moves_after != self.moves_before
+
+
 if __name__ == "__main__":
     pass
     # When you are ready to check your work with python_ta, uncomment the following lines.
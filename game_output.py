@@ -0,0 +1,89 @@
+"""CSC111 Project 1: Text Adventure Game - Game Output
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the output sinks that the game engine writes all of its text to.
+ The engine never prints directly, so the same game can be played in a terminal, served over a
+ network, or driven by a bot that ignores the text entirely.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from typing import Optional, TextIO
+
+
+class OutputSink:
+    """An abstract destination for the lines of text written by the game engine."""
+
+    def write(self, line: str) -> None:
+        """Write one line of game output."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Deliver any output that has been written but not delivered yet."""
+
+
+class NullSink(OutputSink):
+    """An output sink that discards everything written to it."""
+
+    def write(self, line: str) -> None:
+        """Discard the given line."""
+
+
+class BufferedSink(OutputSink):
+    """An output sink that keeps lines in memory until they are drained or flushed to a stream.
+
+    Instance Attributes:
+        - stream: the stream flush writes the buffered lines to, or None if they are only drained
+
+    Representation Invariants:
+        - all('\\n' not in line for line in self._lines)
+    """
+    # Private Instance Attributes:
+    #   - _lines: the lines written since the sink was last drained or flushed
+    stream: Optional[TextIO]
+    _lines: list[str]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """Initialize a new empty buffered sink that flushes to the given stream."""
+        self.stream = stream
+        self._lines = []
+
+    def write(self, line: str) -> None:
+        """Buffer one line of game output."""
+        self._lines.append(line)
+
+    def drain(self) -> list[str]:
+        """Return every buffered line and empty the buffer."""
+        lines = self._lines
+        self._lines = []
+        return lines
+
+    def flush(self) -> None:
+        """Write every buffered line to the stream in a single call, and empty the buffer.
+        If there is no stream, the buffered lines are kept."""
+        if self.stream is not None and self._lines:
+            self.stream.write('\n'.join(self.drain()) + '\n')
+            self.stream.flush()
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
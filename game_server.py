@@ -0,0 +1,258 @@
+"""CSC111 Project 1: Text Adventure Game - Game Server
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module hosts many games at once in a single process, over a local TCP or Unix socket.
+ It also contains a load generator that plays many concurrent sessions against a server and reports
+ how long each command takes.
+
+Line protocol:
+    - the client sends one command, puzzle guess or retry answer per line, exactly as typed into adventure.py
+    - after connecting, and after every line it receives, the server replies with the game's output lines,
+      followed by one line starting with PROMPT_MARKER that holds the prompt for the next line
+    - when the game ends, the server replies with the game's output lines, followed by one line holding
+      END_MARKER, and closes the connection
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from adventure import AdventureGame, World, DORM
+from game_output import BufferedSink
+from instrumentation import enable_metrics, serve_metrics
+from world_reload import WorldWatcher
+
+PROMPT_MARKER = '? '
+END_MARKER = '.'
+
+
+class GameServer:
+    """An asyncio server that plays one isolated AdventureGame per connection.
+
+    Instance Attributes:
+        - initial_location_id: the ID of the location every session starts at
+        - max_sessions: the maximum number of sessions played at once; further connections wait for a free slot
+        - active_sessions: the number of sessions being played
+
+    Representation Invariants:
+        - 0 <= self.active_sessions <= self.max_sessions
+    """
+    # Private Instance Attributes:
+    #   - _world: the world loaded from the game data file, shared by every session
+    #   - _slots: the semaphore limiting how many sessions are played at once
+    #   - _watcher: the watcher reloading the game data file into every session, or None if it is not watched
+    initial_location_id: int
+    max_sessions: int
+    active_sessions: int
+    _world: World
+    _slots: asyncio.Semaphore
+    _watcher: Optional[WorldWatcher]
+
+    def __init__(self, game_data_file: str, initial_location_id: int = DORM, max_sessions: int = 1024,
+                 reload: bool = False) -> None:
+        """Initialize a new server for the game in the given game data file.
+        If reload is True, every session is switched to the new world when the file is edited; see watch_file.
+
+        Preconditions:
+            - game_data_file is the filename of a valid game data JSON file
+            - max_sessions > 0
+        """
+        self.initial_location_id = initial_location_id
+        self.max_sessions = max_sessions
+        self.active_sessions = 0
+        self._world = World.load(game_data_file)
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._watcher = WorldWatcher(game_data_file, self._world) if reload else None
+
+    def new_session(self) -> tuple[AdventureGame, BufferedSink]:
+        """Return a new game in the shared world, and the sink it writes its output to."""
+        sink = BufferedSink()
+        game = AdventureGame.from_world(self._world, self.initial_location_id, sink)
+        if self._watcher is not None:
+            self._watcher.watch(game)
+        return game, sink
+
+    async def watch_file(self, interval: float = 1.0) -> None:
+        """Check the game data file for edits every interval seconds, forever, switching every session and every
+        new session to the reloaded world. This runs on the same event loop as the sessions, so a session is
+        never switched in the middle of a command.
+
+        Preconditions:
+            - this server was initialized with reload=True
+            - interval > 0
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self._watcher.check() is not None:
+                self._world = self._watcher.world
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play one session with the client on the other end of the given stream."""
+        async with self._slots:
+            self.active_sessions += 1
+            try:
+                game, sink = self.new_session()
+                game.start()
+                await self._reply(writer, game, sink)
+                while game.ongoing:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    game.step(line.decode('utf-8').rstrip('\r\n'))
+                    await self._reply(writer, game, sink)
+            except ConnectionError:
+                pass
+            finally:
+                self.active_sessions -= 1
+                writer.close()
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, game: AdventureGame, sink: BufferedSink) -> None:
+        """Send the output buffered in sink to the client, followed by the next prompt or the end marker."""
+        lines = sink.drain()
+        if game.ongoing:
+            lines.append(PROMPT_MARKER + game.prompt().strip())
+        else:
+            lines.append(END_MARKER)
+        writer.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    async def serve_tcp(self, host: str = '127.0.0.1', port: int = 8111) -> asyncio.Server:
+        """Start serving sessions on the given TCP host and port, and return the running server."""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=1 << 16, backlog=4096)
+
+    async def serve_unix(self, path: str) -> asyncio.Server:
+        """Start serving sessions on the Unix socket at the given path, and return the running server."""
+        return await asyncio.start_unix_server(self.handle_connection, path, limit=1 << 16, backlog=4096)
+
+
+async def _open(host: str, port: int, path: Optional[str]) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open a connection to a game server on the Unix socket at path, or on host and port if path is None."""
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> list[str]:
+    """Read one reply from a game server, and return its lines including the final prompt or end marker."""
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            return lines
+        text = line.decode('utf-8').rstrip('\n')
+        lines.append(text)
+        if text.startswith(PROMPT_MARKER) or text == END_MARKER:
+            return lines
+
+
+async def _play_session(host: str, port: int, path: Optional[str], script: list[str], rounds: int,
+                        latencies: list[float]) -> None:
+    """Play one session against a game server, sending the commands of script in order rounds times, and
+    record the latency of every command in latencies."""
+    reader, writer = await _open(host, port, path)
+    try:
+        await _read_reply(reader)
+        for _ in range(rounds):
+            for command in script:
+                start = time.perf_counter()
+                writer.write((command + '\n').encode('utf-8'))
+                reply = await _read_reply(reader)
+                latencies.append(time.perf_counter() - start)
+                if not reply or reply[-1] == END_MARKER:
+                    return
+    finally:
+        writer.close()
+
+
+async def run_load(sessions: int, script: list[str], rounds: int = 1, host: str = '127.0.0.1', port: int = 8111,
+                   path: Optional[str] = None) -> dict[str, float]:
+    """Play the given number of concurrent sessions against a game server, each sending the commands of script
+    rounds times, and return the p50 and p99 command latency in milliseconds, the number of commands sent
+    and the commands served per second.
+
+    Preconditions:
+        - sessions > 0
+        - script != []
+        - rounds > 0
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_play_session(host, port, path, script, rounds, latencies) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    if not latencies:
+        return {'p50_ms': 0.0, 'p99_ms': 0.0, 'commands': 0, 'commands_per_second': 0.0}
+    return {'p50_ms': latencies[len(latencies) // 2] * 1000,
+            'p99_ms': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1000,
+            'commands': len(latencies),
+            'commands_per_second': len(latencies) / elapsed}
+
+
+async def _serve_forever(game_data_file: str, max_sessions: int, host: str, port: int,
+                         path: Optional[str], reload_interval: Optional[float] = None) -> None:
+    """Run a game server until it is interrupted, reloading the game data file every reload_interval seconds if
+    it is not None."""
+    game_server = GameServer(game_data_file, max_sessions=max_sessions, reload=reload_interval is not None)
+    if reload_interval is not None:
+        watch_task = asyncio.create_task(game_server.watch_file(reload_interval))
+    if path is not None:
+        server = await game_server.serve_unix(path)
+    else:
+        server = await game_server.serve_tcp(host, port)
+    async with server:
+        await server.serve_forever()
+    if reload_interval is not None:
+        watch_task.cancel()
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    parser = argparse.ArgumentParser(description="Serve adventure games, or generate load against a server.")
+    parser.add_argument('mode', choices=['serve', 'load'])
+    parser.add_argument('--data', default='game_data.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8111)
+    parser.add_argument('--unix', default=None, help="path of a Unix socket to use instead of TCP")
+    parser.add_argument('--max-sessions', type=int, default=1024)
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--reload', type=float, default=None, metavar='SECONDS',
+                        help="check the game data file for edits this often, and reload it into every session")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics of the games on this port of the host")
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        if args.metrics_port is not None:
+            serve_metrics(enable_metrics(), args.host, args.metrics_port)
+        asyncio.run(_serve_forever(args.data, args.max_sessions, args.host, args.port, args.unix, args.reload))
+    else:
+        # Each round walks back and forth, using 2 of the MAX_MOVE moves
+        load_script = ["look", "go east", "score", "go west", "inventory", "log"]
+        report = asyncio.run(run_load(args.sessions, load_script, args.rounds, args.host, args.port, args.unix))
+        print(f"{report['commands']} commands, {report['commands_per_second']:.0f} commands/s, "
+              f"p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms")
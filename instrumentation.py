@@ -0,0 +1,335 @@
+"""CSC111 Project 1: Text Adventure Game - Instrumentation
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module records how long the game takes to handle each type of command, how long worlds take to
+ load and how long game logs grow, and exports the results in the Prometheus text format, to a file or over a
+ local HTTP endpoint. It also contains an opt-in sampling profiler.
+
+Instrumentation is off until enable_metrics is called. Games created while it is off record nothing, and
+ AdventureGame.step then costs a single extra attribute check.
+
+The metrics recorded are:
+    - adventure_command_seconds{command}: a histogram of the time AdventureGame.step took, by command type.
+      The type is the menu command, "move", "take", "deposit", "puzzle" for puzzle input, or "invalid".
+      Its _count is the number of commands of each type.
+    - adventure_event_log_events: a histogram of the number of events in a game's log after each command
+    - adventure_world_load_seconds{source}: a histogram of world load times, from "json", "snapshot" or "stream"
+    - adventure_games_total: the number of games created
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# The upper bounds of the buckets of latency histograms, in seconds
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2,
+                   5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# The upper bounds of the buckets of size histograms
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# The type, label name and help text of every metric
+METRICS = {
+    'adventure_command_seconds': ('histogram', 'command', "Time taken by AdventureGame.step, by command type."),
+    'adventure_event_log_events': ('histogram', '', "Events in a game's log after each command."),
+    'adventure_world_load_seconds': ('histogram', 'source', "Time taken to load a world, by source."),
+    'adventure_games_total': ('counter', '', "Games created."),
+}
+
+
+class Histogram:
+    """A histogram of observed values, counted in fixed buckets.
+
+    Instance Attributes:
+        - bounds: the upper bound of every bucket but the last, which has no bound
+        - counts: the number of values observed in each bucket
+        - total: the sum of every value observed
+        - count: the number of values observed
+
+    Representation Invariants:
+        - len(self.counts) == len(self.bounds) + 1
+        - sum(self.counts) == self.count
+    """
+    bounds: tuple[float, ...]
+    counts: list[int]
+    total: float
+    count: int
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize a new empty histogram with the given bucket bounds, in increasing order."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Count one observed value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the q quantile of the observed values, or infinity if it
+        is in the last bucket.
+
+        Preconditions:
+            - 0 <= q <= 1
+        """
+        seen = 0
+        for i, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= q * self.count and seen > 0:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return 0.0
+
+
+class Metrics:
+    """The metrics recorded by the game while instrumentation is enabled.
+    Recording and exporting may happen on different threads.
+
+    Instance Attributes:
+        - histograms: a mapping from metric name and label value to its histogram
+        - counters: a mapping from metric name and label value to its count
+    """
+    # Private Instance Attributes:
+    #   - _lock: the lock held while the metrics are changed or read
+    histograms: dict[tuple[str, str], Histogram]
+    counters: dict[tuple[str, str], int]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        """Initialize a new set of metrics with nothing recorded."""
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, label: str = '', bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Record one value of the histogram with the given name and label value."""
+        with self._lock:
+            histogram = self.histograms.get((name, label))
+            if histogram is None:
+                histogram = Histogram(bounds)
+                self.histograms[(name, label)] = histogram
+            histogram.observe(value)
+
+    def count(self, name: str, label: str = '', amount: int = 1) -> None:
+        """Add amount to the counter with the given name and label value."""
+        with self._lock:
+            self.counters[(name, label)] = self.counters.get((name, label), 0) + amount
+
+    def observe_command(self, kind: str, seconds: float, log_size: int) -> None:
+        """Record that a command of the given type took the given time, leaving the game's log with log_size
+        events."""
+        with self._lock:
+            for key, value, bounds in ((('adventure_command_seconds', kind), seconds, LATENCY_BUCKETS),
+                                       (('adventure_event_log_events', ''), log_size, SIZE_BUCKETS)):
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(bounds)
+                    self.histograms[key] = histogram
+                histogram.observe(value)
+
+    def to_prometheus(self) -> str:
+        """Return every metric recorded so far in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (kind, label_name, description) in METRICS.items():
+                if kind == 'histogram':
+                    series = sorted((label, h) for (metric, label), h in self.histograms.items() if metric == name)
+                else:
+                    series = sorted((label, c) for (metric, label), c in self.counters.items() if metric == name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for label, value in series:
+                    labels = f'{label_name}="{_escape(label)}"' if label_name else ''
+                    if kind == 'counter':
+                        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+                        continue
+                    prefix = labels + ',' if labels else ''
+                    cumulative = 0
+                    for bound, bucket in zip(value.bounds + (float('inf'),), value.counts):
+                        cumulative += bucket
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+                    suffix = f"{{{labels}}}" if labels else ''
+                    lines.append(f"{name}_sum{suffix} {value.total!r}")
+                    lines.append(f"{name}_count{suffix} {value.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    """Return value escaped for use as a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# The metrics games record to, or None if instrumentation is disabled
+_active: Optional[Metrics] = None
+
+
+def enable_metrics(metrics: Optional[Metrics] = None) -> Metrics:
+    """Turn instrumentation on for every game and world loaded from now on, recording to the given metrics or to
+    new ones, and return the metrics recorded to."""
+    global _active
+    _active = Metrics() if metrics is None else metrics
+    return _active
+
+
+def disable_metrics() -> None:
+    """Turn instrumentation off for every game and world loaded from now on."""
+    global _active
+    _active = None
+
+
+def active_metrics() -> Optional[Metrics]:
+    """Return the metrics being recorded to, or None if instrumentation is disabled."""
+    return _active
+
+
+def write_metrics(metrics: Metrics, path: str) -> None:
+    """Write the given metrics to the file at path in the Prometheus text format, replacing it atomically so a
+    scraper reading the file never sees a partial write."""
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        f.write(metrics.to_prometheus())
+    os.replace(temporary, path)
+
+
+def serve_metrics(metrics: Metrics, host: str = '127.0.0.1', port: int = 9111) -> ThreadingHTTPServer:
+    """Serve the given metrics in the Prometheus text format over HTTP at host and port, on a background thread,
+    and return the server. Call shutdown on the server to stop it."""
+    class _Handler(BaseHTTPRequestHandler):
+        """A handler that replies to every GET request with the metrics."""
+
+        def do_GET(self) -> None:
+            """Send the metrics."""
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            """Do not log requests."""
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class SamplingProfiler:
+    """A profiler that samples the call stack of one thread at a fixed interval, from a background thread.
+    Unlike a tracing profiler it does not slow the sampled thread down, so it can be left on while serving.
+
+    Instance Attributes:
+        - interval: the time between samples, in seconds
+        - thread_id: the identifier of the thread sampled
+        - samples: the number of times each stack was sampled, keyed by its frames from outermost to innermost,
+                   each written as "file:function"
+    """
+    # Private Instance Attributes:
+    #   - _stop: the event set to stop sampling
+    #   - _thread: the thread taking samples, or None if the profiler is not running
+    interval: float
+    thread_id: int
+    samples: Counter[tuple[str, ...]]
+    _stop: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None) -> None:
+        """Initialize a new profiler of the thread with the given identifier, or of the calling thread."""
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start taking samples."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop taking samples, keeping the samples taken so far."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> SamplingProfiler:
+        """Start taking samples when a with block is entered."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop taking samples when a with block is left."""
+        self.stop()
+
+    def _run(self) -> None:
+        """Take a sample every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+    def folded(self) -> str:
+        """Return the samples in the folded stack format read by flame graph tools, one stack per line."""
+        return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common())
+
+    def top(self, n: int = 10) -> list[tuple[str, int]]:
+        """Return the n functions sampled most often at the top of the stack, with their sample counts."""
+        tops = Counter()
+        for stack, count in self.samples.items():
+            tops[stack[-1]] += count
+        return tops.most_common(n)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    # Enable metrics through the imported module, which is the one the game records to, not this script
+    import instrumentation
+    from adventure import AdventureGame
+
+    recorded = instrumentation.enable_metrics()
+    with SamplingProfiler(0.001) as profiler:
+        start_time = time.perf_counter()
+        while time.perf_counter() - start_time < 1:
+            demo = AdventureGame('game_data.json', 1)
+            for demo_command in ["go east", "look", "go north", "take toonie", "x", "log", "go south", "score"]:
+                demo.step(demo_command)
+    print(recorded.to_prometheus())
+    print(profiler.top(5))
@@ -0,0 +1,287 @@
+"""CSC111 Project 1: Text Adventure Game - Location Graph
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module indexes the graph of locations formed by their available commands, so that questions
+ like "how many moves from A to B" and "what is reachable within k moves" are answered without a new
+ breadth-first search every time.
+
+For small worlds every breadth-first search is run once up front and stored in compact integer matrices.
+ For large worlds each source's search is run the first time it is needed and kept in a bounded cache.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Optional
+
+from game_entities import Location
+
+# The distance stored for a location that cannot be reached
+UNREACHABLE = -1
+
+
+class _SearchRow:
+    """The result of one breadth-first search from a source location.
+
+    Instance Attributes:
+        - distance: the fewest moves from the source to each location index, or UNREACHABLE
+        - first_edge: the position in the source's edge list of the first move towards each location index,
+                      or -1 for the source itself and unreachable locations
+        - order: the reachable location indices, in order of increasing distance
+        - order_distance: the distance of each location in order
+
+    Representation Invariants:
+        - len(self.order) == len(self.order_distance)
+    """
+    distance: array
+    first_edge: array
+    order: array
+    order_distance: array
+
+    def __init__(self, distance: array, first_edge: array, order: array, order_distance: array) -> None:
+        """Initialize a new search result."""
+        self.distance = distance
+        self.first_edge = first_edge
+        self.order = order
+        self.order_distance = order_distance
+
+
+class LocationGraph:
+    """An index of the moves between the locations of a world.
+
+    Instance Attributes:
+        - ids: the id of every location, in index order
+        - edges: the (command, destination index) pairs available at each location index
+        - reverse: the indices of the locations with a move into each location index
+        - component: the index of the strongly connected component each location index belongs to
+        - precomputed: whether every search was run when the graph was built
+
+    Representation Invariants:
+        - len(self.ids) == len(self.edges) == len(self.reverse) == len(self.component)
+    """
+    # Private Instance Attributes:
+    #   - _index: a mapping from location id to its index in ids
+    #   - _rows: the search results of every source index searched so far, least recently used first
+    #   - _cache_size: the number of search results kept, or None to keep all of them
+    #   - _distances_to: the fewest moves from every location index to each target index searched so far,
+    #                    least recently used first, holding at most _cache_size of them like _rows
+    ids: list[int]
+    edges: list[list[tuple[str, int]]]
+    reverse: list[list[int]]
+    component: list[int]
+    precomputed: bool
+    _index: dict[int, int]
+    _rows: OrderedDict[int, _SearchRow]
+    _cache_size: Optional[int]
+    _distances_to: OrderedDict[int, array]
+
+    def __init__(self, locations: Mapping[int, Location], matrix_limit: int = 1024, cache_size: int = 4096) -> None:
+        """Build the index of the given locations. If there are at most matrix_limit locations, every search is
+        run now; otherwise searches are run when first needed, and at most cache_size of them are kept.
+
+        Preconditions:
+            - cache_size > 0
+        """
+        self.ids = list(locations)
+        self._index = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.edges = [[(command, self._index[destination])
+                       for command, destination in locations[loc_id].available_commands.items()
+                       if destination in self._index]
+                      for loc_id in self.ids]
+        self.reverse = [[] for _ in self.ids]
+        for source, edges in enumerate(self.edges):
+            for _, destination in edges:
+                self.reverse[destination].append(source)
+        self.component = self._strongly_connected_components()
+
+        self._rows = OrderedDict()
+        self._distances_to = OrderedDict()
+        self.precomputed = len(self.ids) <= matrix_limit
+        if self.precomputed:
+            self._cache_size = None
+            for source in range(len(self.ids)):
+                self._rows[source] = self._search(source)
+        else:
+            self._cache_size = cache_size
+
+    def _strongly_connected_components(self) -> list[int]:
+        """Return the index of the strongly connected component of each location index, using an iterative
+        version of Tarjan's algorithm."""
+        n = len(self.ids)
+        index_of = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        stack = []
+        counter = 0
+        components = 0
+
+        for root in range(n):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    index_of[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                elif edge > 0:
+                    child = self.edges[node][edge - 1][1]
+                    lowlink[node] = min(lowlink[node], lowlink[child])
+
+                recurse = False
+                while edge < len(self.edges[node]):
+                    child = self.edges[node][edge][1]
+                    edge += 1
+                    if index_of[child] == -1:
+                        work.append((node, edge))
+                        work.append((child, 0))
+                        recurse = True
+                        break
+                    elif on_stack[child]:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                if recurse:
+                    continue
+
+                if lowlink[node] == index_of[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = components
+                        if member == node:
+                            break
+                    components += 1
+        return component
+
+    def _search(self, source: int) -> _SearchRow:
+        """Return the result of a breadth-first search from the given location index."""
+        n = len(self.ids)
+        distance = array('i', [UNREACHABLE]) * n
+        first_edge = array('i', [-1]) * n
+        order = array('i', [source])
+        distance[source] = 0
+        head = 0
+        while head < len(order):
+            current = order[head]
+            head += 1
+            for position, (_, destination) in enumerate(self.edges[current]):
+                if distance[destination] == UNREACHABLE:
+                    distance[destination] = distance[current] + 1
+                    first_edge[destination] = position if current == source else first_edge[current]
+                    order.append(destination)
+        order_distance = array('i', (distance[i] for i in order))
+        return _SearchRow(distance, first_edge, order, order_distance)
+
+    def _row(self, source: int) -> _SearchRow:
+        """Return the search result of the given source index, running the search if it is not cached."""
+        row = self._rows.get(source)
+        if row is None:
+            row = self._search(source)
+            self._rows[source] = row
+            if self._cache_size is not None and len(self._rows) > self._cache_size:
+                self._rows.popitem(last=False)
+        elif not self.precomputed:
+            self._rows.move_to_end(source)
+        return row
+
+    def index(self, loc_id: int) -> int:
+        """Return the index of the location with the given id."""
+        return self._index[loc_id]
+
+    def distance(self, source_id: int, target_id: int) -> int:
+        """Return the fewest moves from the source location to the target location, or UNREACHABLE."""
+        return self._row(self._index[source_id]).distance[self._index[target_id]]
+
+    def next_command(self, source_id: int, target_id: int) -> Optional[str]:
+        """Return the command of the first move on a shortest path from the source location to the target location,
+        or None if the locations are the same or the target cannot be reached."""
+        source = self._index[source_id]
+        edge = self._row(source).first_edge[self._index[target_id]]
+        return None if edge == -1 else self.edges[source][edge][0]
+
+    def path(self, source_id: int, target_id: int) -> Optional[list[str]]:
+        """Return the commands of a shortest path from the source location to the target location, or None if the
+        target cannot be reached.
+
+        The path is found by one search towards the target: from each location it takes the first command that
+        leads one move closer, which is the same command next_command would return there.
+        """
+        distances = self.distances_to(target_id)
+        current = self._index[source_id]
+        if distances[current] == UNREACHABLE:
+            return None
+        commands = []
+        while distances[current] > 0:
+            command, current = next(edge for edge in self.edges[current]
+                                    if distances[edge[1]] == distances[current] - 1)
+            commands.append(command)
+        return commands
+
+    def reachable_within(self, source_id: int, k: int) -> list[int]:
+        """Return the ids of every location reachable from the source location in at most k moves, nearest first."""
+        row = self._row(self._index[source_id])
+        return [self.ids[i] for i in row.order[:bisect_right(row.order_distance, k)]]
+
+    def distances_to(self, target_id: int) -> array:
+        """Return the fewest moves from every location index to the target location, or UNREACHABLE, found by one
+        breadth-first search over the reversed graph. Searches are cached in the same way as those of sources."""
+        target = self._index[target_id]
+        distances = self._distances_to.get(target)
+        if distances is not None:
+            self._distances_to.move_to_end(target)
+        else:
+            distances = array('i', [UNREACHABLE]) * len(self.ids)
+            distances[target] = 0
+            queue = [target]
+            for current in queue:
+                for source in self.reverse[current]:
+                    if distances[source] == UNREACHABLE:
+                        distances[source] = distances[current] + 1
+                        queue.append(source)
+            self._distances_to[target] = distances
+            if self._cache_size is not None and len(self._distances_to) > self._cache_size:
+                self._distances_to.popitem(last=False)
+        return distances
+
+    def predecessors(self, loc_id: int) -> list[int]:
+        """Return the ids of the locations with a move into the given location."""
+        return [self.ids[i] for i in self.reverse[self._index[loc_id]]]
+
+    def same_component(self, first_id: int, second_id: int) -> bool:
+        """Return whether each of the two locations can be reached from the other."""
+        return self.component[self._index[first_id]] == self.component[self._index[second_id]]
+
+    def components(self) -> list[list[int]]:
+        """Return the ids of the locations in each strongly connected component."""
+        groups = [[] for _ in range(max(self.component, default=-1) + 1)]
+        for i, component in enumerate(self.component):
+            groups[component].append(self.ids[i])
+        return groups
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
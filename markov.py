@@ -0,0 +1,239 @@
+"""CSC111 Project 1: Text Adventure Game - Random Walk Analytics
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module models a player who, at every move, picks one of the current location's available
+ commands uniformly at random, as a Markov chain over the locations. It answers questions about such
+ players directly from the chain's transition matrix, instead of by simulating many games:
+    - the expected number of moves to reach a location (such as the dorm) from every location
+    - the probability of reaching a location within a number of moves, from every location
+    - the distribution of the player's location after each of the first k moves
+    - the probability of being absorbed at each of a set of final locations
+    - the long-run fraction of moves spent at each location
+
+A location with no available commands keeps the player there forever. Commands other than moves (such as
+ take, look or score) do not change the player's location and are not modelled.
+
+This module requires NumPy. The transition matrix is stored in compressed sparse row form; worlds with at
+ most dense_limit locations are solved exactly with a dense linear solve, and larger worlds by iterating
+ sparse matrix-vector products until they converge.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from typing import Iterable
+
+import numpy as np
+
+from adventure import World, DORM, MAX_MOVE
+from location_graph import LocationGraph
+
+
+class RandomWalkChain:
+    """The Markov chain of a player moving at random through the locations of a world.
+
+    Instance Attributes:
+        - graph: the index of the moves between the locations of the world
+        - indptr: the start of each location's row in indices and data, in compressed sparse row form
+        - indices: the destination index of every nonzero transition
+        - data: the probability of every nonzero transition
+        - rows: the source index of every nonzero transition
+        - dense_limit: the largest number of locations that is solved with a dense linear solve
+        - tolerance: the largest change between iterations at which an iterative solve stops
+        - max_iterations: the most iterations an iterative solve runs for
+
+    Representation Invariants:
+        - len(self.indptr) == len(self.graph.ids) + 1
+        - len(self.indices) == len(self.data) == len(self.rows) == self.indptr[-1]
+        - every row of the transition matrix sums to 1
+    """
+    graph: LocationGraph
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    rows: np.ndarray
+    dense_limit: int
+    tolerance: float
+    max_iterations: int
+
+    def __init__(self, graph: LocationGraph, dense_limit: int = 2000, tolerance: float = 1e-10,
+                 max_iterations: int = 100000) -> None:
+        """Build the transition matrix of the given location graph."""
+        self.graph = graph
+        self.dense_limit = dense_limit
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+        n = len(graph.ids)
+        degrees = np.array([max(len(edges), 1) for edges in graph.edges], dtype=np.int64)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self.indptr[1:])
+        self.indices = np.array([destination for i, edges in enumerate(graph.edges)
+                                 for destination in ([d for _, d in edges] or [i])], dtype=np.int64)
+        self.rows = np.repeat(np.arange(n, dtype=np.int64), degrees)
+        self.data = 1.0 / degrees[self.rows]
+
+    @classmethod
+    def from_world(cls, world: World, **options: float) -> RandomWalkChain:
+        """Return the chain of the given world, sharing the world's location graph."""
+        return cls(world.graph(), **options)
+
+    def __len__(self) -> int:
+        """Return the number of locations in the chain."""
+        return len(self.graph.ids)
+
+    def _mask(self, loc_ids: Iterable[int]) -> np.ndarray:
+        """Return a boolean array that is True at the index of each of the given locations."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[[self.graph.index(loc_id) for loc_id in loc_ids]] = True
+        return mask
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Return P @ values, the expected value of values after one move from every location."""
+        return np.bincount(self.rows, weights=self.data * values[self.indices], minlength=len(self))
+
+    def step(self, distribution: np.ndarray) -> np.ndarray:
+        """Return distribution @ P, the distribution of the player's location one move after distribution."""
+        return np.bincount(self.indices, weights=self.data * distribution[self.rows], minlength=len(self))
+
+    def dense(self) -> np.ndarray:
+        """Return the transition matrix P as a dense array."""
+        matrix = np.zeros((len(self), len(self)))
+        np.add.at(matrix, (self.rows, self.indices), self.data)
+        return matrix
+
+    def _can_reach(self, targets: np.ndarray) -> np.ndarray:
+        """Return a boolean array that is True at every location from which some target can be reached."""
+        reached = targets.copy()
+        queue = list(np.flatnonzero(targets))
+        for current in queue:
+            for source in self.graph.reverse[current]:
+                if not reached[source]:
+                    reached[source] = True
+                    queue.append(source)
+        return reached
+
+    def _solve(self, transient: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Return x with x = right + P x on the transient locations and x = 0 everywhere else.
+
+        Preconditions:
+            - from every transient location, a location that is not transient can be reached
+        """
+        x = np.zeros(right.shape)
+        if not transient.any():
+            return x
+        if len(self) <= self.dense_limit:
+            states = np.flatnonzero(transient)
+            q = self.dense()[np.ix_(states, states)]
+            x[states] = np.linalg.solve(np.eye(len(states)) - q, right[states])
+            return x
+
+        for _ in range(self.max_iterations):
+            if right.ndim == 1:
+                following = right + self.apply(x)
+            else:
+                following = right + np.column_stack([self.apply(x[:, j]) for j in range(right.shape[1])])
+            following[~transient] = 0
+            change = np.max(np.abs(following - x))
+            x = following
+            if change < self.tolerance:
+                break
+        return x
+
+    def hitting_times(self, target_id: int = DORM) -> np.ndarray:
+        """Return the expected number of moves to first reach the target location from every location index.
+        The time is infinite at every location from which the target might never be reached."""
+        target = self._mask([target_id])
+        infinite = self._can_reach(~self._can_reach(target))
+        transient = ~target & ~infinite
+        times = self._solve(transient, np.ones(len(self)))
+        times[infinite] = np.inf
+        return times
+
+    def hitting_time(self, source_id: int, target_id: int = DORM) -> float:
+        """Return the expected number of moves to first reach the target location from the source location."""
+        return float(self.hitting_times(target_id)[self.graph.index(source_id)])
+
+    def hit_within(self, target_id: int = DORM, moves: int = MAX_MOVE) -> np.ndarray:
+        """Return the probability of reaching the target location in at most the given number of moves, from
+        every location index."""
+        target = self._mask([target_id])
+        probability = target.astype(float)
+        for _ in range(moves):
+            probability = self.apply(probability)
+            probability[target] = 1.0
+        return probability
+
+    def occupancy(self, start_id: int = DORM, moves: int = MAX_MOVE) -> np.ndarray:
+        """Return a (moves + 1) x n array whose row k is the distribution of the player's location over the
+        location indices after k moves from the start location."""
+        distributions = np.zeros((moves + 1, len(self)))
+        distributions[0, self.graph.index(start_id)] = 1.0
+        for k in range(moves):
+            distributions[k + 1] = self.step(distributions[k])
+        return distributions
+
+    def absorption_probabilities(self, final_ids: list[int]) -> np.ndarray:
+        """Return an n x len(final_ids) array whose row i holds the probability that a player starting at
+        location index i reaches each of the final locations before any other final location.
+
+        Preconditions:
+            - final_ids != []
+        """
+        finals = [self.graph.index(loc_id) for loc_id in final_ids]
+        final = self._mask(final_ids)
+        transient = ~final & self._can_reach(final)
+
+        # R holds the probability of moving straight into each final location
+        right = np.zeros((len(self), len(finals)))
+        for j, f in enumerate(finals):
+            right[:, j] = np.bincount(self.rows, weights=self.data * (self.indices == f), minlength=len(self))
+        probabilities = self._solve(transient, right)
+        probabilities[finals, range(len(finals))] = 1.0
+        return probabilities
+
+    def stationary_distribution(self) -> np.ndarray:
+        """Return the long-run fraction of moves spent at each location index, for a player whose start location
+        is chosen uniformly at random. The lazy chain (I + P) / 2 is iterated, so periodic maps converge too."""
+        distribution = np.full(len(self), 1.0 / len(self))
+        for _ in range(self.max_iterations):
+            following = 0.5 * (distribution + self.step(distribution))
+            change = np.abs(following - distribution).sum()
+            distribution = following
+            if change < self.tolerance:
+                break
+        return distribution
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import time
+
+    start = time.perf_counter()
+    chain = RandomWalkChain.from_world(World.load('game_data.json'))
+    times = chain.hitting_times(DORM)
+    within = chain.hit_within(DORM, MAX_MOVE)
+    stationary = chain.stationary_distribution()
+    elapsed = time.perf_counter() - start
+    for i, loc_id in enumerate(chain.graph.ids):
+        print(f"location {loc_id}: {times[i]:.2f} moves to the dorm, "
+              f"{within[i]:.3f} chance within {MAX_MOVE} moves, {stationary[i]:.3f} of the time here")
+    print(f"computed in {elapsed * 1000:.1f} ms")
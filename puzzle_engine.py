@@ -0,0 +1,274 @@
+"""CSC111 Project 1: Text Adventure Game - Puzzle Engine
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a hangman engine that plays puzzles without reading from the console, and a
+ batch evaluator that measures how hard each location's puzzle is.
+
+Every puzzle word is turned once into a mask of the positions of each of its letters, so a guess is a single
+ dictionary lookup and bitwise or, however long the word is. The rules are the same as AdventureGame's
+ puzzles: every guess uses a try, except guessing a letter of the word that is already revealed, and the
+ puzzle is failed once max_tries tries are used without revealing the whole word.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from game_entities import Location
+
+# The order of letters from the most to the least common in English
+GUESS_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+class HangmanWord:
+    """A puzzle word with the positions of each of its letters precomputed.
+
+    Instance Attributes:
+        - word: the puzzle word
+        - positions: a mapping from each letter of word to the bitmask of the positions it appears at
+        - full: the bitmask with a bit for every position of word
+
+    Representation Invariants:
+        - self.full == (1 << len(self.word)) - 1
+        - all(self.word[i] == letter for letter in self.positions for i in range(len(self.word))
+              if self.positions[letter] >> i & 1)
+    """
+    word: str
+    positions: dict[str, int]
+    full: int
+
+    def __init__(self, word: str) -> None:
+        """Initialize the positions of every letter of the given word."""
+        self.word = word
+        self.positions = {}
+        for i, letter in enumerate(word):
+            self.positions[letter] = self.positions.get(letter, 0) | (1 << i)
+        self.full = (1 << len(word)) - 1
+
+
+# The HangmanWord of every word used so far
+_WORDS: dict[str, HangmanWord] = {}
+
+
+def hangman_word(word: str) -> HangmanWord:
+    """Return the HangmanWord of the given word, computing it only the first time the word is used."""
+    letters = _WORDS.get(word)
+    if letters is None:
+        letters = HangmanWord(word)
+        _WORDS[word] = letters
+    return letters
+
+
+class HangmanPuzzle:
+    """One play of a hangman puzzle.
+
+    Instance Attributes:
+        - letters: the word being guessed
+        - found: the bitmask of the positions revealed so far
+        - tries: the number of tries used
+        - max_tries: the number of tries allowed
+        - guessed: the letters guessed so far, in order
+
+    Representation Invariants:
+        - self.found & ~self.letters.full == 0
+        - 0 <= self.tries <= self.max_tries
+    """
+    letters: HangmanWord
+    found: int
+    tries: int
+    max_tries: int
+    guessed: list[str]
+
+    def __init__(self, word: str, max_tries: int) -> None:
+        """Start a new puzzle with the given word and number of tries allowed."""
+        self.letters = hangman_word(word)
+        self.found = 0
+        self.tries = 0
+        self.max_tries = max_tries
+        self.guessed = []
+
+    def guess(self, letter: str) -> bool:
+        """Apply one guess, and return whether the letter was already revealed.
+
+        Preconditions:
+            - not self.solved and not self.failed
+        """
+        positions = self.letters.positions.get(letter, 0)
+        already = positions != 0 and self.found & positions == positions
+        self.found |= positions
+        if not already:
+            self.tries += 1
+        self.guessed.append(letter)
+        return already
+
+    @property
+    def solved(self) -> bool:
+        """Return whether every letter of the word has been revealed."""
+        return self.found == self.letters.full
+
+    @property
+    def failed(self) -> bool:
+        """Return whether every try has been used without solving the puzzle."""
+        return not self.solved and self.tries >= self.max_tries
+
+    def pattern(self) -> str:
+        """Return the word with "*" for every letter not revealed yet, as AdventureGame shows it."""
+        return "".join(letter if self.found >> i & 1 else "*" for i, letter in enumerate(self.letters.word))
+
+
+class Guesser:
+    """An abstract player of hangman puzzles."""
+
+    def next_guess(self, puzzle: HangmanPuzzle) -> str:
+        """Return the next letter to guess in the given puzzle."""
+        raise NotImplementedError
+
+
+def _first_unguessed(puzzle: HangmanPuzzle) -> str:
+    """Return the most common letter not guessed yet in the given puzzle."""
+    return next((letter for letter in GUESS_ORDER if letter not in puzzle.guessed), GUESS_ORDER[-1])
+
+
+def _rank(letter: str) -> int:
+    """Return the position of the given letter in GUESS_ORDER, or len(GUESS_ORDER) if it is not a letter there."""
+    rank = GUESS_ORDER.find(letter)
+    return len(GUESS_ORDER) if rank == -1 else rank
+
+
+class ScriptedGuesser(Guesser):
+    """A guesser that guesses the letters of a script in order, then the most common letters not guessed yet.
+
+    Instance Attributes:
+        - script: the letters to guess first, in order
+    """
+    script: str
+
+    def __init__(self, script: str = GUESS_ORDER) -> None:
+        """Initialize a guesser that follows the given script."""
+        self.script = script
+
+    def next_guess(self, puzzle: HangmanPuzzle) -> str:
+        """Return the next letter of the script, or the most common letter not guessed yet after it."""
+        if len(puzzle.guessed) < len(self.script):
+            return self.script[len(puzzle.guessed)]
+        return _first_unguessed(puzzle)
+
+
+class FrequencyGuesser(Guesser):
+    """A guesser that knows the words the puzzle could be, and guesses the letter that appears in the most
+    words still consistent with what has been revealed. Ties are broken by GUESS_ORDER.
+
+    Instance Attributes:
+        - candidates: the words the puzzle could be
+    """
+    candidates: list[HangmanWord]
+
+    def __init__(self, words: list[str]) -> None:
+        """Initialize a guesser for puzzles whose word is one of the given words."""
+        self.candidates = [hangman_word(word) for word in dict.fromkeys(words)]
+
+    def next_guess(self, puzzle: HangmanPuzzle) -> str:
+        """Return the unguessed letter in the most consistent candidate words."""
+        observed = {letter: puzzle.letters.positions.get(letter, 0) for letter in puzzle.guessed}
+        counts = {}
+        for candidate in self.candidates:
+            if len(candidate.word) != len(puzzle.letters.word) or \
+                    any(candidate.positions.get(letter, 0) != mask for letter, mask in observed.items()):
+                continue
+            for letter in candidate.positions:
+                if letter not in observed:
+                    counts[letter] = counts.get(letter, 0) + 1
+        if not counts:
+            return _first_unguessed(puzzle)
+        return max(counts, key=lambda letter: (counts[letter], -_rank(letter)))
+
+
+def play_word(word: str, guesser: Guesser, max_tries: int) -> HangmanPuzzle:
+    """Return the finished play of a puzzle with the given word by the given guesser."""
+    puzzle = HangmanPuzzle(word, max_tries)
+    while not puzzle.solved and not puzzle.failed:
+        puzzle.guess(guesser.next_guess(puzzle))
+    return puzzle
+
+
+@dataclass
+class PuzzleStats:
+    """How hard the puzzle at one location is for one guesser, over every one of its puzzle words.
+    Each word is equally likely, as in AdventureGame.generate_word.
+
+    Instance Attributes:
+        - location_id: the ID of the location
+        - words: the number of puzzle words at the location
+        - solve_rate: the probability that a play of the puzzle is solved
+        - expected_tries: the expected number of tries used by a play of the puzzle, solved or not
+        - expected_plays: the expected number of plays until one is solved, or infinity if none can be
+
+    Representation Invariants:
+        - self.words > 0
+        - 0 <= self.solve_rate <= 1
+    """
+    location_id: int
+    words: int
+    solve_rate: float
+    expected_tries: float
+    expected_plays: float
+
+
+def evaluate_puzzles(locations: Mapping[int, Location],
+                     guesser_factory: Callable[[list[str]], Guesser] = FrequencyGuesser,
+                     max_tries: Optional[int] = None) -> dict[int, PuzzleStats]:
+    """Return the PuzzleStats of every location with puzzle words, played by the guesser guesser_factory returns
+    for that location's puzzle words. Locations with the same puzzle words are only evaluated once.
+    max_tries is the number of tries allowed, or PUZZLE_TRIES if it is None.
+    """
+    if max_tries is None:
+        from adventure import PUZZLE_TRIES
+        max_tries = PUZZLE_TRIES
+
+    stats = {}
+    evaluated = {}
+    for loc_id, location in locations.items():
+        words = location.puzzle_words
+        if not words:
+            continue
+        key = tuple(words)
+        if key not in evaluated:
+            guesser = guesser_factory(list(words))
+            plays = [play_word(word, guesser, max_tries) for word in words]
+            solve_rate = sum(play.solved for play in plays) / len(plays)
+            evaluated[key] = (solve_rate, sum(play.tries for play in plays) / len(plays),
+                              1 / solve_rate if solve_rate else float('inf'))
+        stats[loc_id] = PuzzleStats(loc_id, len(words), *evaluated[key])
+    return stats
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    from adventure import World
+
+    game_locations = World.load('game_data.json').locations
+    for name, factory in (("frequency", FrequencyGuesser), ("scripted", lambda words: ScriptedGuesser())):
+        for location_stats in evaluate_puzzles(game_locations, factory).values():
+            print(f"{name} guesser at location {location_stats.location_id}: "
+                  f"solves {location_stats.solve_rate:.0%} of plays, {location_stats.expected_tries:.2f} tries each")
@@ -22,34 +22,83 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
-from event_logger import Event, EventList
+from collections.abc import Mapping
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import Iterable, Iterator, Optional, Union
+
+from event_logger import Event, EventList, ArrayEventList
 from adventure import AdventureGame
 from game_entities import Location
+from text_pool import location_event
+
+
+# The menu commands that leave the player where they are
+_STAY_COMMANDS = frozenset(["look", "inventory", "score", "log", "quit"])
+
+
+class _BriefDescriptions(Mapping):
+    """The brief description of every location of a game, looked up by location id only when it is read."""
+    # Private Instance Attributes:
+    #   - _game: the game whose locations are described
+    _game: AdventureGame
+
+    def __init__(self, game: AdventureGame) -> None:
+        """Initialize the descriptions of the locations of the given game."""
+        self._game = game
+
+    def __getitem__(self, id_num: int) -> str:
+        """Return the brief description of the location with the given id."""
+        return self._game.get_location(id_num).brief_description
+
+    def __iter__(self) -> Iterator[int]:
+        """Return an iterator over the location ids of the game."""
+        return iter(self._game.world.locations)
+
+    def __len__(self) -> int:
+        """Return the number of locations of the game."""
+        return len(self._game.world.locations)
 
 
 class AdventureGameSimulation:
     """A simulation of an adventure game playthrough.
+
+    In trace-only mode, the simulation records just the location id of each event and a code for each command,
+    in typed arrays. Events and their descriptions are only created when run is called or the events are iterated.
     """
     # Private Instance Attributes:
     #   - _game: The AdventureGame instance that this simulation uses.
     #   - _events: A collection of the events to process during the simulation.
+    #              This is an ArrayEventList of location ids in trace-only mode.
     _game: AdventureGame
-    _events: EventList
+    _events: Union[EventList, ArrayEventList]
 
-    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str]) -> None:
+    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str],
+                 game: Optional[AdventureGame] = None, trace_only: bool = False) -> None:
         """
         Initialize a new game simulation based on the given game data, that runs through the given commands.
+        If game is given, reuse its already loaded world instead of reading game_data_file again.
+        If trace_only is True, only record location ids and commands until the events are read.
 
         Preconditions:
         - len(commands) > 0
         - all commands in the given list are valid commands when starting from the location at initial_location_id
         """
-        self._events = EventList()
-        self._game = AdventureGame(game_data_file, initial_location_id)
+        if game is None:
+            self._game = AdventureGame(game_data_file, initial_location_id)
+        else:
+            self._game = game
+            self._game.current_location_id = initial_location_id
 
         current_location = self._game.get_location()
-        first_event = Event(current_location.id_num, current_location.brief_description)
-        self._events.add_event(first_event)
+        if trace_only:
+            self._events = ArrayEventList(location_descriptions=_BriefDescriptions(self._game))
+            self._events.add_location(current_location.id_num)
+            self._trace_events(commands, current_location)
+            return
+
+        self._events = EventList()
+        self._events.add_event(location_event(current_location, brief=True))
 
         self.generate_events(commands, current_location)
 
@@ -74,9 +123,34 @@ class AdventureGameSimulation:
             else:
                 next_loc_id = current_location.available_commands[command]
             current_location = self._game.get_location(next_loc_id)
-            brief_description = current_location.brief_description
-            event = Event(next_loc_id, brief_description)
-            self._events.add_event(event, command)
+            self._events.add_event(location_event(current_location, brief=True), command)
+
+    def _trace_events(self, commands: list[str], current_location: Location) -> None:
+        """Record the location id of every event of generate_events, without creating any Event.
+        A location is only looked up when the player moves to it.
+
+        Preconditions:
+        - self._events is an ArrayEventList with location descriptions
+        - all commands in the given list are valid commands when starting from current_location
+        """
+        events = self._events
+        current_id = current_location.id_num
+        for command in commands:
+            if command == "undo":
+                current_id = events.id_at(-2)
+                events.remove_last_event()
+                current_location = None
+            elif command not in _STAY_COMMANDS and not command.startswith("take ") \
+                    and not command.startswith("deposit "):
+                if current_location is None:
+                    current_location = self._game.get_location(current_id)
+                current_location = self._game.get_location(current_location.available_commands[command])
+                current_id = current_location.id_num
+            events.add_location(current_id, command)
+
+    def events(self) -> Iterator[Event]:
+        """Return an iterator over the events of this simulation, in order."""
+        return iter(self._events)
 
     def get_id_log(self) -> list[int]:
         """
@@ -91,15 +165,170 @@ class AdventureGameSimulation:
         Run the game simulation and log location descriptions.
         """
 
-        current_event = self._events.first
+        for event in self._events:
+            print(event.description)
+            if event.next_command is not None:
+                print("You choose:", event.next_command)
+
+
+class _ScriptTrie:
+    """A trie of command scripts, with one node per distinct prefix.
+
+    Instance Attributes:
+        - children: a mapping from each command that extends this prefix to the node of the longer prefix
+        - scripts: the positions of the scripts that are exactly this prefix
+    """
+    children: dict[str, _ScriptTrie]
+    scripts: list[int]
+
+    def __init__(self) -> None:
+        """Initialize a new trie holding only the empty prefix."""
+        self.children = {}
+        self.scripts = []
+
+    def insert(self, commands: list[str], position: int) -> int:
+        """Add the script with the given commands and position, and return the number of nodes created."""
+        node = self
+        created = 0
+        for command in commands:
+            child = node.children.get(command)
+            if child is None:
+                child = _ScriptTrie()
+                node.children[command] = child
+                created += 1
+            node = child
+        node.scripts.append(position)
+        return created
+
+
+class PrefixSharingSimulation:
+    """Simulations of many command scripts from the same location, giving the same id logs as an
+    AdventureGameSimulation of each, but simulating each prefix shared by several scripts only once.
 
-        while current_event:
-            print(current_event.description)
-            if current_event is not self._events.last:
-                print("You choose:", current_event.next_command)
+    The scripts are put in a trie that is walked depth first. The id log of the walk so far is a persistent linked
+    list of (location id, rest of the log) pairs, so the state at a branch point is kept just by holding on to the
+    log and location there, and an undo is a step back along the list.
 
-            # Move to the next event in the linked list
-            current_event = current_event.next
+    Instance Attributes:
+        - steps: the number of commands simulated, which is the number of distinct non-empty prefixes of the scripts
+        - commands: the total number of commands in the scripts, which is the number of commands separate
+                    simulations would have run
+    """
+    # Private Instance Attributes:
+    #   - _id_logs: the id log of every script, in the order the scripts were given
+    steps: int
+    commands: int
+    _id_logs: list[list[int]]
+
+    def __init__(self, game_data_file: str, initial_location_id: int, scripts: Iterable[list[str]],
+                 game: Optional[AdventureGame] = None) -> None:
+        """Simulate every script in scripts starting at the location with the given ID in the world in the given
+        game data file. If game is given, reuse its already loaded world instead of reading game_data_file again.
+
+        Preconditions:
+            - every script satisfies the preconditions of AdventureGameSimulation
+        """
+        if game is None:
+            game = AdventureGame(game_data_file, initial_location_id)
+        trie = _ScriptTrie()
+        self.steps = 0
+        self.commands = 0
+        count = 0
+        for commands in scripts:
+            self.steps += trie.insert(commands, count)
+            self.commands += len(commands)
+            count += 1
+        self._id_logs = [[] for _ in range(count)]
+
+        location = game.get_location(initial_location_id)
+        stack = [(trie, location, (location.id_num, None))]
+        while stack:
+            node, location, log = stack.pop()
+            if node.scripts:
+                id_log = _unwind(log)
+                for position in node.scripts:
+                    self._id_logs[position] = id_log.copy()
+            for command, child in node.children.items():
+                if command in _STAY_COMMANDS or command.startswith("take ") or command.startswith("deposit "):
+                    stack.append((child, location, (location.id_num, log)))
+                elif command == "undo":
+                    previous = log[1]
+                    stack.append((child, game.get_location(previous[0]), (previous[0], previous)))
+                else:
+                    next_location = game.get_location(location.available_commands[command])
+                    stack.append((child, next_location, (next_location.id_num, log)))
+
+    def get_id_log(self, position: int) -> list[int]:
+        """Return the location IDs visited by the script at the given position, as AdventureGameSimulation would.
+
+        Preconditions:
+            - 0 <= position < the number of scripts simulated
+        """
+        return self._id_logs[position]
+
+    def get_id_logs(self) -> list[list[int]]:
+        """Return the id log of every script, in the order the scripts were given."""
+        return self._id_logs
+
+
+def _unwind(log: Optional[tuple]) -> list[int]:
+    """Return the location IDs in the given persistent id log, oldest first."""
+    ids = []
+    while log is not None:
+        ids.append(log[0])
+        log = log[1]
+    ids.reverse()
+    return ids
+
+
+@dataclass
+class SimulationResult:
+    """The outcome of replaying one job of a batch simulation.
+
+    Instance Attributes:
+        - index: the position of the job in the submitted batch
+        - id_log: the location IDs visited during the simulation, as returned by get_id_log
+        - passed: whether id_log is equal to the expected log of the job
+
+    Representation Invariants:
+        - index >= 0
+    """
+    index: int
+    id_log: list[int]
+    passed: bool
+
+
+# The world loaded by each worker process of simulate_batch, shared by every job that worker runs.
+_worker_game: Optional[AdventureGame] = None
+
+
+def _init_worker(game_data_file: str) -> None:
+    """Load the game world once for this worker process."""
+    global _worker_game
+    _worker_game = AdventureGame(game_data_file, 1)
+
+
+def _run_job(job: tuple[int, tuple[int, list[str], list[int]]]) -> SimulationResult:
+    """Replay a single (index, (initial_location_id, commands, expected_log)) job on this worker's world."""
+    index, (initial_location_id, commands, expected_log) = job
+    sim = AdventureGameSimulation('', initial_location_id, commands, game=_worker_game)
+    id_log = sim.get_id_log()
+    return SimulationResult(index, id_log, id_log == expected_log)
+
+
+def simulate_batch(game_data_file: str, jobs: Iterable[tuple[int, list[str], list[int]]],
+                   workers: Optional[int] = None, chunksize: int = 64) -> Iterator[SimulationResult]:
+    """Replay every (initial_location_id, commands, expected_log) job across a pool of worker processes.
+    Each worker loads game_data_file once. Results are yielded in the same order as jobs, as soon as they
+    are available. If workers is None, one worker is started per CPU.
+
+    Preconditions:
+        - workers is None or workers > 0
+        - chunksize > 0
+        - every job satisfies the preconditions of AdventureGameSimulation
+    """
+    with Pool(workers, initializer=_init_worker, initargs=(game_data_file,)) as pool:
+        yield from pool.imap(_run_job, enumerate(jobs), chunksize)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+"""CSC111 Project 1: Text Adventure Game - Walkthrough Solver
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module finds the shortest winning walkthrough of a game world, as a list of commands
+ that AdventureGameSimulation can replay.
+
+The solver searches over (location, taken items, deposited items) states with A*. Only the items
+ that must be deposited in the dorm to win are tracked, since taking any other item only costs moves.
+ Every take is assumed to have its puzzle solved, and costs one move like every go and deposit. As in the game,
+ every item whose target is the dorm must end up there to win. An item that is at no location, is already
+ deposited somewhere else, or is at a location without a puzzle can never be taken there, so a world with such
+ an item is never won.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import heapq
+from typing import Optional
+
+from adventure import World, DORM, MAX_MOVE
+import location_graph
+
+# The distance recorded for a location that cannot reach a target at all
+UNREACHABLE = 1 << 30
+
+
+class WalkthroughSolver:
+    """A solver for the shortest winning walkthrough of one world.
+
+    Instance Attributes:
+        - world: the world being solved
+        - ids: the id of every location, in index order
+        - item_names: the names of the tracked items, in bit order
+        - sources: the index of the location each tracked item is taken from, or -1 if it starts in the dorm
+        - targets: the index of the location each tracked item must be deposited at
+
+    Representation Invariants:
+        - len(self.item_names) == len(self.sources) == len(self.targets)
+    """
+    # Private Instance Attributes:
+    #   - _index: a mapping from location id to its index in ids
+    #   - _moves: the (command, destination index) pairs available at each location, by location index, shared
+    #             with the world's LocationGraph
+    #   - _distance_to: a mapping from a location index to the fewest moves from every location to it
+    #   - _stranded: the names of the items that must be in the dorm to win but can never be brought there
+    world: World
+    ids: list[int]
+    item_names: list[str]
+    sources: list[int]
+    targets: list[int]
+    _index: dict[int, int]
+    _moves: list[list[tuple[str, int]]]
+    _distance_to: dict[int, list[int]]
+    _stranded: list[str]
+
+    def __init__(self, world: World) -> None:
+        """Initialize a new solver for the given world, precomputing the shortest paths it needs.
+
+        Preconditions:
+            - DORM in world.locations
+        """
+        self.world = world
+        graph = world.graph()
+        self.ids = graph.ids
+        self._index = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self._moves = graph.edges
+
+        placed = {}
+        for loc_id in self.ids:
+            for name in world.locations[loc_id].items:
+                placed[name] = self._index[loc_id]
+
+        self.item_names, self.sources, self.targets, self._stranded = [], [], [], []
+        for itm in world.items:
+            if itm.target_position != DORM:
+                continue
+            source = placed.get(itm.name)
+            if source is None or (source != self._index[DORM] and (
+                    itm.deposited or not world.locations[self.ids[source]].puzzle_words)):
+                self._stranded.append(itm.name)
+            else:
+                self.item_names.append(itm.name)
+                self.sources.append(-1 if placed[itm.name] == self._index[DORM] else placed[itm.name])
+                self.targets.append(self._index[DORM])
+
+        self._distance_to = {}
+        for target in set(self.sources + self.targets) - {-1}:
+            self._distance_to[target] = [UNREACHABLE if distance == location_graph.UNREACHABLE else distance
+                                         for distance in graph.distances_to(self.ids[target])]
+
+    def _heuristic(self, location: int, taken: int, deposited: int) -> int:
+        """Return a lower bound on the moves needed to win from the given state.
+
+        Every item not taken yet needs a take, a deposit, and a walk past its source to its target; every item
+        carried needs a deposit and a walk to its target. The walk is bounded below by the longest of these.
+        """
+        actions = 0
+        walk = 0
+        for i, source in enumerate(self.sources):
+            bit = 1 << i
+            if deposited & bit or source == -1:
+                continue
+            target = self.targets[i]
+            if taken & bit:
+                actions += 1
+                walk = max(walk, self._distance_to[target][location])
+            else:
+                actions += 2
+                walk = max(walk, self._distance_to[source][location] + self._distance_to[target][source])
+        return walk + actions
+
+    def solve(self, initial_location_id: int = DORM, max_moves: int = MAX_MOVE) -> Optional[list[str]]:
+        """Return the shortest list of commands that wins the game from the given location in at most max_moves
+        moves, or None if the game cannot be won within max_moves moves.
+
+        Preconditions:
+            - initial_location_id in self.world.locations
+        """
+        n = len(self.item_names)
+        required = sum(1 << i for i, source in enumerate(self.sources) if source != -1)
+        if required == 0 or self._stranded:
+            return None
+        mask = (1 << n) - 1
+        location_shift = 2 * n
+
+        start = self._index[initial_location_id] << location_shift
+        best = {start: 0}
+        parents = {start: None}
+        frontier = [(self._heuristic(self._index[initial_location_id], 0, 0), 0, start)]
+        while frontier:
+            _, g, key = heapq.heappop(frontier)
+            if g > best[key]:
+                continue
+            location, taken, deposited = key >> location_shift, (key >> n) & mask, key & mask
+            if deposited & required == required:
+                return self._walkthrough(parents, key)
+
+            for command, successor in self._successors(location, taken, deposited):
+                h = self._heuristic(successor >> location_shift, (successor >> n) & mask, successor & mask)
+                if g + 1 + h > max_moves or (successor in best and best[successor] <= g + 1):
+                    continue
+                best[successor] = g + 1
+                parents[successor] = (key, command)
+                heapq.heappush(frontier, (g + 1 + h, g + 1, successor))
+        return None
+
+    def _successors(self, location: int, taken: int, deposited: int) -> list[tuple[str, int]]:
+        """Return the (command, state key) of every state one move away from the given state."""
+        n = len(self.item_names)
+        location_shift = 2 * n
+        successors = [(command, (destination << location_shift) | (taken << n) | deposited)
+                      for command, destination in self._moves[location]]
+        for i, source in enumerate(self.sources):
+            bit = 1 << i
+            if source == location and not taken & bit:
+                successors.append((f"take {self.item_names[i]}",
+                                   (location << location_shift) | ((taken | bit) << n) | deposited))
+            elif taken & bit and not deposited & bit and self.targets[i] == location:
+                successors.append((f"deposit {self.item_names[i]}",
+                                   (location << location_shift) | (taken << n) | deposited | bit))
+        return successors
+
+    @staticmethod
+    def _walkthrough(parents: dict[int, Optional[tuple[int, str]]], key: int) -> list[str]:
+        """Return the commands leading from the start state to the state with the given key."""
+        commands = []
+        while parents[key] is not None:
+            key, command = parents[key]
+            commands.append(command)
+        commands.reverse()
+        return commands
+
+
+def solve_walkthrough(game_data_file: str, initial_location_id: int = DORM,
+                      max_moves: int = MAX_MOVE) -> Optional[list[str]]:
+    """Return the shortest winning walkthrough of the game in the given game data file, or None if the game
+    cannot be won within max_moves moves.
+
+    Preconditions:
+        - game_data_file is the filename of a valid game data JSON file
+    """
+    return WalkthroughSolver(World.load(game_data_file)).solve(initial_location_id, max_moves)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    from dataclasses import replace
+    from simulation import AdventureGameSimulation
+
+    # A world is never won if an item that belongs in the dorm is at no location or deposited somewhere else
+    game_world = World.load('game_data.json')
+    assert WalkthroughSolver(game_world).solve() is not None
+    win_item = next(itm for itm in game_world.items if itm.target_position == DORM)
+    stranded_items = [replace(itm, deposited=True) if itm is win_item else itm for itm in game_world.items]
+    assert WalkthroughSolver(World(game_world.locations, stranded_items)).solve() is None
+    missing_locations = {loc_id: replace(loc, items=[name for name in loc.items if name != win_item.name])
+                         for loc_id, loc in game_world.locations.items()}
+    assert WalkthroughSolver(World(missing_locations, game_world.items)).solve() is None
+
+    walkthrough = solve_walkthrough('game_data.json')
+    print(len(walkthrough), "moves:", walkthrough)
+    sim = AdventureGameSimulation('game_data.json', DORM, walkthrough)
+    print(sim.get_id_log())
@@ -0,0 +1,294 @@
+"""CSC111 Project 1: Text Adventure Game - Text Pool
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module stores the descriptions of a world once each, in a shared text pool, so that locations and
+ events hold small integer handles instead of their own copies of the text.
+
+Texts are stored in blocks of block_size texts. Once a block is full it is compressed with zlib, if the pool
+ compresses, and the text of recently used handles is kept decompressed in a least recently used cache.
+ Descriptions of neighbouring locations are usually similar, so compressing them together saves far more than
+ compressing each one alone.
+
+A pooled world is loaded with load_pooled_game_data and played with AdventureGame.from_world. Its locations are
+ PooledLocations and the events logged in it are PooledEvents, which behave exactly like Locations and Events.
+
+On its own, a text pool saves little. A generated world of 100,000 locations takes 80 MB pooled and 88 MB as
+ plain Locations. Events are no smaller pooled, because a plain Event already shares its location's description
+ string rather than copying it. Most of the saving comes from compact_world, which builds on this pool and
+ stores the rest of every location in arrays: the same world takes 15 MB there (see measure_world_memory).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from game_entities import Location, Item, GameSnapshot
+from event_logger import Event
+
+
+class TextPool:
+    """A pool of unique texts, each identified by an integer handle.
+
+    Instance Attributes:
+        - block_size: the number of texts stored together in each block
+        - compress: whether full blocks are compressed
+        - cache_size: the maximum number of texts kept decompressed
+
+    Representation Invariants:
+        - self.block_size > 0
+        - self.cache_size > 0
+        - all(self.add(self.get(handle)) == handle for handle in range(len(self)))
+    """
+    # Private Instance Attributes:
+    #   - _blocks: the UTF-8 texts of every full block, one after another, compressed if compress is True
+    #   - _ends: the end of every text in a full block, as a byte offset into the texts of its block
+    #   - _pending: the texts of the block being filled, which are not encoded yet
+    #   - _count: the number of texts in the pool
+    #   - _slots, _slot_hashes: an open addressing hash table of every text, holding one more than its handle
+    #                           (0 for an empty slot) and the low 32 bits of its hash. Only hashes are kept, so
+    #                           that the pool never holds a second copy of every text.
+    #   - _cache: the recently used texts of full blocks, by handle, least recently used first
+    #   - _block: the index and decompressed texts of the full block read most recently, or None
+    block_size: int
+    compress: bool
+    cache_size: int
+    _blocks: list[bytes]
+    _ends: array
+    _pending: list[str]
+    _count: int
+    _slots: array
+    _slot_hashes: array
+    _cache: OrderedDict[int, str]
+    _block: Optional[tuple[int, bytes]]
+
+    def __init__(self, block_size: int = 64, compress: bool = True, cache_size: int = 1024) -> None:
+        """Initialize a new empty text pool.
+
+        Preconditions:
+            - block_size > 0
+            - cache_size > 0
+        """
+        self.block_size = block_size
+        self.compress = compress
+        self.cache_size = cache_size
+        self._blocks = []
+        self._ends = array('I')
+        self._pending = []
+        self._count = 0
+        self._slots = array('I', [0]) * 64
+        self._slot_hashes = array('I', [0]) * 64
+        self._cache = OrderedDict()
+        self._block = None
+
+    def __len__(self) -> int:
+        """Return the number of texts in this pool."""
+        return self._count
+
+    def add(self, text: str) -> int:
+        """Return the handle of text in this pool, adding it first if it is not already present."""
+        key = hash(text) & 0xFFFFFFFF
+        mask = len(self._slots) - 1
+        slot = key & mask
+        while self._slots[slot] != 0:
+            if self._slot_hashes[slot] == key and self.get(self._slots[slot] - 1) == text:
+                return self._slots[slot] - 1
+            slot = (slot + 1) & mask
+
+        handle = self._count
+        self._count += 1
+        self._slots[slot] = handle + 1
+        self._slot_hashes[slot] = key
+        self._pending.append(text)
+        if len(self._pending) == self.block_size:
+            self._close_block()
+        if 2 * self._count > len(self._slots):
+            self._grow()
+        return handle
+
+    def _grow(self) -> None:
+        """Double the size of the hash table, placing every handle again by its hash."""
+        slots, slot_hashes = self._slots, self._slot_hashes
+        self._slots = array('I', [0]) * (2 * len(slots))
+        self._slot_hashes = array('I', [0]) * (2 * len(slots))
+        mask = len(self._slots) - 1
+        for stored, key in zip(slots, slot_hashes):
+            if stored != 0:
+                slot = key & mask
+                while self._slots[slot] != 0:
+                    slot = (slot + 1) & mask
+                self._slots[slot] = stored
+                self._slot_hashes[slot] = key
+
+    def _close_block(self) -> None:
+        """Encode the texts of the block being filled, and start a new block."""
+        encoded = [text.encode('utf-8') for text in self._pending]
+        end = 0
+        for text in encoded:
+            end += len(text)
+            self._ends.append(end)
+        encoded = b''.join(encoded)
+        self._blocks.append(zlib.compress(encoded) if self.compress else encoded)
+        self._pending = []
+
+    def get(self, handle: int) -> str:
+        """Return the text with the given handle.
+
+        Preconditions:
+            - 0 <= handle < len(self)
+        """
+        block, index = divmod(handle, self.block_size)
+        if handle >= self._count - len(self._pending):
+            return self._pending[index]
+
+        text = self._cache.get(handle)
+        if text is not None:
+            self._cache.move_to_end(handle)
+            return text
+
+        if self._block is None or self._block[0] != block:
+            encoded = self._blocks[block]
+            self._block = (block, zlib.decompress(encoded) if self.compress else encoded)
+        start = self._ends[handle - 1] if index > 0 else 0
+        text = self._block[1][start:self._ends[handle]].decode('utf-8')
+        self._cache[handle] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def stored_bytes(self) -> int:
+        """Return the number of bytes of text stored, after compression, not counting the cache."""
+        return (sum(len(block) for block in self._blocks) + self._ends.itemsize * len(self._ends)
+                + sum(len(text.encode('utf-8')) for text in self._pending))
+
+    def table_bytes(self) -> int:
+        """Return the number of bytes used by the hash table that finds the handle of a text."""
+        return self._slots.itemsize * len(self._slots) + self._slot_hashes.itemsize * len(self._slot_hashes)
+
+
+class PooledLocation(Location):
+    """A Location whose descriptions are stored in a text pool.
+
+    Instance Attributes:
+        - pool: the text pool holding the descriptions
+        - brief_handle: the handle of brief_description in pool
+        - long_handle: the handle of long_description in pool
+    """
+    pool: TextPool
+    brief_handle: int
+    long_handle: int
+
+    def __init__(self, pool: TextPool, id_num: int, brief_description: str, long_description: str,
+                 available_commands: dict[str, int], items: list[str], puzzle_words: list[str],
+                 visited: bool) -> None:
+        """Initialize a new location with the given attributes, adding its descriptions to pool."""
+        self.pool = pool
+        super().__init__(id_num, brief_description, long_description, available_commands, items, puzzle_words,
+                         visited)
+
+    @property
+    def brief_description(self) -> str:
+        """Return the brief description of this location."""
+        return self.pool.get(self.brief_handle)
+
+    @brief_description.setter
+    def brief_description(self, text: str) -> None:
+        """Set the brief description of this location."""
+        self.brief_handle = self.pool.add(text)
+
+    @property
+    def long_description(self) -> str:
+        """Return the long description of this location."""
+        return self.pool.get(self.long_handle)
+
+    @long_description.setter
+    def long_description(self, text: str) -> None:
+        """Set the long description of this location."""
+        self.long_handle = self.pool.add(text)
+
+
+class PooledEvent(Event):
+    """An Event whose description is stored in a text pool.
+
+    Instance Attributes:
+        - pool: the text pool holding the description
+        - handle: the handle of description in pool
+    """
+    pool: TextPool
+    handle: int
+
+    def __init__(self, pool: TextPool, id_num: int, handle: int, next_command: Optional[str] = None,
+                 snapshot: Optional[GameSnapshot] = None) -> None:
+        """Initialize a new event whose description has the given handle in pool."""
+        self.pool = pool
+        self.handle = handle
+        self.id_num = id_num
+        self.next_command = next_command
+        self.next = None
+        self.prev = None
+        self.snapshot = snapshot
+
+    @property
+    def description(self) -> str:
+        """Return the description of this event."""
+        return self.pool.get(self.handle)
+
+    @description.setter
+    def description(self, text: str) -> None:
+        """Set the description of this event."""
+        self.handle = self.pool.add(text)
+
+
+def location_event(location: Location, snapshot: Optional[GameSnapshot] = None, brief: bool = False) -> Event:
+    """Return a new event at the given location, described by its long description, or its brief description if
+    brief is True. The event refers to the description in the location's text pool, if it has one."""
+    if isinstance(location, PooledLocation):
+        handle = location.brief_handle if brief else location.long_handle
+        return PooledEvent(location.pool, location.id_num, handle, snapshot=snapshot)
+    description = location.brief_description if brief else location.long_description
+    return Event(location.id_num, description, snapshot=snapshot)
+
+
+def load_pooled_game_data(filename: str, pool: Optional[TextPool] = None) -> tuple[dict[int, Location], list[Item]]:
+    """Load locations and items from the game data JSON file with the given filename, like
+    AdventureGame.load_json_game_data, but store every description in pool, or a new TextPool if it is None."""
+    if pool is None:
+        pool = TextPool()
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    locations = {}
+    for loc_data in data['locations']:
+        locations[loc_data['id']] = PooledLocation(pool, loc_data['id'], loc_data['brief_description'],
+                                                   loc_data['long_description'], loc_data['available_commands'],
+                                                   loc_data['items'], loc_data['puzzle_words'], loc_data['visited'])
+    items = [Item(item_data['name'], item_data['description'], item_data['start_position'],
+                  item_data['target_position'], item_data['target_points'], item_data['deposited'])
+             for item_data in data['items']]
+    return locations, items
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
@@ -0,0 +1,127 @@
+"""CSC111 Project 1: Text Adventure Game - World Generator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module writes synthetic game data files, in the same format as game_data.json, for testing and
+ benchmarking the game at scales from a handful to millions of locations.
+
+The locations are laid out on a square grid starting from the dorm (location 1) in the top left corner, with
+ "go north", "go south", "go east" and "go west" commands between neighbours, so every location can reach every
+ other. Items are placed at random locations other than the dorm; the first win_items of them must be returned
+ to the dorm and the rest to another random location. Some of the locations holding items have a puzzle, and
+ every location holding an item that must be returned to the dorm does, since only items at locations with a
+ puzzle can be taken.
+
+The file is written one location at a time, so generating a world never holds more than its items in memory.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import math
+import os
+import random
+
+# The words puzzles are made from
+PUZZLE_VOCABULARY = ["printer", "bookshelf", "file", "projector", "ruler", "chalkboard", "textbook", "ipad",
+                     "recursion", "induction", "computer", "lecture", "library", "coffee", "laptop", "deadline",
+                     "midterm", "syllabus", "tutorial", "keyboard", "monitor", "notebook", "backpack", "calculus",
+                     "algorithm", "variable", "function", "compiler", "database", "network"]
+
+
+def grid_commands(loc_id: int, locations: int) -> dict[str, int]:
+    """Return the available commands of the location with the given id, in a grid world with the given number of
+    locations."""
+    width = math.isqrt(locations - 1) + 1
+    column = (loc_id - 1) % width
+    commands = {}
+    if loc_id - width >= 1:
+        commands["go north"] = loc_id - width
+    if loc_id + width <= locations:
+        commands["go south"] = loc_id + width
+    if column + 1 < width and loc_id + 1 <= locations:
+        commands["go east"] = loc_id + 1
+    if column > 0:
+        commands["go west"] = loc_id - 1
+    return commands
+
+
+def generate_world(filename: str, locations: int, seed: int = 0, item_rate: float = 0.1, puzzle_rate: float = 0.5,
+                   win_items: int = 3) -> dict[str, int]:
+    """Write a valid game data file with the given number of locations to filename, and return the number of
+    locations, items and puzzles written. The same arguments always write the same world.
+
+    Preconditions:
+        - locations >= 1
+        - 0 <= item_rate and 0 <= puzzle_rate <= 1
+        - win_items >= 0
+    """
+    rng = random.Random(seed)
+    item_count = max(win_items, round(locations * item_rate)) if locations > 1 else 0
+    placed = {}
+    win_starts = set()
+    items = []
+    for number in range(item_count):
+        start = rng.randint(2, locations)
+        target = 1 if number < win_items else rng.randint(2, locations)
+        name = f"item {number}"
+        placed.setdefault(start, []).append(name)
+        if number < win_items:
+            win_starts.add(start)
+        items.append({"name": name, "description": f"Generated item number {number}.", "start_position": start,
+                      "target_position": target, "target_points": rng.randint(1, 10) * 10, "deposited": False})
+
+    puzzles = 0
+    temporary = filename + '.tmp'
+    with open(temporary, 'w') as f:
+        f.write('{\n  "locations": [\n')
+        for loc_id in range(1, locations + 1):
+            names = placed.get(loc_id, [])
+            needs_puzzle = names and (rng.random() < puzzle_rate or loc_id in win_starts)
+            words = rng.sample(PUZZLE_VOCABULARY, 3) if needs_puzzle else []
+            puzzles += bool(words)
+            location = {"id": loc_id, "name": "Dorm" if loc_id == 1 else f"Location {loc_id}",
+                        "brief_description": f"You are at location {loc_id}.",
+                        "long_description": f"You are at location {loc_id} of a generated world. "
+                                            f"Paths lead to the neighbouring locations.",
+                        "available_commands": grid_commands(loc_id, locations), "items": names,
+                        "puzzle_words": words, "visited": False}
+            f.write('    ' + json.dumps(location) + (',\n' if loc_id < locations else '\n'))
+        f.write('  ],\n  "items": [\n')
+        f.write(',\n'.join('    ' + json.dumps(itm) for itm in items))
+        f.write('\n  ]\n}\n')
+    os.replace(temporary, filename)
+    return {'locations': locations, 'items': len(items), 'puzzles': puzzles}
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic game data file.")
+    parser.add_argument('output')
+    parser.add_argument('--locations', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--item-rate', type=float, default=0.1)
+    parser.add_argument('--puzzle-rate', type=float, default=0.5)
+    parser.add_argument('--win-items', type=int, default=3)
+    args = parser.parse_args()
+    print(generate_world(args.output, args.locations, args.seed, args.item_rate, args.puzzle_rate, args.win_items))
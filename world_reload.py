@@ -0,0 +1,563 @@
+"""CSC111 Project 1: Text Adventure Game - World Reload
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module reloads a game data file that was edited while games were being played in it, without
+ restarting them.
+
+A WorldWatcher indexes the file once when it starts watching it: where every location and item object is, and a
+ digest of every object and of every block of consecutive objects. When the file changes, the unchanged blocks at
+ its start and end are recognised by their digests, and only the objects between them whose digests changed are
+ parsed and compared with the loaded world. Only the Location and Item objects that changed are rebuilt; every
+ other object, and every index of the world that the changes do not affect, is shared with the new world, whose
+ locations are an overlay over the loaded world's. A streamed world instead gets a new LazyLocations over the new
+ version of the file, as the old one's offsets into it may be out of date. Either way a reload never builds the
+ locations it does not need. Each game watched by a WorldWatcher is then switched to the new world with
+ AdventureGame.swap_world, keeping the player's position and inventory.
+
+A WorldWatcher only reloads when check is called, so a game is never switched in the middle of a step. Call it
+ between commands, as the game loop in adventure.py does, or from a periodic task on the same event loop as the
+ games, as GameServer does. A game that cannot be switched, because the edit removed both the player's location
+ and the dorm, stops being watched and carries on in the world it was playing in.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import os
+import weakref
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, TYPE_CHECKING
+
+from game_entities import Location, Item
+from world_stream import LazyLocations, scan_document
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame, World
+
+# The number of objects in each block of a GameDataIndex, and the size in bytes of the digest of each object
+_BLOCK_OBJECTS = 64
+_DIGEST_SIZE = 20
+
+
+@dataclass
+class WorldDiff:
+    """The differences between a loaded world and a new version of its game data file.
+
+    Instance Attributes:
+        - added_locations: the ids of the locations only in the new version
+        - changed_locations: the ids of the locations in both versions whose data differs
+        - removed_locations: the ids of the locations only in the loaded world
+        - changed_items: the names of the items that were added, changed or removed
+        - items_reordered: whether the items that are in both versions are in a different order
+        - moves_changed: whether any location was added or removed, or had its available commands changed
+
+    Representation Invariants:
+        - self.added_locations.isdisjoint(self.changed_locations)
+        - self.removed_locations.isdisjoint(self.changed_locations | self.added_locations)
+    """
+    added_locations: set[int] = field(default_factory=set)
+    changed_locations: set[int] = field(default_factory=set)
+    removed_locations: set[int] = field(default_factory=set)
+    changed_items: set[str] = field(default_factory=set)
+    items_reordered: bool = False
+    moves_changed: bool = False
+
+    def items_changed(self) -> bool:
+        """Return whether the items list of the world changed in any way."""
+        return bool(self.changed_items) or self.items_reordered
+
+    def is_empty(self) -> bool:
+        """Return whether the new version has no differences from the loaded world."""
+        return not (self.added_locations or self.changed_locations or self.removed_locations
+                    or self.items_changed())
+
+    def size(self) -> int:
+        """Return the number of locations and items that differ."""
+        return (len(self.added_locations) + len(self.changed_locations) + len(self.removed_locations)
+                + len(self.changed_items))
+
+
+def _same_location(location: Location, loc_data: dict) -> bool:
+    """Return whether the given location holds exactly the given location data."""
+    return (location.brief_description == loc_data['brief_description']
+            and location.long_description == loc_data['long_description']
+            and location.available_commands == loc_data['available_commands']
+            and location.items == loc_data['items'] and location.puzzle_words == loc_data['puzzle_words']
+            and location.visited == loc_data['visited'])
+
+
+def _same_item(itm: Item, item_data: dict) -> bool:
+    """Return whether the given item holds exactly the given item data."""
+    return (itm.description == item_data['description'] and itm.start_position == item_data['start_position']
+            and itm.target_position == item_data['target_position']
+            and itm.target_points == item_data['target_points'] and itm.deposited == item_data['deposited'])
+
+
+class LocationOverlay(Mapping):
+    """A mapping from location id to Location made by a reload, which shares every Location of the mapping it
+    was reloaded from except those the reload changed, added or removed. Reloading an overlay again makes a
+    new overlay over the same base, so lookups never go through more than one overlay.
+
+    Locations are in the order of the base, with every location added since it at the end, as in a dict that
+    had the changes made to it.
+
+    Instance Attributes:
+        - base: the mapping of locations the overlay was first made over
+
+    Representation Invariants:
+        - all(loc_id in self.base for loc_id in self._changed)
+        - self._changed.keys().isdisjoint(self._removed)
+        - all(loc_id in self._removed for loc_id in self._added if loc_id in self.base)
+    """
+    # Private Instance Attributes:
+    #   - _changed: the new Location of every location of base that was changed, by id
+    #   - _added: the Location of every location not in base, or removed from base and added back, in the order
+    #             they were added
+    #   - _removed: the ids of the locations of base that are not in this mapping, or were added back
+    base: Mapping[int, Location]
+    _changed: dict[int, Location]
+    _added: dict[int, Location]
+    _removed: set[int]
+
+    def __init__(self, base: Mapping[int, Location], changed: dict[int, Location], added: dict[int, Location],
+                 removed: set[int]) -> None:
+        """Initialize a new overlay over base with the given changes."""
+        self.base = base
+        self._changed = changed
+        self._added = added
+        self._removed = removed
+
+    def __getitem__(self, loc_id: int) -> Location:
+        """Return the Location with the given id."""
+        location = self._added.get(loc_id)
+        if location is not None:
+            return location
+        if loc_id in self._removed:
+            raise KeyError(loc_id)
+        location = self._changed.get(loc_id)
+        return self.base[loc_id] if location is None else location
+
+    def __contains__(self, loc_id: object) -> bool:
+        """Return whether a location with the given id exists."""
+        return loc_id in self._added or (loc_id not in self._removed and loc_id in self.base)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over every location id."""
+        for loc_id in self.base:
+            if loc_id not in self._removed:
+                yield loc_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.base) - len(self._removed) + len(self._added)
+
+
+def _overlay(locations: Mapping[int, Location], changed: dict[int, Location], added: dict[int, Location],
+             removed: set[int]) -> LocationOverlay:
+    """Return the given locations with the given locations changed, added and removed, as an overlay. The work
+    done is proportional to the number of changes, including those already in locations if it is an overlay."""
+    if isinstance(locations, LocationOverlay):
+        overlay = LocationOverlay(locations.base, dict(locations._changed), dict(locations._added),
+                                  set(locations._removed))
+    else:
+        overlay = LocationOverlay(locations, {}, {}, set())
+    for loc_id in removed:
+        if overlay._added.pop(loc_id, None) is None:
+            overlay._removed.add(loc_id)
+            overlay._changed.pop(loc_id, None)
+    for loc_id, location in changed.items():
+        if loc_id in overlay._added:
+            overlay._added[loc_id] = location
+        else:
+            overlay._changed[loc_id] = location
+    overlay._added.update(added)
+    return overlay
+
+
+def _digest(data: bytes | memoryview) -> bytes:
+    """Return the digest of the given bytes, which is _DIGEST_SIZE bytes long."""
+    return hashlib.sha1(data).digest()
+
+
+class GameDataIndex:
+    """The objects of one version of a game data file, with the digest of each object and of every block of
+    consecutive objects, so that a later version of the file can be compared with it without parsing it.
+
+    The blocks cover the whole file. The first block starts at the start of the file, and every other block
+    starts at the start of its first object.
+
+    Instance Attributes:
+        - keys: the name of the top-level array holding each object, in file order
+        - ids: the "id" of each object, or -1 if it has none
+        - starts: the offset of the start of each object in the file
+        - ends: the offset of the end of each object in the file
+        - digests: the digests of every object, one after another
+        - block_objects: the number of objects in each block
+        - block_sizes: the size of each block in bytes
+        - block_digests: the digest of each block
+
+    Representation Invariants:
+        - len(self.keys) == len(self.ids) == len(self.starts) == len(self.ends) == sum(self.block_objects)
+        - len(self.digests) == _DIGEST_SIZE * len(self.keys)
+        - len(self.block_objects) == len(self.block_sizes) == len(self.block_digests)
+        - all(objects > 0 for objects in self.block_objects[1:])
+    """
+    keys: list[str]
+    ids: array
+    starts: array
+    ends: array
+    digests: bytes
+    block_objects: array
+    block_sizes: array
+    block_digests: list[bytes]
+
+    def __init__(self, keys: list[str], ids: array, starts: array, ends: array, digests: bytes) -> None:
+        """Initialize a new index of the given objects, with no blocks yet."""
+        self.keys = keys
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self.digests = digests
+        self.block_objects, self.block_sizes, self.block_digests = array('q'), array('q'), []
+
+    @staticmethod
+    def _of_objects(view: memoryview, objects: list[tuple[str, int, int, int]]) -> GameDataIndex:
+        """Return an index of the given objects of view, with no blocks yet."""
+        return GameDataIndex([key for key, _, _, _ in objects], array('q', (obj[3] for obj in objects)),
+                             array('q', (obj[1] for obj in objects)), array('q', (obj[2] for obj in objects)),
+                             b''.join(_digest(view[start:end]) for _, start, end, _ in objects))
+
+    @staticmethod
+    def build(data: bytes) -> GameDataIndex:
+        """Return the index of the game data file with the given contents.
+
+        Raise ValueError if data is not a complete JSON document.
+        """
+        objects = _scan(data, 0, 0, '', len(data), None)
+        if objects is None:
+            raise ValueError("the game data file is incomplete")
+        view = memoryview(data)
+        index = GameDataIndex._of_objects(view, objects)
+        index._add_blocks(view, objects, 0, len(data))
+        return index
+
+    def digest(self, i: int) -> bytes:
+        """Return the digest of object i."""
+        return self.digests[i * _DIGEST_SIZE:(i + 1) * _DIGEST_SIZE]
+
+    def spans(self, key: str) -> dict[int, tuple[int, int]]:
+        """Return the (start, end) offsets of every object in the top-level array with the given name, by id."""
+        return {id_num: (start, end) for name, id_num, start, end in zip(self.keys, self.ids, self.starts, self.ends)
+                if name == key}
+
+    def _add_blocks(self, view: memoryview, objects: list[tuple[str, int, int, int]], start: int, end: int) -> None:
+        """Append the blocks covering view[start:end], which holds the given objects, to the blocks of this
+        index. A new block starts at every _BLOCK_OBJECTS-th object."""
+        bounds = [start] + [objects[i][1] for i in range(_BLOCK_OBJECTS, len(objects), _BLOCK_OBJECTS)] + [end]
+        for i in range(len(bounds) - 1):
+            self.block_objects.append(min(_BLOCK_OBJECTS, len(objects) - i * _BLOCK_OBJECTS))
+            self.block_sizes.append(bounds[i + 1] - bounds[i])
+            self.block_digests.append(_digest(view[bounds[i]:bounds[i + 1]]))
+
+    def updated(self, view: memoryview, first: int, last: int, start: int, end: int,
+                objects: list[tuple[str, int, int, int]]) -> GameDataIndex:
+        """Return the index of view, a new version of the indexed file in which blocks first to last - 1 were
+        replaced by view[start:end], which holds the given objects.
+
+        Preconditions:
+            - the blocks before first and from last on are unchanged, and start and end are where they meet
+        """
+        lo, hi = sum(self.block_objects[:first]), sum(self.block_objects[:last])
+        shift = len(view) - sum(self.block_sizes)
+        middle = GameDataIndex._of_objects(view, objects)
+        index = GameDataIndex(self.keys[:lo] + middle.keys + self.keys[hi:], self.ids[:lo] + middle.ids + self.ids[hi:],
+                              self.starts[:lo] + middle.starts + array('q', map(shift.__add__, self.starts[hi:])),
+                              self.ends[:lo] + middle.ends + array('q', map(shift.__add__, self.ends[hi:])),
+                              self.digests[:lo * _DIGEST_SIZE] + middle.digests + self.digests[hi * _DIGEST_SIZE:])
+        index.block_objects, index.block_sizes = self.block_objects[:first], self.block_sizes[:first]
+        index.block_digests = self.block_digests[:first]
+        suffix = (self.block_objects[last:], self.block_sizes[last:], self.block_digests[last:])
+
+        lead = objects[0][1] if objects else end
+        if first > 0 and lead > start:
+            # Keep every block but the first starting at its first object, by growing the block before it
+            index.block_sizes[-1] += lead - start
+            index.block_digests[-1] = _digest(view[lead - index.block_sizes[-1]:lead])
+            start = lead
+        if objects or (start < end and not suffix[0]):
+            index._add_blocks(view, objects, start, end)
+        elif start < end:
+            # Nothing is left before the first unchanged block, which becomes the first block of the file
+            suffix[1][0] += end - start
+            suffix[2][0] = _digest(view[start:start + suffix[1][0]])
+        index.block_objects.extend(suffix[0])
+        index.block_sizes.extend(suffix[1])
+        index.block_digests.extend(suffix[2])
+        return index
+
+
+def _scan(data: bytes, start: int, depth: int, key: str, end: int,
+          boundary: Optional[tuple[str, int]]) -> Optional[list[tuple[str, int, int, int]]]:
+    """Return the (key, start, end, id) of every object that starts in data[start:end], scanned with
+    scan_document from the given depth and key. If boundary is given, an object with that (key, id) must start
+    at end; otherwise the document must end at end. Return None if data does not fit that."""
+    scan = scan_document(data, start, len(data) if boundary is not None else end, depth, key)
+    objects = []
+    try:
+        while True:
+            obj = next(scan)
+            if obj[1] >= end:
+                return objects if boundary is not None and (obj[0], obj[1], obj[3]) == (*boundary[:1], end,
+                                                                                           boundary[1]) else None
+            objects.append(obj)
+    except StopIteration as stop:
+        return objects if boundary is None and stop.value == 0 else None
+
+
+def reload_world(world: World, game_data_file: str, index: GameDataIndex) -> tuple[World, WorldDiff, GameDataIndex]:
+    """Return a new world holding the current contents of the given game data file, its differences from the
+    given world, and the index of the file. The given world was loaded from the earlier version of the file
+    indexed by index, and is not changed. The given world itself is returned if the file holds the same world
+    and none of it needs to be read again.
+
+    The blocks of objects at the start and end of the file that are unchanged since the indexed version are
+    recognised by their digests, and only the objects between them that have changed are parsed. The new
+    world's locations are an overlay over the given world's, or for a streamed world, a new LazyLocations over
+    the new version of the file that keeps the unchanged Locations the given one holds. Besides reading the
+    file, the work done is proportional to the size of the changed part of the file, and to the number of
+    objects in it for a streamed world.
+
+    As a streamed world's Locations are read from the file that has just changed, its changed locations cannot
+    be compared with their earlier versions; every location whose JSON text changed is taken to have changed,
+    along with its moves.
+
+    Raise ValueError if the file is not a complete game data file, as happens while it is still being written.
+
+    Preconditions:
+        - game_data_file is the filename of a game data JSON file
+    """
+    streamed = isinstance(world.locations, LazyLocations)
+    with open(game_data_file, 'rb') as f:
+        if streamed:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data = buffer[:]
+        else:
+            data = f.read()
+    view = memoryview(data)
+    sizes, digests = index.block_sizes, index.block_digests
+
+    start, first = 0, 0
+    while first < len(sizes) and start + sizes[first] <= len(data) and \
+            _digest(view[start:start + sizes[first]]) == digests[first]:
+        start += sizes[first]
+        first += 1
+    if first == len(sizes) and start == len(data):
+        return world, WorldDiff(), index
+    end, last = len(data), len(sizes)
+    while last > first and end - sizes[last - 1] >= start and \
+            _digest(view[end - sizes[last - 1]:end]) == digests[last - 1]:
+        end -= sizes[last - 1]
+        last -= 1
+
+    lo, hi = sum(index.block_objects[:first]), sum(index.block_objects[:last])
+    boundary = (index.keys[hi], index.ids[hi]) if hi < len(index.keys) else None
+    objects = None
+    if first == 0:
+        objects = _scan(data, 0, 0, '', end, boundary)
+    elif lo < len(index.keys):
+        objects = _scan(data, start, 2, index.keys[lo], end, boundary)
+    if objects is None:
+        # The structure of the file around the changes is not what the index expects, so compare all of it
+        start, first, end, last, lo, hi = 0, 0, len(data), len(sizes), 0, len(index.keys)
+        objects = _scan(data, 0, 0, '', end, None)
+        if objects is None:
+            raise ValueError(f"{game_data_file} is not a complete game data file")
+
+    diff = WorldDiff()
+    changed, added = _reload_locations(world, index, lo, hi, view, objects, diff)
+    items = _reload_items(world, index, lo, hi, view, objects, diff)
+    new_index = index.updated(view, first, last, start, end, objects)
+    if streamed:
+        # Even with no differences, the given world's spans may no longer match the file
+        locations = world.locations.reloaded(buffer, new_index.spans('locations'),
+                                             diff.changed_locations | diff.removed_locations)
+    elif diff.is_empty():
+        return world, diff, new_index
+    else:
+        locations = _overlay(world.locations, changed, added, diff.removed_locations)
+    return world.updated(diff, locations, items), diff, new_index
+
+
+def _reload_locations(world: World, index: GameDataIndex, lo: int, hi: int, view: memoryview,
+                      objects: list[tuple[str, int, int, int]],
+                      diff: WorldDiff) -> tuple[dict[int, Location], dict[int, Location]]:
+    """Return the changed and the added Locations, by id, when the location objects of index from lo to hi are
+    replaced by the location objects of view in objects, and record their differences in diff."""
+    streamed = isinstance(world.locations, LazyLocations)
+    previous = {index.ids[i]: index.digest(i) for i in range(lo, hi) if index.keys[i] == 'locations'}
+    changed, added = {}, {}
+    ids = set()
+    for key, start, end, id_num in objects:
+        if key != 'locations':
+            continue
+        ids.add(id_num)
+        if previous.get(id_num) == _digest(view[start:end]):
+            continue
+        loc_data = json.loads(view[start:end].tobytes())
+        loc_id = loc_data['id']
+        if streamed:
+            location = None
+            if loc_id in world.locations:
+                diff.changed_locations.add(loc_id)
+                diff.moves_changed = True
+                continue
+        else:
+            location = world.locations.get(loc_id)
+            if location is not None and _same_location(location, loc_data):
+                continue
+        new_location = Location(loc_id, loc_data['brief_description'], loc_data['long_description'],
+                                loc_data['available_commands'], loc_data['items'], loc_data['puzzle_words'],
+                                loc_data['visited'])
+        if location is not None:
+            diff.changed_locations.add(loc_id)
+            diff.moves_changed = diff.moves_changed or location.available_commands != loc_data['available_commands']
+            changed[loc_id] = new_location
+        else:
+            diff.added_locations.add(loc_id)
+            diff.moves_changed = True
+            added[loc_id] = new_location
+    diff.removed_locations = previous.keys() - ids
+    diff.moves_changed = diff.moves_changed or bool(diff.removed_locations)
+    return changed, added
+
+
+def _reload_items(world: World, index: GameDataIndex, lo: int, hi: int, view: memoryview,
+                  objects: list[tuple[str, int, int, int]], diff: WorldDiff) -> list[Item]:
+    """Return the items of world with the item objects of index from lo to hi replaced by the item objects of
+    view in objects, recording their differences in diff. Return world.items itself if nothing differs."""
+    before = index.keys[:lo].count('items')
+    after = before + index.keys[lo:hi].count('items')
+    old_items = world.items[before:after]
+    new_items = []
+    for key, start, end, _ in objects:
+        if key != 'items':
+            continue
+        item_data = json.loads(view[start:end].tobytes())
+        itm = world.item_index.get(item_data['name'])
+        if itm is None or not _same_item(itm, item_data):
+            diff.changed_items.add(item_data['name'])
+            itm = Item(item_data['name'], item_data['description'], item_data['start_position'],
+                       item_data['target_position'], item_data['target_points'], item_data['deposited'])
+        new_items.append(itm)
+
+    old_names = {itm.name for itm in old_items}
+    names = {itm.name for itm in new_items}
+    diff.changed_items.update(old_names - names)
+    diff.items_reordered = ([itm.name for itm in old_items if itm.name in names]
+                            != [itm.name for itm in new_items if itm.name in old_names])
+    if not diff.items_changed():
+        return world.items
+    return world.items[:before] + new_items + world.items[after:]
+
+
+class WorldWatcher:
+    """A watcher of a game data file, which reloads its world and switches every watched game to the new world
+    when the file changes.
+
+    Instance Attributes:
+        - game_data_file: the game data file watched
+        - world: the world loaded from the latest version of the file
+        - reloads: the number of times the world has been reloaded
+    """
+    # Private Instance Attributes:
+    #   - _stamp: the modification time and size of the file when it was last loaded
+    #   - _games: the games switched to each new world. A game stops being watched once it is no longer used.
+    #   - _index: the index of the version of the file that world holds
+    game_data_file: str
+    world: World
+    reloads: int
+    _stamp: tuple[int, int]
+    _games: weakref.WeakSet[AdventureGame]
+    _index: GameDataIndex
+
+    def __init__(self, game_data_file: str, world: Optional[World] = None) -> None:
+        """Initialize a new watcher of the given game data file, whose current contents are the given world, or
+        the world loaded by World.load if it is None. The file is scanned once here, to index it.
+
+        Preconditions:
+            - game_data_file is the filename of a valid game data JSON file
+        """
+        from adventure import World
+
+        self.game_data_file = game_data_file
+        self._stamp = self._file_stamp()
+        self.world = World.load(game_data_file) if world is None else world
+        self.reloads = 0
+        self._games = weakref.WeakSet()
+        with open(game_data_file, 'rb') as f:
+            self._index = GameDataIndex.build(f.read())
+
+    def _file_stamp(self) -> tuple[int, int]:
+        """Return the modification time and size of the watched file."""
+        stat = os.stat(self.game_data_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, game: AdventureGame) -> None:
+        """Switch the given game to the new world every time the file is reloaded from now on.
+
+        Preconditions:
+            - game is played in self.world
+        """
+        self._games.add(game)
+
+    def check(self) -> Optional[WorldDiff]:
+        """Reload the world if the file has changed since it was last loaded, switch every watched game to the
+        new world, and return the differences. Return None if the file has not changed, or if it cannot be read
+        as game data yet, as happens while it is still being written; it is then checked again next time."""
+        try:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return None
+            world, diff, index = reload_world(self.world, self.game_data_file, self._index)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        self._stamp, self._index = stamp, index
+        if world is self.world:
+            return diff
+        self.world = world
+        self.reloads += 1
+        for game in list(self._games):
+            try:
+                game.swap_world(world, diff)
+            except ValueError:
+                self._games.discard(game)
+        return diff
+
+
+if __name__ == "__main__":
+    pass
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
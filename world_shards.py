@@ -0,0 +1,435 @@
+"""CSC111 Project 1: Text Adventure Game - World Shards
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module splits a world too large for one process into regions, hosts each region in its own worker
+ process, and plays sessions across them.
+
+The locations are partitioned along the map formed by their available commands, so that few commands lead from
+ one region to another. Each worker process (a shard) holds the locations of its region, plus a halo: a copy of
+ every location outside the region that a command leads to from inside it, or that has a command leading into
+ it. A session is played by the shard that owns its current location. When a command leaves the player in the
+ halo, the session's state is handed off to the shard that owns that location, which carries on from there.
+
+A ShardCluster runs the shards on the local machine and routes commands to them. Commands are sent to the shards
+ in batches, which every shard works through at the same time:
+    cluster = ShardCluster('game_data.json', shards=4)
+    session = cluster.open_session()
+    replies = cluster.flush()           # the output of starting the session
+    cluster.send(session, "go east")
+    replies = cluster.flush()           # the output of the command
+    cluster.close()
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import math
+import multiprocessing
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Mapping, Optional
+
+from adventure import AdventureGame, World, DORM
+from game_entities import Location, Item
+from game_output import BufferedSink
+
+
+def _neighbours(locations: Mapping[int, Location]) -> tuple[list[int], list[set[int]]]:
+    """Return the ids of the given locations, and for each one the positions in that list of the locations it has
+    a command to or from, ignoring commands to locations that do not exist."""
+    ids = list(locations)
+    index = {loc_id: i for i, loc_id in enumerate(ids)}
+    neighbours = [set() for _ in ids]
+    for i, loc_id in enumerate(ids):
+        for destination in locations[loc_id].available_commands.values():
+            j = index.get(destination)
+            if j is not None and j != i:
+                neighbours[i].add(j)
+                neighbours[j].add(i)
+    return ids, neighbours
+
+
+def _farthest(neighbours: list[set[int]], sources: list[int]) -> int:
+    """Return the position of a location as far as possible from every given source, or of a location that
+    cannot be reached from any of them."""
+    distance = [-1] * len(neighbours)
+    queue = deque(sources)
+    for source in sources:
+        distance[source] = 0
+    last = sources[0]
+    while queue:
+        last = queue.popleft()
+        for j in neighbours[last]:
+            if distance[j] == -1:
+                distance[j] = distance[last] + 1
+                queue.append(j)
+    unreached = next((i for i, d in enumerate(distance) if d == -1), None)
+    return last if unreached is None else unreached
+
+
+def partition_locations(locations: Mapping[int, Location], regions: int, passes: int = 4,
+                        imbalance: float = 0.05) -> dict[int, int]:
+    """Return a mapping from the id of every given location to the region it belongs to, from 0 to regions - 1.
+    The regions have about the same number of locations, and as few commands as possible lead between them.
+
+    Regions are grown at the same speed from seeds spread as far apart as possible. Then, for the given number of
+    passes, every location on a region's border moves to the neighbouring region most of its neighbours are in,
+    as long as no region grows more than imbalance beyond an equal share.
+
+    Preconditions:
+        - regions > 0
+        - len(locations) >= regions
+    """
+    ids, neighbours = _neighbours(locations)
+    n = len(ids)
+    capacity = math.ceil(n / regions)
+    seeds = [0]
+    while len(seeds) < regions:
+        seeds.append(_farthest(neighbours, seeds))
+
+    region = [-1] * n
+    sizes = [1] * regions
+    queue = deque()
+    for r, seed in enumerate(seeds):
+        region[seed] = r
+        queue.append(seed)
+    while queue:
+        i = queue.popleft()
+        r = region[i]
+        if sizes[r] >= capacity:
+            continue
+        for j in neighbours[i]:
+            if region[j] == -1 and sizes[r] < capacity:
+                region[j] = r
+                sizes[r] += 1
+                queue.append(j)
+
+    # Locations every neighbouring region was too full to take, or that no seed reaches, join the smallest region
+    # they touch, or the smallest region overall
+    for i in range(n):
+        if region[i] == -1:
+            touching = [region[j] for j in neighbours[i] if region[j] != -1]
+            r = min(touching or range(regions), key=lambda candidate: sizes[candidate])
+            region[i] = r
+            sizes[r] += 1
+
+    limit = capacity * (1 + imbalance)
+    for _ in range(passes):
+        moved = 0
+        for i in range(n):
+            here = region[i]
+            counts = {}
+            for j in neighbours[i]:
+                counts[region[j]] = counts.get(region[j], 0) + 1
+            best = max(counts, key=counts.get, default=here)
+            if best != here and counts[best] > counts.get(here, 0) and sizes[best] + 1 <= limit \
+                    and sizes[here] > 1:
+                region[i] = best
+                sizes[here] -= 1
+                sizes[best] += 1
+                moved += 1
+        if moved == 0:
+            break
+
+    return {loc_id: region[i] for i, loc_id in enumerate(ids)}
+
+
+def cut_commands(locations: Mapping[int, Location], regions: Mapping[int, int]) -> int:
+    """Return the number of available commands that lead from a location in one region to one in another."""
+    return sum(1 for loc_id, location in locations.items() for destination in location.available_commands.values()
+               if destination in regions and regions[destination] != regions[loc_id])
+
+
+def shard_plan(locations: Mapping[int, Location], regions: Mapping[int, int],
+               shards: int) -> list[tuple[list[int], dict[int, int]]]:
+    """Return, for every shard, the ids of the locations it owns and a mapping from the id of every location in
+    its halo to the shard that owns it."""
+    plan = [([], {}) for _ in range(shards)]
+    for loc_id, location in locations.items():
+        shard = regions[loc_id]
+        plan[shard][0].append(loc_id)
+        for destination in location.available_commands.values():
+            if destination in regions and regions[destination] != shard:
+                plan[shard][1][destination] = regions[destination]
+                plan[regions[destination]][1][loc_id] = shard
+    return plan
+
+
+def load_shard_game_data(game_data_file: str, loc_ids: set[int]) -> tuple[dict[int, Location], list[Item]]:
+    """Load only the locations with the given ids, and every item, from the given game data JSON file.
+
+    The whole document is decoded, which is several times faster than scanning it with world_stream, but only the
+    chosen locations are kept once this function returns.
+
+    Preconditions:
+        - game_data_file is the filename of a valid game data JSON file
+    """
+    with open(game_data_file, 'r') as f:
+        data = json.load(f)
+
+    locations = {}
+    for loc_data in data['locations']:
+        if loc_data['id'] in loc_ids:
+            locations[loc_data['id']] = Location(loc_data['id'], loc_data['brief_description'],
+                                                 loc_data['long_description'], loc_data['available_commands'],
+                                                 loc_data['items'], loc_data['puzzle_words'], loc_data['visited'])
+    items = [Item(item_data['name'], item_data['description'], item_data['start_position'],
+                  item_data['target_position'], item_data['target_points'], item_data['deposited'])
+             for item_data in data['items']]
+    return locations, items
+
+
+def _run_shard(connection: Connection, game_data_file: str, owned: list[int], halo: dict[int, int]) -> None:
+    """Host the given locations of the given game data file and play the sessions sent over connection, until
+    None is received.
+
+    Every message received is a batch: a list of (kind, session id, argument) requests, where kind is 'open' (the
+    argument is the initial location id), 'import' (the argument is a session state), 'step' (the argument is a
+    line of input) or 'close'. One reply is sent per batch: a list of (session id, output lines, prompt or None
+    if the game is over, and the shard to hand the session off to with its state, or None) for every request
+    except 'import' and 'close'.
+    """
+    owned_ids = set(owned)
+    world = World(*load_shard_game_data(game_data_file, owned_ids | set(halo)))
+    games = {}
+    batch = connection.recv()
+    while batch is not None:
+        replies = []
+        for kind, session, argument in batch:
+            if kind == 'close':
+                games.pop(session, None)
+                continue
+            if kind == 'import':
+                games[session] = AdventureGame.from_session_state(world, argument, BufferedSink())
+                continue
+            if kind == 'open':
+                game = AdventureGame.from_world(world, argument, BufferedSink())
+                games[session] = game
+                game.start()
+            else:
+                game = games[session]
+                game.step(argument)
+            prompt = game.prompt() if game.ongoing else None
+            handoff = None
+            if game.current_location_id not in owned_ids:
+                handoff = (halo[game.current_location_id], game.session_state())
+                del games[session]
+            replies.append((session, game.sink.drain(), prompt, handoff))
+        connection.send(replies)
+        batch = connection.recv()
+    connection.close()
+
+
+@dataclass
+class SessionReply:
+    """The reply to one request made to a ShardCluster.
+
+    Instance Attributes:
+        - session: the id of the session
+        - lines: the output of the session since its previous reply
+        - prompt: the prompt for the session's next input, or None if its game is over
+        - shard: the shard that will play the session's next input
+    """
+    session: int
+    lines: list[str]
+    prompt: Optional[str]
+    shard: int
+
+
+class ShardCluster:
+    """The shards of one world, each run in a local worker process, and the sessions played across them.
+
+    Instance Attributes:
+        - shards: the number of shards
+        - regions: a mapping from every location id to the shard that owns it
+        - cut: the number of available commands that lead from one shard's locations to another's
+        - handoffs: the number of times a session has been handed off from one shard to another
+
+    Representation Invariants:
+        - self.shards > 0
+        - all(0 <= shard < self.shards for shard in self.regions.values())
+    """
+    # Private Instance Attributes:
+    #   - _processes: the worker process of every shard
+    #   - _connections: the connection to every shard's worker process
+    #   - _session_shards: a mapping from the id of every open session to the shard that plays it
+    #   - _pending: the requests for every shard not sent yet
+    #   - _next_session: the id of the next session opened
+    shards: int
+    regions: dict[int, int]
+    cut: int
+    handoffs: int
+    _processes: list[multiprocessing.Process]
+    _connections: list[Connection]
+    _session_shards: dict[int, int]
+    _pending: list[list[tuple[str, int, object]]]
+    _next_session: int
+
+    def __init__(self, game_data_file: str, shards: int) -> None:
+        """Partition the world in the given game data file into the given number of regions, and start a worker
+        process for each.
+
+        Preconditions:
+            - game_data_file is the filename of a valid game data JSON file
+            - shards > 0
+        """
+        locations, _ = AdventureGame.load_json_game_data(game_data_file)
+        self.shards = shards
+        self.regions = partition_locations(locations, shards)
+        self.cut = cut_commands(locations, self.regions)
+        plan = shard_plan(locations, self.regions, shards)
+        del locations
+
+        self.handoffs = 0
+        self._processes, self._connections = [], []
+        for owned, halo in plan:
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_shard, args=(child, game_data_file, owned, halo),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+        self._session_shards = {}
+        self._pending = [[] for _ in range(shards)]
+        self._next_session = 0
+
+    def open_session(self, initial_location_id: int = DORM) -> int:
+        """Open a new session at the given location and return its id. The session is started, and its first
+        output sent back, by the next flush.
+
+        Preconditions:
+            - initial_location_id in self.regions
+        """
+        session = self._next_session
+        self._next_session += 1
+        shard = self.regions[initial_location_id]
+        self._session_shards[session] = shard
+        self._pending[shard].append(('open', session, initial_location_id))
+        return session
+
+    def send(self, session: int, command: str) -> None:
+        """Send the given line of input to the given session, to be played by the next flush.
+
+        Preconditions:
+            - session is open
+        """
+        shard = self._session_shards[session]
+        self._pending[shard].append(('step', session, command))
+
+    def close_session(self, session: int) -> None:
+        """Close the given session, discarding its game."""
+        shard = self._session_shards.pop(session)
+        self._pending[shard].append(('close', session, None))
+
+    def flush(self) -> list[SessionReply]:
+        """Send every request made since the last flush to the shards, which play them at the same time, and return
+        the replies. Sessions handed off to another shard are sent there with the next flush."""
+        busy = []
+        for shard, requests in enumerate(self._pending):
+            if requests:
+                self._connections[shard].send(requests)
+                busy.append(self._connections[shard])
+        self._pending = [[] for _ in range(self.shards)]
+
+        replies = []
+        while busy:
+            for connection in wait(busy):
+                busy.remove(connection)
+                for session, lines, prompt, handoff in connection.recv():
+                    shard = self._session_shards[session]
+                    if handoff is not None:
+                        shard, state = handoff
+                        self._session_shards[session] = shard
+                        self._pending[shard].append(('import', session, state))
+                        self.handoffs += 1
+                    replies.append(SessionReply(session, lines, prompt, shard))
+        return replies
+
+    def close(self) -> None:
+        """Stop every worker process."""
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> ShardCluster:
+        """Return this cluster when a with block is entered."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop every worker process when a with block is left."""
+        self.close()
+
+
+def run_load(cluster: ShardCluster, sessions: int, rounds: int, seed: int = 0) -> dict[str, float]:
+    """Play the given number of sessions at once on cluster for the given number of rounds, each session sending
+    one command per round, and return the commands played per second and the handoffs per command.
+    Sessions start at random locations and walk at random; a session whose game ends is replaced by a new one.
+
+    Preconditions:
+        - sessions > 0 and rounds > 0
+    """
+    rng = random.Random(seed)
+    ids = list(cluster.regions)
+    moves = ["go north", "go south", "go east", "go west", "look", "score"]
+    for _ in range(sessions):
+        cluster.open_session(rng.choice(ids))
+    replies = cluster.flush()
+
+    commands = 0
+    handoffs = cluster.handoffs
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for reply in replies:
+            if reply.prompt is None:
+                cluster.close_session(reply.session)
+                cluster.open_session(rng.choice(ids))
+            else:
+                cluster.send(reply.session, rng.choice(moves))
+                commands += 1
+        replies = cluster.flush()
+    elapsed = time.perf_counter() - start
+    return {'commands_per_second': commands / elapsed, 'handoffs_per_command': (cluster.handoffs - handoffs) / commands}
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play sessions on a world sharded across local worker processes.")
+    parser.add_argument('--data', default='game_data.json')
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    for shard_count in args.shards:
+        with ShardCluster(args.data, shard_count) as load_cluster:
+            report = run_load(load_cluster, args.sessions, args.rounds)
+            print(f"{shard_count} shards: {len(load_cluster.regions)} locations, {load_cluster.cut} cut commands, "
+                  f"{report['commands_per_second']:.0f} commands/s, "
+                  f"{report['handoffs_per_command']:.3f} handoffs per command")
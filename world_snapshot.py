@@ -0,0 +1,227 @@
+"""CSC111 Project 1: Text Adventure Game - World Snapshots
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module compiles a game data JSON file into a compact binary snapshot, and loads
+ game worlds back from those snapshots. Loading a snapshot avoids parsing the whole JSON document
+ every time a game starts.
+
+Snapshot layout (all integers little-endian):
+    - header: magic, then the number of strings, locations, commands, references and items
+    - string table: n_strings + 1 offsets into a single UTF-8 blob, followed by the blob
+    - location records: id, brief, long, visited and the (start, count) of its commands, items and puzzle words
+    - command records: command string, destination location id
+    - references: string table indices for the item names and puzzle words of every location
+    - item records: name, description, start position, target position, target points, deposited
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+from game_entities import Location, Item
+
+SNAPSHOT_MAGIC = b'ADVSNAP1'
+SNAPSHOT_EXTENSION = '.snap'
+
+_HEADER = struct.Struct('<8sIIIII')
+_OFFSET = struct.Struct('<I')
+_LOCATION = struct.Struct('<iIIBIIIIII')
+_COMMAND = struct.Struct('<Ii')
+_ITEM = struct.Struct('<IIiiiB')
+
+
+class _StringTable:
+    """A table of unique strings, each identified by its position in the table.
+
+    Instance Attributes:
+        - strings: the strings in the table, in the order they were added
+
+    Representation Invariants:
+        - len(set(self.strings)) == len(self.strings)
+    """
+    # Private Instance Attributes:
+    #   - _ids: a mapping from each string in the table to its position in strings
+    strings: list[str]
+    _ids: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize a new empty string table."""
+        self.strings = []
+        self._ids = {}
+
+    def add(self, text: str) -> int:
+        """Return the position of text in this table, adding it first if it is not already present."""
+        if text not in self._ids:
+            self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return self._ids[text]
+
+
+def snapshot_path(game_data_file: str) -> str:
+    """Return the path of the snapshot that belongs to the given game data JSON file."""
+    return os.path.splitext(game_data_file)[0] + SNAPSHOT_EXTENSION
+
+
+def is_snapshot_fresh(game_data_file: str, snapshot_file: Optional[str] = None) -> bool:
+    """Return whether a snapshot exists for game_data_file and is at least as new as it."""
+    if snapshot_file is None:
+        snapshot_file = snapshot_path(game_data_file)
+    try:
+        return os.path.getmtime(snapshot_file) >= os.path.getmtime(game_data_file)
+    except OSError:
+        return False
+
+
+def compile_snapshot(game_data_file: str, snapshot_file: Optional[str] = None) -> str:
+    """Compile the game data JSON file with the given filename into a binary snapshot, and return the
+    path of the snapshot. If snapshot_file is None, the snapshot is written next to game_data_file.
+
+    Preconditions:
+        - game_data_file is the filename of a valid game data JSON file
+    """
+    if snapshot_file is None:
+        snapshot_file = snapshot_path(game_data_file)
+
+    with open(game_data_file, 'r') as f:
+        data = json.load(f)
+
+    table = _StringTable()
+    location_records = []
+    command_records = []
+    refs = []
+    for loc_data in data['locations']:
+        cmd_start, item_start = len(command_records), len(refs)
+        for command, destination in loc_data['available_commands'].items():
+            command_records.append(_COMMAND.pack(table.add(command), destination))
+        refs.extend(table.add(name) for name in loc_data['items'])
+        word_start = len(refs)
+        refs.extend(table.add(word) for word in loc_data['puzzle_words'])
+        location_records.append(_LOCATION.pack(
+            loc_data['id'], table.add(loc_data['brief_description']), table.add(loc_data['long_description']),
+            loc_data['visited'], cmd_start, len(command_records) - cmd_start, item_start, word_start - item_start,
+            word_start, len(refs) - word_start))
+
+    item_records = [_ITEM.pack(table.add(item_data['name']), table.add(item_data['description']),
+                               item_data['start_position'], item_data['target_position'],
+                               item_data['target_points'], item_data['deposited'])
+                    for item_data in data['items']]
+
+    encoded = [text.encode('utf-8') for text in table.strings]
+    offsets = [0]
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    # Write to a temporary file first so that a reader never sees a half-written snapshot
+    temp_file = snapshot_file + '.tmp'
+    with open(temp_file, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(encoded), len(location_records), len(command_records),
+                             len(refs), len(item_records)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(b''.join(encoded))
+        f.write(b''.join(location_records))
+        f.write(b''.join(command_records))
+        f.write(struct.pack(f'<{len(refs)}I', *refs))
+        f.write(b''.join(item_records))
+    os.replace(temp_file, snapshot_file)
+    return snapshot_file
+
+
+def load_snapshot(snapshot_file: str) -> tuple[dict[int, Location], list[Item]]:
+    """Load locations and items from the binary snapshot with the given filename, in the same format as
+    AdventureGame._load_game_data. The snapshot is memory-mapped rather than read into memory.
+
+    Preconditions:
+        - snapshot_file was written by compile_snapshot
+    """
+    with open(snapshot_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, n_strings, n_locations, n_commands, n_refs, n_items = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{snapshot_file} is not a game world snapshot")
+
+        pos = _HEADER.size
+        offsets = struct.unpack_from(f'<{n_strings + 1}I', mm, pos)
+        pos += (n_strings + 1) * _OFFSET.size
+        strings = [str(mm[pos + offsets[i]:pos + offsets[i + 1]], 'utf-8') for i in range(n_strings)]
+        pos += offsets[-1]
+
+        location_records = list(_LOCATION.iter_unpack(mm[pos:pos + n_locations * _LOCATION.size]))
+        pos += n_locations * _LOCATION.size
+        commands = [(strings[name], destination)
+                    for name, destination in _COMMAND.iter_unpack(mm[pos:pos + n_commands * _COMMAND.size])]
+        pos += n_commands * _COMMAND.size
+        refs = [strings[i] for i in struct.unpack_from(f'<{n_refs}I', mm, pos)]
+        pos += n_refs * _OFFSET.size
+        item_records = list(_ITEM.iter_unpack(mm[pos:pos + n_items * _ITEM.size]))
+
+    locations = {}
+    for (id_num, brief, long, visited, cmd_start, cmd_count,
+         item_start, item_count, word_start, word_count) in location_records:
+        locations[id_num] = Location(id_num, strings[brief], strings[long],
+                                     dict(commands[cmd_start:cmd_start + cmd_count]),
+                                     refs[item_start:item_start + item_count],
+                                     refs[word_start:word_start + word_count], bool(visited))
+
+    items = [Item(strings[name], strings[description], start, target, points, bool(deposited))
+             for name, description, start, target, points, deposited in item_records]
+    return locations, items
+
+
+def benchmark_cold_start(game_data_file: str, repeats: int = 5) -> dict[str, float]:
+    """Return the best time in seconds, over the given number of repeats, to load the world in game_data_file
+    from its JSON file and from its snapshot. The snapshot is compiled first if it is out of date.
+
+    Preconditions:
+        - repeats > 0
+    """
+    from adventure import AdventureGame
+
+    if not is_snapshot_fresh(game_data_file):
+        compile_snapshot(game_data_file)
+    snapshot_file = snapshot_path(game_data_file)
+
+    json_times, snapshot_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        AdventureGame.load_json_game_data(game_data_file)
+        json_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        load_snapshot(snapshot_file)
+        snapshot_times.append(time.perf_counter() - start)
+
+    return {'json': min(json_times), 'snapshot': min(snapshot_times)}
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else 'game_data.json'
+    print("Wrote", compile_snapshot(source))
+    timings = benchmark_cold_start(source)
+    print(f"JSON load:     {timings['json'] * 1000:.3f} ms")
+    print(f"Snapshot load: {timings['snapshot'] * 1000:.3f} ms")
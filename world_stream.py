@@ -0,0 +1,229 @@
+"""CSC111 Project 1: Text Adventure Game - Streaming World Loader
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module loads very large game data JSON files without parsing the whole document.
+ The file is memory-mapped and scanned once to find where each location is stored. Location
+ objects are then only built when they are first used, and the least recently used ones are
+ dropped again once too many are held in memory.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import mmap
+import re
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Generator, Iterator, Optional
+
+from game_entities import Location, Item
+
+_STRING = rb'"(?:[^"\\]++|\\.)*+"'
+# Everything up to the next bracket outside a string, then that bracket
+_STRUCTURE = re.compile(rb'(?:[^"{}\[\]]++|' + _STRING + rb')*+([{}\[\]])', re.DOTALL)
+_MEMBER = re.compile(rb'"((?:[^"\\]|\\.)*)"(\s*:)?', re.DOTALL)
+# An "id" member: its opening quote follows a comma, a brace or whitespace, so it cannot be inside a string
+_ID_MEMBER = re.compile(rb'(?<=[\s,{])"id"\s*:\s*(-?\d+)')
+_OPENING = frozenset(b'{[')
+
+
+def _last_key(buffer: bytes | mmap.mmap, start: int, end: int) -> Optional[str]:
+    """Return the last member name in buffer[start:end], which holds part of an object outside any string,
+    or None if there is none."""
+    key = None
+    for match in _MEMBER.finditer(buffer, start, end):
+        if match.group(2):
+            key = match.group(1)
+    return None if key is None else key.decode('utf-8')
+
+
+def scan_document(buffer: bytes | mmap.mmap, start: int = 0, end: Optional[int] = None, depth: int = 0,
+                  key: str = '') -> Generator[tuple[str, int, int, int], None, int]:
+    """Scan a game data JSON document and yield (key, start, end, id) for every object stored in a top-level
+    array, where key is the name of that array and buffer[start:end] is the object's JSON text.
+    id is the value of the object's "id" field, or -1 if it has none. Return the nesting depth at the end of
+    the scan, which is 0 for a whole document.
+
+    Only the brackets outside strings are visited one at a time; the text between them, strings included, is
+    skipped by a single regular expression match, and objects are never decoded.
+    To scan part of a document, start is the offset to start at, and depth and key are the nesting depth and
+    the name of the enclosing top-level array there. The scan stops at offset end, or the end of buffer.
+
+    Preconditions:
+        - buffer holds a valid JSON object, or the part of one from start is at the given depth and key
+    """
+    end = len(buffer) if end is None else end
+    object_start, id_num = start, -1
+    pos = start
+    match = _STRUCTURE.match(buffer, pos, end)
+    while match is not None:
+        bracket = match.start(1)
+        opening = buffer[bracket] in _OPENING
+        if depth == 1 and opening:
+            key = _last_key(buffer, pos, bracket) or key
+        elif depth == 3 and id_num == -1:
+            member = _ID_MEMBER.search(buffer, pos, bracket)
+            if member is not None:
+                id_num = int(member.group(1))
+
+        if opening:
+            depth += 1
+            if depth == 3:
+                object_start, id_num = bracket, -1
+        else:
+            if depth == 3:
+                yield key, object_start, bracket + 1, id_num
+            depth -= 1
+        pos = bracket + 1
+        match = _STRUCTURE.match(buffer, pos, end)
+    return depth
+
+
+class LazyLocations(Mapping):
+    """A read-only mapping from location id to Location, backed by a memory-mapped game data file.
+
+    A Location is built the first time it is looked up. At most capacity Locations are kept in memory;
+    when more are needed the least recently used one is dropped. Locations are never changed (each game keeps
+    its own changes), so a dropped Location is simply built again from the file when next needed.
+
+    The file stays mapped until close is called or, failing that, until the mapping is no longer used by any
+    World, so replacing a streamed world releases its file.
+
+    Instance Attributes:
+        - capacity: the maximum number of Location objects held in memory at once
+
+    Representation Invariants:
+        - self.capacity > 0
+        - len(self._cache) <= self.capacity
+        - all(loc_id in self._spans for loc_id in self._cache)
+    """
+    # Private Instance Attributes:
+    #   - _buffer: the memory-mapped game data file
+    #   - _spans: a mapping from location id to the (start, end) byte offsets of its JSON object in _buffer
+    #   - _cache: the Location objects currently in memory, from least to most recently used
+    #   - _release: closes _buffer when it is called or when this mapping is garbage collected, whichever is first
+    capacity: int
+    _buffer: mmap.mmap
+    _spans: dict[int, tuple[int, int]]
+    _cache: OrderedDict[int, Location]
+    _release: weakref.finalize
+
+    def __init__(self, buffer: mmap.mmap, spans: dict[int, tuple[int, int]], capacity: int) -> None:
+        """Initialize a new lazy location mapping over the given buffer and location spans.
+
+        Preconditions:
+            - capacity > 0
+        """
+        self.capacity = capacity
+        self._buffer = buffer
+        self._spans = spans
+        self._cache = OrderedDict()
+        self._release = weakref.finalize(self, buffer.close)
+
+    def __getitem__(self, loc_id: int) -> Location:
+        """Return the Location with the given id, building it from the file if it is not in memory."""
+        location = self._cache.get(loc_id)
+        if location is not None:
+            self._cache.move_to_end(loc_id)
+            return location
+
+        start, end = self._spans[loc_id]
+        loc_data = json.loads(self._buffer[start:end])
+        location = Location(loc_data['id'], loc_data['brief_description'], loc_data['long_description'],
+                            loc_data['available_commands'], loc_data['items'], loc_data['puzzle_words'],
+                            loc_data['visited'])
+        self._cache[loc_id] = location
+
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return location
+
+    def __contains__(self, loc_id: object) -> bool:
+        """Return whether a location with the given id exists, without building it."""
+        return loc_id in self._spans
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over every location id in file order, without building any Location."""
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        """Return the number of locations in the file."""
+        return len(self._spans)
+
+    def reloaded(self, buffer: mmap.mmap, spans: dict[int, tuple[int, int]], stale: set[int]) -> LazyLocations:
+        """Return a new lazy location mapping over buffer, a new version of this mapping's file with the given
+        location spans, which keeps the Locations this mapping holds in memory except those with ids in stale.
+
+        Preconditions:
+            - every location whose id is in spans but not in stale is the same in both versions of the file
+        """
+        locations = LazyLocations(buffer, spans, self.capacity)
+        locations._cache.update((loc_id, location) for loc_id, location in self._cache.items()
+                                if loc_id in spans and loc_id not in stale)
+        return locations
+
+    def close(self) -> None:
+        """Release the memory-mapped file. No Location may be looked up afterwards."""
+        self._cache.clear()
+        self._release()
+
+
+def load_streaming_game_data(filename: str, capacity: int) -> tuple[LazyLocations, list[Item]]:
+    """Load a game data JSON file in the same format as AdventureGame._load_game_data, but return its
+    locations as a LazyLocations mapping holding at most capacity Location objects at once.
+
+    Preconditions:
+        - filename is the filename of a valid game data JSON file
+        - capacity > 0
+    """
+    with open(filename, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    spans = {}
+    items = []
+    for key, start, end, id_num in scan_document(buffer):
+        if key == 'locations':
+            spans[id_num] = (start, end)
+        elif key == 'items':
+            item_data = json.loads(buffer[start:end])
+            items.append(Item(item_data['name'], item_data['description'], item_data['start_position'],
+                              item_data['target_position'], item_data['target_points'], item_data['deposited']))
+
+    return LazyLocations(buffer, spans, capacity), items
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    # })
+
+    # The file of a streamed world is released when the world is closed, or once no game uses it any more
+    from adventure import AdventureGame
+
+    streamed_game = AdventureGame('game_data.json', 1, max_cached_locations=2)
+    streamed_buffer = streamed_game.world.locations._buffer
+    with streamed_game.world:
+        assert streamed_game.get_location().id_num == 1
+    assert streamed_buffer.closed
+
+    streamed_game = AdventureGame('game_data.json', 1, max_cached_locations=2)
+    streamed_buffer = streamed_game.world.locations._buffer
+    del streamed_game
+    assert streamed_buffer.closed